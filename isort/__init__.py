@@ -1,10 +1,14 @@
 """Defines the public isort interface"""
 from . import settings
 from ._version import __version__
+from .api import Edit, apply_edits
 from .api import check_code_string as check_code
 from .api import (
     check_file,
     check_stream,
+    find_edits_in_code,
+    find_edits_in_file,
+    find_edits_in_stream,
     get_imports_file,
     get_imports_stream,
     get_imports_string,
@@ -2,12 +2,13 @@ import shutil
 import sys
 from io import StringIO
 from pathlib import Path
-from typing import Optional, TextIO, Union, cast
+from typing import Iterable, List, Optional, TextIO, Tuple, Union, cast
 from warnings import warn
 
 from isort import core
 
 from . import io
+from .core import Edit
 from .exceptions import (
     ExistingSyntaxErrors,
     FileSkipComment,
@@ -19,6 +20,7 @@ from .io import Empty
 from .place import module as place_module  # noqa: F401
 from .place import module_with_reason as place_module_with_reason  # noqa: F401
 from .settings import DEFAULT_CONFIG, Config
+from .timings import timed
 
 
 def sort_code_string(
@@ -28,6 +30,7 @@ def sort_code_string(
     file_path: Optional[Path] = None,
     disregard_skip: bool = False,
     show_diff: Union[bool, TextIO] = False,
+    line_range: Optional[Tuple[int, int]] = None,
     **config_kwargs,
 ):
     """Sorts any imports within the provided code string, returning a new string with them sorted.
@@ -39,6 +42,8 @@ def sort_code_string(
     - **disregard_skip**: set to `True` if you want to ignore a skip set in config for this file.
     - **show_diff**: If `True` the changes that need to be done will be printed to stdout, if a
     TextIO stream is provided results will be written to it, otherwise no diff will be computed.
+    - **line_range**: The first and last line, counting from 1, of the only code to sort.
+    Import sections outside of it are left untouched, and the code after it isn't processed.
     - ****config_kwargs**: Any config modifications.
     """
     input_stream = StringIO(code)
@@ -51,6 +56,7 @@ def sort_code_string(
         config=config,
         file_path=file_path,
         disregard_skip=disregard_skip,
+        line_range=line_range,
         show_diff=show_diff,
     )
     output_stream.seek(0)
@@ -64,6 +70,7 @@ def check_code_string(
     config: Config = DEFAULT_CONFIG,
     file_path: Optional[Path] = None,
     disregard_skip: bool = False,
+    line_range: Optional[Tuple[int, int]] = None,
     **config_kwargs,
 ) -> bool:
     """Checks the order, format, and categorization of imports within the provided code string.
@@ -76,6 +83,8 @@ def check_code_string(
     - **config**: The config object to use when sorting imports.
     - **file_path**: The disk location where the code string was pulled from.
     - **disregard_skip**: set to `True` if you want to ignore a skip set in config for this file.
+    - **line_range**: The first and last line, counting from 1, of the only code to sort.
+    Import sections outside of it are left untouched, and the code after it isn't processed.
     - ****config_kwargs**: Any config modifications.
     """
     config = _config(path=file_path, config=config, **config_kwargs)
@@ -86,9 +95,11 @@ def check_code_string(
         config=config,
         file_path=file_path,
         disregard_skip=disregard_skip,
+        line_range=line_range,
     )
 
 
+@timed("other")
 def sort_stream(
     input_stream: TextIO,
     output_stream: TextIO,
@@ -97,6 +108,8 @@ def sort_stream(
     file_path: Optional[Path] = None,
     disregard_skip: bool = False,
     show_diff: Union[bool, TextIO] = False,
+    line_range: Optional[Tuple[int, int]] = None,
+    edits: Optional[List[Edit]] = None,
     **config_kwargs,
 ) -> bool:
     """Sorts any imports within the provided code stream, outputs to the provided output stream.
@@ -110,6 +123,9 @@ def sort_stream(
     - **disregard_skip**: set to `True` if you want to ignore a skip set in config for this file.
     - **show_diff**: If `True` the changes that need to be done will be printed to stdout, if a
     TextIO stream is provided results will be written to it, otherwise no diff will be computed.
+    - **line_range**: The first and last line, counting from 1, of the only code to sort.
+    Import sections outside of it are left untouched, and the code after it isn't processed.
+    - **edits**: A list to append the edits that sort the imports to, see `find_edits_in_stream`.
     - ****config_kwargs**: Any config modifications.
     """
     if show_diff:
@@ -122,6 +138,8 @@ def sort_stream(
             config=config,
             file_path=file_path,
             disregard_skip=disregard_skip,
+            line_range=line_range,
+            edits=edits,
             **config_kwargs,
         )
         _output_stream.seek(0)
@@ -160,6 +178,8 @@ def sort_stream(
             _internal_output,
             extension=extension or (file_path and file_path.suffix.lstrip(".")) or "py",
             config=config,
+            line_range=line_range,
+            edits=edits,
         )
     except FileSkipComment:
         raise FileSkipComment(content_source)
@@ -184,6 +204,7 @@ def check_stream(
     config: Config = DEFAULT_CONFIG,
     file_path: Optional[Path] = None,
     disregard_skip: bool = False,
+    line_range: Optional[Tuple[int, int]] = None,
     **config_kwargs,
 ) -> bool:
     """Checks any imports within the provided code stream, returning `False` if any unsorted or
@@ -196,6 +217,8 @@ def check_stream(
     - **config**: The config object to use when sorting imports.
     - **file_path**: The disk location where the code string was pulled from.
     - **disregard_skip**: set to `True` if you want to ignore a skip set in config for this file.
+    - **line_range**: The first and last line, counting from 1, of the only code to sort.
+    Import sections outside of it are left untouched, and the code after it isn't processed.
     - ****config_kwargs**: Any config modifications.
     """
     config = _config(path=file_path, config=config, **config_kwargs)
@@ -210,6 +233,7 @@ def check_stream(
         config=config,
         file_path=file_path,
         disregard_skip=disregard_skip,
+        line_range=line_range,
     )
     printer = create_terminal_printer(color=config.color_output)
     if not changed:
@@ -229,6 +253,7 @@ def check_stream(
             config=config,
             file_path=file_path,
             disregard_skip=disregard_skip,
+            line_range=line_range,
         )
         output_stream.seek(0)
 
@@ -249,6 +274,7 @@ def check_file(
     file_path: Optional[Path] = None,
     disregard_skip: bool = True,
     extension: Optional[str] = None,
+    line_range: Optional[Tuple[int, int]] = None,
     **config_kwargs,
 ) -> bool:
     """Checks any imports within the provided file, returning `False` if any unsorted or
@@ -261,6 +287,8 @@ def check_file(
     - **file_path**: The disk location where the code string was pulled from.
     - **disregard_skip**: set to `True` if you want to ignore a skip set in config for this file.
     - **extension**: The file extension that contains imports. Defaults to filename extension or py.
+    - **line_range**: The first and last line, counting from 1, of the only code to sort.
+    Import sections outside of it are left untouched, and the code after it isn't processed.
     - ****config_kwargs**: Any config modifications.
     """
     with io.File.read(filename) as source_file:
@@ -271,10 +299,12 @@ def check_file(
             config=config,
             file_path=file_path or source_file.path,
             disregard_skip=disregard_skip,
+            line_range=line_range,
             **config_kwargs,
         )
 
 
+@timed("write")
 def sort_file(
     filename: Union[str, Path],
     extension: Optional[str] = None,
@@ -284,6 +314,7 @@ def sort_file(
     ask_to_apply: bool = False,
     show_diff: Union[bool, TextIO] = False,
     write_to_stdout: bool = False,
+    line_range: Optional[Tuple[int, int]] = None,
     **config_kwargs,
 ) -> bool:
     """Sorts and formats any groups of imports imports within the provided file or Path.
@@ -298,6 +329,8 @@ def sort_file(
     - **show_diff**: If `True` the changes that need to be done will be printed to stdout, if a
     TextIO stream is provided results will be written to it, otherwise no diff will be computed.
     - **write_to_stdout**: If `True`, write to stdout instead of the input file.
+    - **line_range**: The first and last line, counting from 1, of the only code to sort.
+    Import sections outside of it are left untouched, and the code after it isn't processed.
     - ****config_kwargs**: Any config modifications.
     """
     with io.File.read(filename) as source_file:
@@ -312,6 +345,7 @@ def sort_file(
                     config=config,
                     file_path=actual_file_path,
                     disregard_skip=disregard_skip,
+                    line_range=line_range,
                     extension=extension,
                 )
             else:
@@ -327,6 +361,7 @@ def sort_file(
                             config=config,
                             file_path=actual_file_path,
                             disregard_skip=disregard_skip,
+                            line_range=line_range,
                             extension=extension,
                         )
                     if changed:
@@ -366,6 +401,118 @@ def sort_file(
         return changed
 
 
+def find_edits_in_code(
+    code: str,
+    extension: Optional[str] = None,
+    config: Config = DEFAULT_CONFIG,
+    file_path: Optional[Path] = None,
+    disregard_skip: bool = False,
+    line_range: Optional[Tuple[int, int]] = None,
+    **config_kwargs,
+) -> List[Edit]:
+    """Returns the edits that sort the imports within the provided code string, see
+    `find_edits_in_stream`.
+
+    - **code**: The string of code with imports that need to be sorted.
+    - **extension**: The file extension that contains imports. Defaults to filename extension or py.
+    - **config**: The config object to use when sorting imports.
+    - **file_path**: The disk location where the code string was pulled from.
+    - **disregard_skip**: set to `True` if you want to ignore a skip set in config for this file.
+    - **line_range**: The first and last line, counting from 1, of the only code to sort.
+    - ****config_kwargs**: Any config modifications.
+    """
+    return find_edits_in_stream(
+        StringIO(code, newline=""),
+        extension=extension,
+        config=config,
+        file_path=file_path,
+        disregard_skip=disregard_skip,
+        line_range=line_range,
+        **config_kwargs,
+    )
+
+
+def find_edits_in_stream(
+    input_stream: TextIO,
+    extension: Optional[str] = None,
+    config: Config = DEFAULT_CONFIG,
+    file_path: Optional[Path] = None,
+    disregard_skip: bool = False,
+    line_range: Optional[Tuple[int, int]] = None,
+    **config_kwargs,
+) -> List[Edit]:
+    """Returns the edits that sort the imports within the provided code stream, without writing
+    out the rest of the code. Each replaces a range of lines of the input with the sorted import
+    section or code sorting block that took their place. They're ordered by line and don't
+    overlap, so `apply_edits` gives the same result as `sort_stream`.
+
+    - **input_stream**: The stream of code with imports that need to be sorted.
+    - **extension**: The file extension that contains imports. Defaults to filename extension or py.
+    - **config**: The config object to use when sorting imports.
+    - **file_path**: The disk location where the code string was pulled from.
+    - **disregard_skip**: set to `True` if you want to ignore a skip set in config for this file.
+    - **line_range**: The first and last line, counting from 1, of the only code to sort.
+    - ****config_kwargs**: Any config modifications.
+    """
+    config = _config(path=file_path, config=config, **config_kwargs)
+    edits: List[Edit] = []
+    sort_stream(
+        input_stream,
+        StringIO() if config.atomic else Empty,  # Atomic mode compiles the sorted output
+        extension=extension,
+        config=config,
+        file_path=file_path,
+        disregard_skip=disregard_skip,
+        line_range=line_range,
+        edits=edits,
+    )
+    return edits
+
+
+def find_edits_in_file(
+    filename: Union[str, Path],
+    extension: Optional[str] = None,
+    config: Config = DEFAULT_CONFIG,
+    file_path: Optional[Path] = None,
+    disregard_skip: bool = True,
+    line_range: Optional[Tuple[int, int]] = None,
+    **config_kwargs,
+) -> List[Edit]:
+    """Returns the edits that sort the imports within the provided file, see
+    `find_edits_in_stream`.
+
+    - **filename**: The name or Path of the file to find edits for.
+    - **extension**: The file extension that contains imports. Defaults to filename extension or py.
+    - **config**: The config object to use when sorting imports.
+    - **file_path**: The disk location where the code string was pulled from.
+    - **disregard_skip**: set to `True` if you want to ignore a skip set in config for this file.
+    - **line_range**: The first and last line, counting from 1, of the only code to sort.
+    - ****config_kwargs**: Any config modifications.
+    """
+    with io.File.read(filename) as source_file:
+        return find_edits_in_stream(
+            source_file.stream,
+            extension=extension,
+            config=config,
+            file_path=file_path or source_file.path,
+            disregard_skip=disregard_skip,
+            line_range=line_range,
+            **config_kwargs,
+        )
+
+
+def apply_edits(code: str, edits: Iterable[Edit]) -> str:
+    """Returns the provided code string with the edits found for it applied.
+
+    - **code**: The string of code the edits were found for.
+    - **edits**: The edits, ordered by line as the `find_edits_*` functions return them.
+    """
+    lines = StringIO(code, newline="").readlines()
+    for edit in reversed(list(edits)):
+        lines[edit.start_line - 1 : edit.end_line] = [edit.replacement]
+    return "".join(lines)
+
+
 def get_imports_string(
     code: str,
     extension: Optional[str] = None,
@@ -0,0 +1,433 @@
+"""Defines the on-disk cache isort uses to skip files it has already verified as sorted, the
+in-memory cache of sorted import blocks shared by every file processed within a process, and the
+in-memory cache of module placements each Config keeps, which can be persisted between runs.
+
+On-disk entries are keyed by the content hash of each file and grouped into one cache file per
+config fingerprint. The fingerprint covers the isort version, the fully resolved config, and
+the contents of every config file the config was loaded from, so changing any of these
+starts a fresh cache instead of reusing stale results.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from enum import Enum
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional, Set, Tuple, Union
+
+from ._version import __version__
+from .settings import Config
+
+CACHE_FILE_SUFFIX = ".isort-cache.json"
+PLACEMENT_CACHE_FILE_SUFFIX = ".isort-placements.json"
+DEFAULT_MAX_AGE: float = 60 * 60 * 24 * 30  # Entries and cache files unused for 30 days are dropped
+DEFAULT_MAX_ENTRIES: int = 250_000  # Upper bound of files remembered per config fingerprint
+DEFAULT_MAX_SORTED_BLOCKS: int = 1000  # Upper bound of import blocks remembered per config
+UNFINGERPRINTED_SETTINGS = frozenset(
+    ("sources", "verbose", "quiet", "color_output", "only_modified")
+)  # Settings that only change how results are reported, not the sorted output
+
+
+def _jsonable(item: Any) -> Any:
+    """Converts config values into a deterministic JSON representation"""
+    if isinstance(item, (set, frozenset)):
+        return sorted((_jsonable(value) for value in item), key=repr)
+    if isinstance(item, Enum):
+        return item.name
+    if isinstance(item, Path):
+        return str(item)
+    if callable(item):
+        return f"{getattr(item, '__module__', '')}.{getattr(item, '__qualname__', repr(item))}"
+    return repr(item)
+
+
+def config_fingerprint(config: Config) -> str:
+    """Returns a digest identifying the given config, the isort version, and the current contents
+    of every config file the config was loaded from.
+    """
+    settings = {
+        name: getattr(config, name)
+        for name in getattr(config, "__dataclass_fields__", {})
+        if name not in UNFINGERPRINTED_SETTINGS
+    }
+    fingerprint = hashlib.sha256(__version__.encode("utf8"))
+    fingerprint.update(json.dumps(settings, sort_keys=True, default=_jsonable).encode("utf8"))
+    for source in config.sources:
+        source_file = source.get("source", "")
+        if source_file and os.path.isfile(source_file):
+            fingerprint.update(source_file.encode("utf8"))
+            with open(source_file, "rb") as config_file:
+                fingerprint.update(hashlib.sha256(config_file.read()).digest())
+    return fingerprint.hexdigest()
+
+
+def file_digest(file_name: Union[str, Path]) -> Optional[str]:
+    """Returns the content hash isort uses to identify the given file, or `None` if it can't be
+    read.
+    """
+    try:
+        with open(file_name, "rb") as source_file:
+            contents = source_file.read()
+    except OSError:
+        return None
+
+    digest = hashlib.sha256(Path(file_name).suffix.encode("utf8") + b"\0")
+    digest.update(contents)
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """Remembers the content hashes of files found to be correctly sorted under one config."""
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        config: Config,
+        max_age: float = DEFAULT_MAX_AGE,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ) -> None:
+        self.directory = Path(directory)
+        self.fingerprint = config_fingerprint(config)
+        self.path = self.directory / f"{self.fingerprint}{CACHE_FILE_SUFFIX}"
+        self.max_age = max_age
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._now = time.time()
+        self._entries: Dict[str, float] = self._load()
+        self._modified = False
+
+    def _load(self) -> Dict[str, float]:
+        try:
+            with self.path.open(encoding="utf8") as cache_file:
+                data = json.load(cache_file)
+        except (OSError, ValueError):
+            return {}
+
+        if not isinstance(data, dict) or data.get("version") != __version__:
+            return {}
+        entries = data.get("entries", {})
+        if not isinstance(entries, dict):
+            return {}
+        return {
+            digest: last_seen
+            for digest, last_seen in entries.items()
+            if isinstance(last_seen, (int, float)) and self._now - last_seen <= self.max_age
+        }
+
+    def is_sorted(self, digest: Optional[str]) -> bool:
+        """Returns `True` if a file with the given content hash was recorded as sorted before."""
+        if digest is not None and digest in self._entries:
+            self._entries[digest] = self._now
+            self._modified = True
+            self.hits += 1
+            return True
+
+        self.misses += 1
+        return False
+
+    def mark_sorted(self, digest: Optional[str]) -> None:
+        """Records that a file with the given content hash is correctly sorted."""
+        if digest is not None:
+            self._entries[digest] = self._now
+            self._modified = True
+
+    def save(self) -> None:
+        """Writes the cache back to disk, pruning entries and cache files that have gone stale."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._prune_stale_files()
+        if not self._modified:
+            _touch(self.path)
+            return
+
+        entries = self._entries
+        if len(entries) > self.max_entries:
+            newest = sorted(entries.items(), key=lambda entry: entry[1], reverse=True)
+            entries = dict(newest[: self.max_entries])
+
+        file_descriptor, tmp_path = tempfile.mkstemp(
+            dir=str(self.directory), prefix=".", suffix=CACHE_FILE_SUFFIX
+        )
+        try:
+            with os.fdopen(file_descriptor, "w", encoding="utf8") as tmp_file:
+                json.dump({"version": __version__, "entries": entries}, tmp_file)
+            os.replace(tmp_path, self.path)
+        except OSError:  # pragma: no cover - the cache is an optimization only
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+
+    def _prune_stale_files(self) -> None:
+        """Removes the cache files, of results or placements, that no run has used within the max
+        age: runs touch the files they use, so their modification time is when they were last used.
+        """
+        in_use = (self.path, self.directory / f"{self.fingerprint}{PLACEMENT_CACHE_FILE_SUFFIX}")
+        for suffix in (CACHE_FILE_SUFFIX, PLACEMENT_CACHE_FILE_SUFFIX):
+            for cache_file in self.directory.glob(f"*{suffix}"):
+                if cache_file in in_use:
+                    continue
+                try:
+                    if self._now - cache_file.stat().st_mtime > self.max_age:
+                        cache_file.unlink()
+                except OSError:  # pragma: no cover - another isort process got there first
+                    pass
+
+
+def _touch(path: Path) -> None:
+    """Records that a cache file was used now, if it exists."""
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+# (import block, extension, import type, indent, config) -> (sorted block, verbose output)
+SortedBlockKey = Tuple[str, str, str, str, Config]
+SortedBlock = Tuple[str, Tuple[str, ...]]
+_BlockKey = Tuple[str, str, str, str]  # A SortedBlockKey without its config
+
+
+class SortedBlockCache:
+    """Remembers the sorted output of the most recently used import blocks of each Config, up to
+    max_size blocks per Config, so that blocks repeated across files, such as a common preamble,
+    are only parsed and sorted once.
+
+    Like the placement cache, entries are kept per Config object, which hashes by identity, rather
+    than by its fingerprint: computing a fingerprint takes longer than sorting most files, and a
+    run already shares one Config between all the files it applies to. The blocks of a Config are
+    only held for as long as the Config is, so one-off Configs, such as those `isort.code` builds
+    from keyword arguments, don't pile up.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_MAX_SORTED_BLOCKS) -> None:
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: "weakref.WeakKeyDictionary[Config, OrderedDict[_BlockKey, SortedBlock]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._lock = threading.Lock()
+
+    def get(self, key: SortedBlockKey) -> Optional[SortedBlock]:
+        block_key, config = key[:-1], key[-1]
+        with self._lock:
+            entries = self._entries.get(config)
+            sorted_block = None if entries is None else entries.get(block_key)
+            if sorted_block is None:
+                self.misses += 1
+            else:
+                entries.move_to_end(block_key)  # type: ignore
+                self.hits += 1
+            return sorted_block
+
+    def put(self, key: SortedBlockKey, sorted_block: SortedBlock) -> None:
+        block_key, config = key[:-1], key[-1]
+        with self._lock:
+            entries = self._entries.get(config)
+            if entries is None:
+                entries = self._entries[config] = OrderedDict()
+            entries[block_key] = sorted_block
+            entries.move_to_end(block_key)
+            while len(entries) > self.max_size:
+                entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+sorted_blocks = SortedBlockCache()  # Shared by every call to `core.process` within a process
+
+
+Placement = Tuple[str, str]  # (section, reasoning)
+# The directories looked in to make a placement, alongside when each was last modified in ns, or
+# `None` if it didn't exist: a persisted placement is only reused while these are unchanged
+PlacementDependencies = Tuple[Tuple[str, Optional[int]], ...]
+
+
+def placement_cache_path(directory: Union[str, Path], config: Config) -> Path:
+    """Returns where the placements made with the given config are persisted within directory."""
+    return Path(directory) / f"{config_fingerprint(config)}{PLACEMENT_CACHE_FILE_SUFFIX}"
+
+
+class PlacementCache:
+    """Remembers the section each module name was placed in, alongside the reasoning, for one
+    Config (see `place.placement_cache`), so entries are keyed on the module name alone.
+
+    Holds every placement unless given a max_size, past which the oldest placements are dropped.
+    Unlike the sorted block cache, it's shared by threads without a lock, as it's consulted for
+    every import: entries are only ever added whole, and racing threads make the same placement.
+
+    Placements can be saved to a file and loaded by later runs, which only reuse those whose
+    dependencies, the directories looked in to make them, haven't been modified since.
+    """
+
+    def __init__(self, max_size: Optional[int] = None) -> None:
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.loaded = 0
+        self.modified = False
+        self._entries: Dict[str, Placement] = {}
+        self._dependencies: Dict[str, PlacementDependencies] = {}
+        self._loaded: Set[str] = set()
+        self._added: Optional[Dict[str, Tuple[Placement, PlacementDependencies]]] = None
+        # What `isort.place` works out from the config to make placements, kept to last as long
+        # as it does: indexes of its patterns, and what its src_paths hold of top-level packages
+        self.indexes: Dict[str, Any] = {}
+        self.packages: Dict[str, Any] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, name: str) -> Optional[Placement]:
+        placement = self._entries.get(name)
+        if placement is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return placement
+
+    def put(
+        self, name: str, placement: Placement, dependencies: PlacementDependencies = ()
+    ) -> None:
+        self._entries[name] = placement
+        if dependencies:
+            self._dependencies[name] = dependencies
+        self.modified = True
+        if self._added is not None:
+            self._added[name] = (placement, dependencies)
+        if self.max_size is not None:
+            while len(self._entries) > self.max_size:
+                self._forget(next(iter(self._entries)))
+
+    def _forget(self, name: str) -> None:
+        self._entries.pop(name, None)
+        self._dependencies.pop(name, None)
+        self._loaded.discard(name)
+
+    def update(
+        self,
+        placements: Mapping[str, Placement],
+        dependencies: Optional[Mapping[str, PlacementDependencies]] = None,
+    ) -> None:
+        """Seeds the cache with placements made earlier, such as by another process."""
+        for name, placement in placements.items():
+            self.put(name, placement, dependencies.get(name, ()) if dependencies else ())
+
+    def was_loaded(self, name: str) -> bool:
+        """Returns `True` if the placement of the named module was loaded from an earlier run."""
+        return name in self._loaded
+
+    def collect_added(self) -> None:
+        """Starts collecting the placements made from now on, for `take_added` to return."""
+        self._added = {}
+
+    def take_added(self) -> Dict[str, Tuple[Placement, PlacementDependencies]]:
+        """Returns the placements made since it was last called, alongside their dependencies."""
+        added = self._added or {}
+        if self._added is not None:
+            self._added = {}
+        return added
+
+    def load(self, path: Union[str, Path]) -> None:
+        """Adds the placements saved to path that are still valid."""
+        try:
+            with open(path, encoding="utf8") as cache_file:
+                data = json.load(cache_file)
+            if data.get("version") != __version__:
+                return
+
+            directories = []
+            for directory, modified in data["directories"]:
+                if not isinstance(directory, str) or not (
+                    modified is None or type(modified) is int
+                ):
+                    raise ValueError(f"Invalid directory: {directory!r}")
+                directories.append((directory, modified))
+
+            placements = []
+            for name, (section, reason, dependency_indexes) in data["placements"].items():
+                if not (isinstance(section, str) and isinstance(reason, str)) or not all(
+                    type(index) is int and 0 <= index < len(directories)
+                    for index in dependency_indexes
+                ):
+                    raise ValueError(f"Invalid placement: {name!r}")
+                placements.append((name, section, reason, dependency_indexes))
+        except (OSError, ValueError, TypeError, KeyError, AttributeError):
+            return  # A cache that can't be read is ignored in full, to be overwritten on save
+
+        _touch(Path(path))
+        unchanged = [modified == _modified(directory) for directory, modified in directories]
+        for name, section, reason, dependency_indexes in placements:
+            if all(unchanged[index] for index in dependency_indexes):
+                self._entries[name] = (section, reason)
+                if dependency_indexes:
+                    self._dependencies[name] = tuple(
+                        directories[index] for index in dependency_indexes
+                    )
+                self._loaded.add(name)
+        self.loaded = len(self._loaded)
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Writes every placement to path, if any were made since they were loaded."""
+        if not self.modified:
+            return
+
+        directory_indexes: Dict[Tuple[str, Optional[int]], int] = {}
+        placements = {}
+        for name, (section, reason) in list(self._entries.items()):
+            placements[name] = [
+                section,
+                reason,
+                [
+                    directory_indexes.setdefault(dependency, len(directory_indexes))
+                    for dependency in self._dependencies.get(name, ())
+                ],
+            ]
+
+        directory = Path(path).parent
+        directory.mkdir(parents=True, exist_ok=True)
+        file_descriptor, tmp_path = tempfile.mkstemp(
+            dir=str(directory), prefix=".", suffix=PLACEMENT_CACHE_FILE_SUFFIX
+        )
+        try:
+            with os.fdopen(file_descriptor, "w", encoding="utf8") as tmp_file:
+                json.dump(
+                    {
+                        "version": __version__,
+                        "directories": list(directory_indexes),
+                        "placements": placements,
+                    },
+                    tmp_file,
+                )
+            os.replace(tmp_path, path)
+            self.modified = False
+        except OSError:  # pragma: no cover - the cache is an optimization only
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._dependencies.clear()
+        self._loaded.clear()
+        self.packages.clear()
+        self.hits = 0
+        self.misses = 0
+        self.loaded = 0
+
+
+def _modified(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
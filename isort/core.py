@@ -1,15 +1,18 @@
+import re
 import textwrap
 from io import StringIO
 from itertools import chain
-from typing import List, TextIO, Union
+from typing import List, NamedTuple, Optional, TextIO, Tuple, Union
 
 import isort.literal
 from isort.settings import DEFAULT_CONFIG, Config
 
 from . import output, parse
+from .cache import SortedBlockKey, sorted_blocks
 from .exceptions import FileSkipComment
 from .format import format_natural, remove_whitespace
 from .settings import FILE_SKIP_COMMENTS
+from .timings import timed
 
 CIMPORT_IDENTIFIERS = ("cimport ", "cimport*", "from.cimport")
 IMPORT_START_IDENTIFIERS = ("from ", "from.import", "import ", "import*") + CIMPORT_IDENTIFIERS
@@ -23,14 +26,34 @@ CODE_SORT_COMMENTS = (
     "# isort: unique-tuple",
     "# isort: assignments",
 )
+# Matches the start of any line that `process` may treat as the start of an import statement
+IMPORT_LINE_PATTERN = re.compile(r"[^\S\n]*(?:from|c?import)")
+# Matches lines of code without comments, strings or statement separators, which only affect how
+# the import section they end is sorted through whether they start a declaration
+PLAIN_CODE_LINE_PATTERN = re.compile(
+    r"[ \t]*[^\s#;'\"][^#;'\"\r\n\x0b\x0c\x1c-\x1e\x85\u2028\u2029]*(\r?\n)"
+)
+
+
+class Edit(NamedTuple):
+    """Replaces the lines from start_line to end_line of the input, counting from 1 and inclusive,
+    with replacement. Edits that only insert text have an end_line of start_line - 1.
+    """
 
+    start_line: int
+    end_line: int
+    replacement: str
 
+
+@timed("scan")
 def process(
     input_stream: TextIO,
     output_stream: TextIO,
     extension: str = "py",
     config: Config = DEFAULT_CONFIG,
     imports_only: bool = False,
+    line_range: Optional[Tuple[int, int]] = None,
+    edits: Optional[List[Edit]] = None,
 ) -> bool:
     """Parses stream identifying sections of contiguous imports and sorting them
 
@@ -44,18 +67,27 @@ def process(
     - `extension`: The file extension or file extension rules that should be used.
         - *Default*: `"py"`.
         - *Choices*: `["py", "pyi", "pyx"]`.
+    - `line_range`: The first and last line, counting from 1, of the only part of the input that
+      should be sorted. Import sections and code sorting blocks entirely outside of it are output
+      unchanged, and nothing after it is processed. As they apply to the whole input, imports
+      aren't added or floated to the top when a range is given.
+        - *Default*: `None`, to sort the whole input.
+    - `edits`: A list to append an `Edit` to for every import section or code sorting block whose
+      output differs from the input, so that applying them to the input gives the output. The
+      output is still written, so pass `isort.io.Empty` as `output_stream` if only the edits are
+      needed. Floating imports to the top gives a single edit of the whole input.
 
     Returns `True` if there were changes that needed to be made (errors present) from what
     was provided in the input_stream, otherwise `False`.
     """
     line_separator: str = config.line_ending
-    add_imports: List[str] = [format_natural(addition) for addition in config.add_imports]
-    import_section: str = ""
+    add_imports: List[str] = (
+        [] if line_range else [format_natural(addition) for addition in config.add_imports]
+    )
+    import_section_lines: List[str] = []
     next_import_section: str = ""
     next_cimports: bool = False
     in_quote: str = ""
-    first_comment_index_start: int = -1
-    first_comment_index_end: int = -1
     contains_imports: bool = False
     in_top_comment: bool = False
     first_import_section: bool = True
@@ -70,6 +102,11 @@ def process(
     end_of_file: bool = False
     verbose_output: List[str] = []
     all_imports: List[str] = []
+    line_number: int = 0  # The number of lines read from the input so far
+    section_start: int = 0
+    section_end: int = 0
+    next_section_start: int = 0
+    code_sorting_start: int = 0
 
     _output_stream = output_stream  # Used if imports_only == True
     if imports_only:
@@ -80,32 +117,40 @@ def process(
 
         output_stream = DevNull()
 
-    if config.float_to_top:
-        new_input = ""
-        current = ""
+    whole_output: Optional[StringIO] = None
+    if config.float_to_top and not line_range:
+        # Each chunk of the input between split points is parsed and sorted as a whole, with the
+        # results written straight into the stream the rest of processing then reads from
+        floated_input = StringIO()
+        chunk_lines: List[str] = []
+        floated_lines = 0
+        floated_changes = False
         isort_off = False
         for line in chain(input_stream, (None,)):
+            if line is not None:
+                floated_lines += 1
             if isort_off and line is not None:
                 if line == "# isort: on\n":
                     isort_off = False
-                new_input += line
+                floated_input.write(line)
             elif line in ("# isort: split\n", "# isort: off\n", None) or str(line).endswith(
                 "# isort: split\n"
             ):
                 if line == "# isort: off\n":
                     isort_off = True
-                if current:
+                if chunk_lines:
+                    chunk = "".join(chunk_lines)
+                    chunk_lines = []
+                    current = chunk
                     if add_imports:
                         add_line_separator = line_separator or "\n"
                         current += add_line_separator + add_line_separator.join(add_imports)
                         add_imports = []
                     parsed = parse.file_contents(current, config=config)
                     verbose_output += parsed.verbose_output
-                    extra_space = ""
-                    while current and current[-1] == "\n":
-                        extra_space += "\n"
-                        current = current[:-1]
-                    extra_space = extra_space.replace("\n", "", 1)
+                    stripped_current = current.rstrip("\n")
+                    extra_space = "\n" * max(len(current) - len(stripped_current) - 1, 0)
+                    current = stripped_current
                     sorted_output = output.sorted_imports(
                         parsed, config, extension, import_type="import"
                     )
@@ -115,14 +160,25 @@ def process(
                         line_separator=parsed.line_separator,
                         ignore_whitespace=config.ignore_whitespace,
                     )
-                    new_input += sorted_output
-                    new_input += extra_space
-                    current = ""
-                new_input += line or ""
+                    if edits is not None and not floated_changes:
+                        floated_changes = sorted_output + extra_space != chunk
+                    floated_input.write(sorted_output)
+                    floated_input.write(extra_space)
+                    del chunk, current, stripped_current, parsed, sorted_output
+                floated_input.write(line or "")
             else:
-                current += line or ""
+                chunk_lines.append(line)
+
+        floated_input.seek(0)
+        input_stream = floated_input
+        if floated_changes:
+            # Lines may have moved anywhere, so the whole output replaces the whole input
+            whole_output = StringIO()
+            whole_output_stream, output_stream = output_stream, whole_output
 
-        input_stream = StringIO(new_input)
+    unchanged_from: int = -1
+    if not (imports_only or add_imports):
+        input_stream, unchanged_from = _prescan(input_stream)
 
     for index, line in enumerate(chain(input_stream, (None,))):
         if line is None:
@@ -136,8 +192,10 @@ def process(
                 line_separator = "\n"
 
             if code_sorting and code_sorting_section:
-                output_stream.write(
-                    textwrap.indent(
+                if not _in_line_range(line_range, code_sorting_start, line_number):
+                    output_stream.write(code_sorting_section)
+                else:
+                    sorted_code = textwrap.indent(
                         isort.literal.assignment(
                             code_sorting_section,
                             str(code_sorting),
@@ -146,8 +204,27 @@ def process(
                         ),
                         code_sorting_indent,
                     )
-                )
+                    if edits is not None and sorted_code != code_sorting_section:
+                        edits.append(Edit(code_sorting_start + 1, line_number, sorted_code))
+                    output_stream.write(sorted_code)
+        elif not (import_section_lines or next_import_section or code_sorting) and (
+            unchanged_from != -1
+            and input_stream.tell() - len(line) >= unchanged_from
+            or line_range
+            and line_number >= line_range[1]
+        ):
+            # Nothing that remains is sorted, so the rest of the input is output unchanged
+            remaining = line + input_stream.read()
+            for file_skip_comment in FILE_SKIP_COMMENTS:
+                if file_skip_comment in remaining:
+                    raise FileSkipComment("Passed in content")
+
+            output_stream.write(remaining)
+            continue
         else:
+            line_number += 1
+            if not import_section_lines:
+                section_start = line_number
             stripped_line = line.strip()
             if stripped_line and not line_separator:
                 line_separator = line[len(line.rstrip()) :].replace(" ", "").replace("\t", "")
@@ -168,33 +245,9 @@ def process(
             elif in_top_comment:
                 if not line.startswith("#") or stripped_line in config.section_comments:
                     in_top_comment = False
-                    first_comment_index_end = index - 1
 
             was_in_quote = bool(in_quote)
-            if (not stripped_line.startswith("#") or in_quote) and '"' in line or "'" in line:
-                char_index = 0
-                if first_comment_index_start == -1 and (
-                    line.startswith('"') or line.startswith("'")
-                ):
-                    first_comment_index_start = index
-                while char_index < len(line):
-                    if line[char_index] == "\\":
-                        char_index += 1
-                    elif in_quote:
-                        if line[char_index : char_index + len(in_quote)] == in_quote:
-                            in_quote = ""
-                            if first_comment_index_end < first_comment_index_start:
-                                first_comment_index_end = index
-                    elif line[char_index] in ("'", '"'):
-                        long_quote = line[char_index : char_index + 3]
-                        if long_quote in ('"""', "'''"):
-                            in_quote = long_quote
-                            char_index += 2
-                        else:
-                            in_quote = line[char_index]
-                    elif line[char_index] == "#":
-                        break
-                    char_index += 1
+            in_quote = parse.track_quotes(line, in_quote)
 
             not_imports = bool(in_quote) or was_in_quote or in_top_comment or isort_off
             if not (in_quote or was_in_quote or in_top_comment):
@@ -206,11 +259,14 @@ def process(
                 elif stripped_line in CODE_SORT_COMMENTS:
                     code_sorting = stripped_line.split("isort: ")[1].strip()
                     code_sorting_indent = line[: -len(line.lstrip())]
+                    code_sorting_start = line_number
                     not_imports = True
                 elif code_sorting:
                     if not stripped_line:
-                        output_stream.write(
-                            textwrap.indent(
+                        if not _in_line_range(line_range, code_sorting_start, line_number - 1):
+                            output_stream.write(code_sorting_section)
+                        else:
+                            sorted_code = textwrap.indent(
                                 isort.literal.assignment(
                                     code_sorting_section,
                                     str(code_sorting),
@@ -219,7 +275,11 @@ def process(
                                 ),
                                 code_sorting_indent,
                             )
-                        )
+                            if edits is not None and sorted_code != code_sorting_section:
+                                edits.append(
+                                    Edit(code_sorting_start + 1, line_number - 1, sorted_code)
+                                )
+                            output_stream.write(sorted_code)
                         not_imports = True
                         code_sorting = False
                         code_sorting_section = ""
@@ -228,12 +288,14 @@ def process(
                         code_sorting_section += line
                         line = ""
                 elif stripped_line in config.section_comments:
-                    if import_section and not contains_imports:
-                        output_stream.write(import_section)
-                        import_section = line
+                    if import_section_lines and not contains_imports:
+                        output_stream.write("".join(import_section_lines))
+                        import_section_lines = [line]
+                        section_start = line_number
                         not_imports = False
                     else:
-                        import_section += line
+                        import_section_lines.append(line)
+                    section_end = line_number
                     indent = line[: -len(line.lstrip())]
                 elif not (stripped_line or contains_imports):
                     not_imports = True
@@ -244,12 +306,14 @@ def process(
                     and not config.treat_all_comments_as_code
                     and stripped_line not in config.treat_comments_as_code
                 ):
-                    import_section += line
+                    import_section_lines.append(line)
+                    section_end = line_number
                 elif stripped_line.startswith(IMPORT_START_IDENTIFIERS):
                     contains_imports = True
 
                     new_indent = line[: -len(line.lstrip())]
-                    import_statement = line
+                    import_statement = [line]
+                    statement_start = line_number
                     stripped_line = line.strip().split("#")[0]
                     while stripped_line.endswith("\\") or (
                         "(" in stripped_line and ")" not in stripped_line
@@ -257,41 +321,54 @@ def process(
                         if stripped_line.endswith("\\"):
                             while stripped_line and stripped_line.endswith("\\"):
                                 line = input_stream.readline()
+                                line_number += 1
                                 stripped_line = line.strip().split("#")[0]
-                                import_statement += line
+                                import_statement.append(line)
                         else:
                             while ")" not in stripped_line:
                                 line = input_stream.readline()
+                                line_number += 1
                                 stripped_line = line.strip().split("#")[0]
-                                import_statement += line
+                                import_statement.append(line)
 
                     cimport_statement: bool = False
+                    statement = "".join(import_statement)
                     if (
-                        import_statement.lstrip().startswith(CIMPORT_IDENTIFIERS)
-                        or " cimport " in import_statement
-                        or " cimport*" in import_statement
-                        or " cimport(" in import_statement
-                        or ".cimport" in import_statement
+                        statement.lstrip().startswith(CIMPORT_IDENTIFIERS)
+                        or " cimport " in statement
+                        or " cimport*" in statement
+                        or " cimport(" in statement
+                        or ".cimport" in statement
                     ):
                         cimport_statement = True
 
-                    if cimport_statement != cimports or (new_indent != indent and import_section):
-                        if import_section:
+                    if cimport_statement != cimports or (
+                        new_indent != indent and import_section_lines
+                    ):
+                        if import_section_lines:
                             next_cimports = cimport_statement
-                            next_import_section = import_statement
-                            import_statement = ""
+                            next_import_section = statement
+                            next_section_start = statement_start
+                            import_statement = []
                             not_imports = True
                             line = ""
                         else:
                             cimports = cimport_statement
 
                     indent = new_indent
-                    import_section += import_statement
+                    if import_statement:
+                        import_section_lines.extend(import_statement)
+                        section_end = line_number
                 else:
                     not_imports = True
 
         if not_imports:
+            import_section: str = "".join(import_section_lines)
             raw_import_section: str = import_section
+            if edits is not None:
+                edit_prefix = ""
+                edit_start = section_start if import_section_lines else line_number + (not line)
+                edit_end = section_end if import_section_lines else edit_start - 1
             if (
                 add_imports
                 and (stripped_line or end_of_file)
@@ -304,11 +381,14 @@ def process(
                 import_section = line_separator.join(add_imports) + line_separator
                 if end_of_file and index != 0:
                     output_stream.write(line_separator)
+                    edit_prefix = line_separator
                 contains_imports = True
                 add_imports = []
 
             if next_import_section and not import_section:  # pragma: no cover
                 raw_import_section = import_section = next_import_section
+                section_start = next_section_start
+                section_end = line_number
                 next_import_section = ""
 
             if import_section:
@@ -322,9 +402,19 @@ def process(
                 if not indent:
                     import_section += line
                     raw_import_section += line
+                    if line:
+                        edit_end = line_number
+                original_section = raw_import_section
                 if not contains_imports:
                     output_stream.write(import_section)
 
+                elif not _in_line_range(line_range, section_start, section_end):
+                    if first_import_section and not import_section.lstrip(
+                        line_separator
+                    ).startswith(COMMENT_INDICATORS):
+                        first_import_section = False
+                    output_stream.write(import_section)
+
                 else:
                     leading_whitespace = import_section[: -len(import_section.lstrip())]
                     trailing_whitespace = import_section[len(import_section.rstrip()) :]
@@ -340,23 +430,53 @@ def process(
                             line[len(indent) :] for line in import_section.splitlines(keepends=True)
                         )
 
-                    parsed_content = parse.file_contents(import_section, config=config)
-                    verbose_output += parsed_content.verbose_output
-                    if imports_only:
-                        lines_without_imports_set = set(parsed_content.lines_without_imports)
-                        all_imports.extend(
-                            li
-                            for li in parsed_content.in_lines
-                            if li and li not in lines_without_imports_set
-                        )
-
-                    sorted_import_section = output.sorted_imports(
-                        parsed_content,
-                        _indented_config(config, indent),
+                    import_type = "cimport" if cimports else "import"
+                    block_key, block_tail = _sorted_block_key(
+                        import_section,
+                        "" if indent else line,
                         extension,
-                        import_type="cimport" if cimports else "import",
+                        import_type,
+                        indent,
+                        config,
                     )
-                    if not (import_section.strip() and not sorted_import_section):
+                    sorted_block = None if imports_only else sorted_blocks.get(block_key)
+                    if sorted_block:
+                        sorted_import_section, block_verbose_output = sorted_block
+                        sorted_import_section += block_tail
+                        if config.verbose and not config.only_modified:
+                            for output_str in block_verbose_output:
+                                print(output_str)
+                        verbose_output += block_verbose_output
+                    else:
+                        parsed_content = parse.file_contents(import_section, config=config)
+                        verbose_output += parsed_content.verbose_output
+                        if imports_only:
+                            lines_without_imports_set = set(parsed_content.lines_without_imports)
+                            all_imports.extend(
+                                li
+                                for li in parsed_content.in_lines
+                                if li and li not in lines_without_imports_set
+                            )
+
+                        sorted_import_section = output.sorted_imports(
+                            parsed_content,
+                            _indented_config(config, indent),
+                            extension,
+                            import_type=import_type,
+                        )
+                        if not imports_only and sorted_import_section.endswith(block_tail):
+                            sorted_blocks.put(
+                                block_key,
+                                (
+                                    sorted_import_section[
+                                        : len(sorted_import_section) - len(block_tail)
+                                    ],
+                                    tuple(parsed_content.verbose_output),
+                                ),
+                            )
+                    if import_section.strip() and not sorted_import_section:
+                        sorted_import_section = ""
+                    else:
                         if indent:
                             sorted_import_section = (
                                 leading_whitespace
@@ -370,9 +490,15 @@ def process(
                             line_separator=line_separator,
                             ignore_whitespace=config.ignore_whitespace,
                         )
-                        output_stream.write(sorted_import_section)
                         if not line and not indent and next_import_section:
-                            output_stream.write(line_separator)
+                            sorted_import_section += line_separator
+                        output_stream.write(sorted_import_section)
+                    if edits is not None and (
+                        edit_prefix or sorted_import_section != original_section
+                    ):
+                        edits.append(
+                            Edit(edit_start, edit_end, edit_prefix + sorted_import_section)
+                        )
 
                 if indent:
                     output_stream.write(line)
@@ -384,19 +510,26 @@ def process(
                     contains_imports = True
                 else:
                     contains_imports = False
-                import_section = next_import_section
+                import_section_lines = [next_import_section] if next_import_section else []
+                section_start, section_end = next_section_start, line_number
                 next_import_section = ""
             else:
                 output_stream.write(line)
                 not_imports = False
 
-            if stripped_line and not in_quote and not import_section and not next_import_section:
+            if (
+                stripped_line
+                and not in_quote
+                and not import_section_lines
+                and not next_import_section
+            ):
                 if stripped_line == "yield":
                     while not stripped_line or stripped_line == "yield":
                         new_line = input_stream.readline()
                         if not new_line:
                             break
 
+                        line_number += 1
                         output_stream.write(new_line)
                         stripped_line = new_line.strip().split("#")[0]
 
@@ -406,9 +539,14 @@ def process(
                         if not new_line:
                             break
 
+                        line_number += 1
                         output_stream.write(new_line)
                         stripped_line = new_line.strip().split("#")[0]
 
+    if whole_output is not None and edits is not None:
+        edits[:] = [Edit(1, floated_lines, whole_output.getvalue())]
+        whole_output_stream.write(whole_output.getvalue())
+
     if made_changes and config.only_modified:
         for output_str in verbose_output:
             print(output_str)
@@ -420,6 +558,78 @@ def process(
     return made_changes
 
 
+def _prescan(input_stream: TextIO) -> Tuple[TextIO, int]:
+    """Scans the whole input at once for anything `process` may need to act on, returning a stream
+    of the same input along with the offset from which it contains no imports or isort comments,
+    or -1 if the input couldn't be scanned ahead.
+    """
+    if not input_stream.seekable():
+        return input_stream, -1
+
+    start = input_stream.tell()
+    contents = input_stream.read()
+    if "\r" in contents and "\r" in contents.replace("\r\n", ""):
+        # Whether lone carriage returns end lines depends on how the stream was opened
+        input_stream.seek(start)
+        return input_stream, -1
+
+    if type(input_stream) is StringIO and not start:
+        # Positions within a StringIO are those within its contents, so it can be read again
+        input_stream.seek(0)
+    else:
+        input_stream = StringIO(contents)
+
+    last_match = max(_last_import_line(contents), contents.rfind("isort"))
+    if last_match == -1:
+        return input_stream, 0
+
+    unchanged_from = contents.find("\n", last_match) + 1
+    return input_stream, unchanged_from if 0 < unchanged_from < len(contents) else -1
+
+
+def _last_import_line(contents: str) -> int:
+    """Returns where the last line that may start an import begins, or -1 if there are none.
+
+    Works backwards from the last occurrence of each keyword using `str.rfind`, only checking the
+    start of the lines they occur on, which is far faster than matching a pattern against every
+    line of the input.
+    """
+    last_import = contents.rfind("import")  # Also finds "cimport"
+    last_from = contents.rfind("from")
+    while last_import != -1 or last_from != -1:
+        line_start = contents.rfind("\n", 0, max(last_import, last_from)) + 1
+        if IMPORT_LINE_PATTERN.match(contents, line_start):
+            return line_start
+        if last_import >= line_start:
+            last_import = contents.rfind("import", 0, line_start)
+        if last_from >= line_start:
+            last_from = contents.rfind("from", 0, line_start)
+    return -1
+
+
+def _sorted_block_key(
+    import_section: str, tail: str, extension: str, import_type: str, indent: str, config: Config
+) -> Tuple[SortedBlockKey, str]:
+    """Returns the key the sorted output of an import section is cached under, along with the
+    part of the section, if any, that is left out of the cached output and appended to it.
+
+    Unindented import sections end with the line of code that followed them, which is usually
+    different in every file. When that is a plain line of code it is replaced within the key by
+    one standing in for all the lines that start a declaration, or all those that don't.
+    """
+    plain_code_line = PLAIN_CODE_LINE_PATTERN.fullmatch(tail) if tail else None
+    if not plain_code_line or not import_section.endswith(tail):
+        return (import_section, extension, import_type, indent, config), ""
+
+    stand_in = "def _" if tail.startswith(output.STATEMENT_DECLARATIONS) else "_"
+    import_section = import_section[: -len(tail)] + stand_in + plain_code_line.group(1)
+    return (import_section, extension, import_type, indent, config), tail
+
+
+def _in_line_range(line_range: Optional[Tuple[int, int]], first_line: int, last_line: int) -> bool:
+    return not line_range or first_line <= line_range[1] and last_line >= line_range[0]
+
+
 def _indented_config(config: Config, indent: str):
     if not indent:
         return config
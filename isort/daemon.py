@@ -0,0 +1,508 @@
+"""isortd: a long-lived process that sorts code on behalf of editors and hooks.
+
+Running isort from scratch for every file pays for interpreter startup, config discovery and
+construction, and cold placement caches. `isortd` keeps one warm `Config` per project and serves
+sort requests over a local Unix socket using a line based JSON protocol:
+
+    {"code": "...", "file_path": "...", "extension": "py", "cwd": "...", "settings": {...}}
+
+(optionally with a `"line_range": [first, last]` to only sort the import sections within them)
+is answered with either `{"code": "...", "changed": true}` or `{"error": "..."}`. Requests with
+`"edits": true` are instead answered with `{"edits": [[start_line, end_line, "..."], ...]}`, the
+edits `isort.api.find_edits_in_code` returns, so large files aren't sent back in full. `Client`
+(and the `isortd-client` command) talk to a running daemon and fall back to sorting in-process if
+none is available or the daemon reports an error, so callers always get the same results as
+`isort.api`.
+"""
+import argparse
+import json
+import os
+import socket
+import socketserver
+import stat
+import sys
+import tempfile
+import threading
+from io import StringIO
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from . import api, io, place
+from .cache import sorted_blocks
+from .core import Edit
+from .exceptions import FileSkipped, InvalidSettingsPath, ISortError
+from .settings import (
+    CONFIG_SOURCES,
+    MAX_CONFIG_SEARCH_DEPTH,
+    STOP_CONFIG_SEARCH_ON_DIRS,
+    Config,
+    _find_config,
+    _get_config_data,
+)
+
+MAX_CACHED_CONFIGS: int = 64  # The number of distinct project configs the daemon keeps warm
+CLIENT_TIMEOUT: float = 30.0  # Seconds the client waits on the daemon before sorting in-process
+
+_ConfigKey = Tuple[Tuple[Tuple[str, int], ...], str, str]
+
+
+def default_socket_path() -> str:
+    """Returns the socket isortd listens on unless told otherwise: `$ISORTD_SOCKET` if set,
+    otherwise a per-user socket in the runtime directory, or in a per-user directory within the
+    temp directory.
+    """
+    socket_path = os.environ.get("ISORTD_SOCKET", "")
+    if socket_path:
+        return socket_path
+
+    user = getattr(os, "getuid", lambda: "user")()
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return os.path.join(runtime_dir, f"isortd-{user}.sock")
+    return os.path.join(tempfile.gettempdir(), f"isortd-{user}", "isortd.sock")
+
+
+def _is_private_directory(directory: str) -> bool:
+    """Returns `True` if directory is owned by the current user and no one else can write to it,
+    so no one else can have put a socket within it.
+    """
+    try:
+        status = os.lstat(directory)
+    except OSError:
+        return False
+    return (
+        stat.S_ISDIR(status.st_mode)
+        and status.st_uid == os.getuid()
+        and not status.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+    )
+
+
+def _is_trusted_socket(socket_path: str) -> bool:
+    """Returns `True` if the socket at socket_path was made by the current user, within a
+    private directory, so the code it sends back can be trusted.
+    """
+    try:
+        status = os.lstat(socket_path)
+    except OSError:
+        return False
+    return (
+        stat.S_ISSOCK(status.st_mode)
+        and status.st_uid == os.getuid()
+        and _is_private_directory(os.path.dirname(os.path.abspath(socket_path)))
+    )
+
+
+def _prepare_socket_directory(socket_path: str) -> None:
+    """Creates the directory of socket_path if needed, only accessible to the current user, and
+    raises an `OSError` if it exists but others could write to it, or if the platform has no Unix
+    sockets.
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        raise OSError("isortd serves requests over a Unix socket, unsupported on this platform")
+
+    directory = os.path.dirname(os.path.abspath(socket_path))
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    if not _is_private_directory(directory):
+        raise OSError(
+            f"{directory} has to be owned by the current user and writable by no one else to hold "
+            "isortd's socket"
+        )
+
+
+def _sort(
+    code: str,
+    config: Config,
+    file_path: Optional[Path] = None,
+    extension: Optional[str] = None,
+    disregard_skip: bool = False,
+    line_range: Optional[Tuple[int, int]] = None,
+    edits: bool = False,
+) -> Dict[str, Any]:
+    if edits:
+        found_edits = api.find_edits_in_code(
+            code,
+            extension=extension,
+            config=config,
+            file_path=file_path,
+            disregard_skip=disregard_skip,
+            line_range=line_range,
+        )
+        return {"edits": [list(edit) for edit in found_edits]}
+
+    output_stream = StringIO()
+    changed = api.sort_stream(
+        StringIO(code),
+        output_stream,
+        extension=extension,
+        config=config,
+        file_path=file_path,
+        disregard_skip=disregard_skip,
+        line_range=line_range,
+    )
+    return {"code": output_stream.getvalue(), "changed": changed}
+
+
+class ConfigCache:
+    """Keeps one Config per distinct combination of config files, working directory and
+    settings overrides, rebuilding it whenever one of the config files changes on disk.
+    """
+
+    def __init__(self, max_size: int = MAX_CACHED_CONFIGS) -> None:
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._configs: Dict[_ConfigKey, Config] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _config_files(directory: str) -> Tuple[Tuple[str, int], ...]:
+        """Returns every potential config file isort would consider for the given directory, along
+        with its modification time.
+        """
+        config_files = []
+        current_directory = directory
+        for _ in range(MAX_CONFIG_SEARCH_DEPTH):
+            for config_file_name in CONFIG_SOURCES:
+                potential_config_file = os.path.join(current_directory, config_file_name)
+                try:
+                    config_files.append(
+                        (potential_config_file, os.stat(potential_config_file).st_mtime_ns)
+                    )
+                except OSError:
+                    pass
+
+            if any(
+                os.path.isdir(os.path.join(current_directory, stop_dir))
+                for stop_dir in STOP_CONFIG_SEARCH_ON_DIRS
+            ):
+                break
+
+            new_directory = os.path.split(current_directory)[0]
+            if new_directory == current_directory:
+                break
+            current_directory = new_directory
+        return tuple(config_files)
+
+    def get(
+        self, file_path: Optional[Path], cwd: str, settings: Optional[Dict[str, Any]] = None
+    ) -> Config:
+        """Returns a Config equivalent to the one `isort.api` would build for the given file when
+        run from `cwd`.
+        """
+        settings = dict(settings or {})
+        for path_setting in ("settings_path", "settings_file"):
+            if settings.get(path_setting):
+                settings[path_setting] = os.path.join(cwd, settings[path_setting])
+        if file_path and "settings_path" not in settings and "settings_file" not in settings:
+            if not file_path.exists():
+                raise InvalidSettingsPath(str(file_path))
+            settings["settings_path"] = str(file_path.parent)
+
+        # Like isort.api, no config file is read unless a file or settings path is given
+        search_path = (
+            os.path.dirname(settings["settings_file"])
+            if settings.get("settings_file")
+            else settings.get("settings_path")
+        )
+        shared_settings = {
+            name: value for name, value in settings.items() if name != "settings_path"
+        }
+        key = (
+            self._config_files(search_path) if search_path else (),
+            cwd,
+            json.dumps(shared_settings, sort_keys=True, default=str),
+        )
+        config = self._configs.get(key)
+        if config is not None:
+            self.hits += 1
+            return config
+
+        with self._lock:
+            self.misses += 1
+            _find_config.cache_clear()
+            _get_config_data.cache_clear()
+            if not search_path or (
+                not settings.get("settings_file")
+                and not _find_config(os.path.abspath(settings["settings_path"]))[1]
+            ):
+                settings.setdefault("directory", cwd)  # What os.getcwd() gives the client
+            config = Config(**settings)
+            if len(self._configs) >= self.max_size:
+                self._configs.pop(next(iter(self._configs)))
+            self._configs[key] = config
+        return config
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    server: "SortServer"
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            response = self.server.respond(line)
+            self.wfile.write(json.dumps(response).encode("utf8") + b"\n")
+            self.wfile.flush()
+
+
+class SortServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    """Serves sort requests from a Unix socket, each connection on its own thread."""
+
+    address_family = getattr(socket, "AF_UNIX", -1)
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, config_cache: Optional[ConfigCache] = None) -> None:
+        _prepare_socket_directory(socket_path)
+        self.socket_path = socket_path
+        self.config_cache = config_cache or ConfigCache()
+        # Only the user running isortd can connect, from the moment the socket is bound
+        umask = os.umask(0o177)
+        try:
+            super().__init__(socket_path, _RequestHandler)  # type: ignore
+        finally:
+            os.umask(umask)
+
+    def respond(self, line: bytes) -> Dict[str, Any]:
+        try:
+            request = json.loads(line.decode("utf8"))
+            cwd = request.get("cwd") or os.getcwd()
+            file_path = request.get("file_path")
+            full_path = Path(cwd, file_path) if file_path else None
+            config = self.config_cache.get(full_path, cwd, request.get("settings"))
+            if place.refresh_src_paths():  # Modules were added or removed since they were placed
+                sorted_blocks.clear()
+            line_range = request.get("line_range")
+            return _sort(
+                request["code"],
+                config,
+                file_path=full_path,
+                extension=request.get("extension"),
+                disregard_skip=request.get("disregard_skip", False),
+                line_range=(line_range[0], line_range[1]) if line_range else None,
+                edits=request.get("edits", False),
+            )
+        except Exception as error:  # Reported to the client, which then sorts in-process
+            return {"error": f"{type(error).__name__}: {error}"}
+
+    def server_close(self) -> None:
+        super().server_close()
+        try:
+            os.unlink(self.socket_path)
+        except OSError:  # pragma: no cover
+            pass
+
+
+def serve(socket_path: str = "") -> None:
+    """Runs isortd in the foreground until interrupted."""
+    socket_path = socket_path or default_socket_path()
+    try:
+        _prepare_socket_directory(socket_path)
+        if os.path.exists(socket_path):
+            if Client(socket_path).ping():
+                sys.exit(f"isortd is already listening on {socket_path}")
+            os.unlink(socket_path)
+        server = SortServer(socket_path)
+    except OSError as error:
+        sys.exit(f"isortd can't listen on {socket_path}: {error}")
+
+    with server:
+        print(f"isortd listening on {socket_path}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:  # pragma: no cover
+            pass
+
+
+class Client:
+    """Sorts code through a running isortd, falling back to sorting in-process."""
+
+    def __init__(self, socket_path: str = "", timeout: float = CLIENT_TIMEOUT) -> None:
+        self.socket_path = socket_path or default_socket_path()
+        self.timeout = timeout
+        self._socket: Optional[socket.socket] = None
+        self._reader: Any = None
+
+    def _request(self, request: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        if not hasattr(socket, "AF_UNIX"):  # pragma: no cover
+            return None
+
+        try:
+            if self._socket is None:
+                if not _is_trusted_socket(self.socket_path):  # Could be another user's
+                    return None
+                self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                self._socket.settimeout(self.timeout)
+                self._socket.connect(self.socket_path)
+                self._reader = self._socket.makefile("rb")
+            self._socket.sendall(json.dumps(request).encode("utf8") + b"\n")
+            response = json.loads(self._reader.readline().decode("utf8"))
+        except (OSError, ValueError):
+            self.close()
+            return None
+        return response if "error" not in response else None
+
+    def ping(self) -> bool:
+        """Returns `True` if an isortd is listening on this client's socket."""
+        return self._request({"code": ""}) is not None
+
+    def close(self) -> None:
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+
+    def _sort(
+        self,
+        code: str,
+        file_path: Optional[Path],
+        extension: Optional[str],
+        disregard_skip: bool,
+        config_kwargs: Dict[str, Any],
+        line_range: Optional[Tuple[int, int]] = None,
+        edits: bool = False,
+    ) -> Dict[str, Any]:
+        request: Dict[str, Any] = {
+            "code": code,
+            "file_path": str(file_path) if file_path else None,
+            "extension": extension,
+            "disregard_skip": disregard_skip,
+            "cwd": os.getcwd(),
+            "settings": config_kwargs,
+        }
+        if line_range:
+            request["line_range"] = list(line_range)
+        if edits:
+            request["edits"] = True
+        response = self._request(request)
+        if response is not None:
+            return response
+
+        return _sort(
+            code,
+            api._config(path=file_path, **config_kwargs),
+            file_path=file_path,
+            extension=extension,
+            disregard_skip=disregard_skip,
+            line_range=line_range,
+            edits=edits,
+        )
+
+    def sort_code_string(
+        self,
+        code: str,
+        extension: Optional[str] = None,
+        file_path: Optional[Path] = None,
+        disregard_skip: bool = False,
+        line_range: Optional[Tuple[int, int]] = None,
+        **config_kwargs,
+    ) -> str:
+        """Sorts the imports within the given code, see `isort.api.sort_code_string`."""
+        return self._sort(code, file_path, extension, disregard_skip, config_kwargs, line_range)[
+            "code"
+        ]
+
+    def check_code_string(
+        self,
+        code: str,
+        extension: Optional[str] = None,
+        file_path: Optional[Path] = None,
+        disregard_skip: bool = False,
+        line_range: Optional[Tuple[int, int]] = None,
+        **config_kwargs,
+    ) -> bool:
+        """Returns `True` if the imports within the given code are already sorted, see
+        `isort.api.check_code_string`.
+        """
+        return not self._sort(
+            code, file_path, extension, disregard_skip, config_kwargs, line_range
+        )["changed"]
+
+    def find_edits_in_code(
+        self,
+        code: str,
+        extension: Optional[str] = None,
+        file_path: Optional[Path] = None,
+        disregard_skip: bool = False,
+        line_range: Optional[Tuple[int, int]] = None,
+        **config_kwargs,
+    ) -> List[Edit]:
+        """Returns the edits that sort the imports within the given code, see
+        `isort.api.find_edits_in_code`.
+        """
+        response = self._sort(
+            code, file_path, extension, disregard_skip, config_kwargs, line_range, edits=True
+        )
+        return [Edit(*edit) for edit in response["edits"]]
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Keeps isort running in the background to serve sort requests over a "
+        "Unix socket."
+    )
+    parser.add_argument(
+        "--socket",
+        default="",
+        help="The Unix socket to listen on, within a directory only the current user can write "
+        "to. Defaults to $ISORTD_SOCKET or a per-user socket in $XDG_RUNTIME_DIR or in a private "
+        "directory within the temp directory.",
+    )
+    arguments = parser.parse_args(argv)
+    serve(arguments.socket)
+
+
+def client_main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Sorts files through a running isortd, sorting in-process if none is running."
+    )
+    parser.add_argument("files", nargs="+", help="Files to sort, or - to sort stdin to stdout.")
+    parser.add_argument(
+        "-c",
+        "--check-only",
+        "--check",
+        action="store_true",
+        dest="check",
+        help="Checks the file for unsorted / unformatted imports without modifying it.",
+    )
+    parser.add_argument("--socket", default="", help="The Unix socket isortd listens on.")
+    arguments = parser.parse_args(argv)
+
+    client = Client(arguments.socket)
+    incorrectly_sorted: List[str] = []
+    for file_name in arguments.files:
+        if file_name == "-":
+            result = client._sort(sys.stdin.read(), None, None, False, {})
+            if arguments.check:
+                if result["changed"]:
+                    incorrectly_sorted.append(file_name)
+            else:
+                sys.stdout.write(result["code"])
+            continue
+
+        try:
+            with io.File.read(file_name) as source_file:
+                code = source_file.stream.read()
+            result = client._sort(code, Path(file_name), None, False, {})
+        except FileSkipped:
+            continue
+        except ISortError as error:
+            print(f"ERROR: {error}", file=sys.stderr)
+            incorrectly_sorted.append(file_name)
+            continue
+
+        if not result["changed"]:
+            continue
+        if arguments.check:
+            print(
+                f"ERROR: {source_file.path} Imports are incorrectly sorted and/or formatted.",
+                file=sys.stderr,
+            )
+            incorrectly_sorted.append(file_name)
+        else:
+            with open(file_name, "w", encoding=source_file.encoding, newline="") as output_file:
+                output_file.write(result["code"])
+            print(f"Fixing {source_file.path}")
+
+    client.close()
+    if arguments.check and incorrectly_sorted:
+        sys.exit(1)
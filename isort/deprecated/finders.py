@@ -12,11 +12,21 @@ from fnmatch import fnmatch
 from functools import lru_cache
 from glob import glob
 from pathlib import Path
-from typing import Dict, Iterable, Iterator, List, Optional, Pattern, Sequence, Tuple, Type
+from typing import (
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Pattern,
+    Sequence,
+    Tuple,
+    Type,
+)
 
 from isort import sections
 from isort.settings import KNOWN_SECTION_MAPPING, Config
-from isort.utils import exists_case_sensitive
 
 try:
     from pipreqs import pipreqs
@@ -168,41 +178,86 @@ class PathFinder(BaseFinder):
             if system_path not in self.paths:
                 self.paths.append(system_path)
 
+        # which of the paths first provides each top-level module, listed from the paths as they
+        # are now, reusing the listings of paths that haven't been modified since last listed
+        self._index = _path_index(tuple((prefix, _modified(prefix)) for prefix in self.paths))
+
     def find(self, module_name: str) -> Optional[str]:
-        for prefix in self.paths:
-            package_path = "/".join((prefix, module_name.split(".")[0]))
-            path_obj = Path(package_path).resolve()
-            is_module = (
-                exists_case_sensitive(package_path + ".py")
-                or any(
-                    exists_case_sensitive(package_path + ext_suffix)
-                    for ext_suffix in importlib.machinery.EXTENSION_SUFFIXES
-                )
-                or exists_case_sensitive(package_path + "/__init__.py")
-            )
-            is_package = exists_case_sensitive(package_path) and os.path.isdir(package_path)
-            if is_module or is_package:
-                if (
-                    "site-packages" in prefix
-                    or "dist-packages" in prefix
-                    or (self.virtual_env and self.virtual_env_src in prefix)
-                ):
-                    return sections.THIRDPARTY
-                if os.path.normcase(prefix) == self.stdlib_lib_prefix:
-                    return sections.STDLIB
-                if self.conda_env and self.conda_env in prefix:
-                    return sections.THIRDPARTY
-                for src_path in self.config.src_paths:
-                    if src_path in path_obj.parents and not self.config.is_skipped(path_obj):
-                        return sections.FIRSTPARTY
-
-                if os.path.normcase(prefix).startswith(self.stdlib_lib_prefix):
-                    return sections.STDLIB  # pragma: no cover - edge case for one OS. Hard to test.
-
-                return self.config.default_section
+        top_level = module_name.split(".")[0]
+        position = self._index.get(top_level)
+        if position is None:
+            return None
+
+        prefix = self.paths[position]
+        if (
+            "site-packages" in prefix
+            or "dist-packages" in prefix
+            or (self.virtual_env and self.virtual_env_src in prefix)
+        ):
+            return sections.THIRDPARTY
+        if os.path.normcase(prefix) == self.stdlib_lib_prefix:
+            return sections.STDLIB
+        if self.conda_env and self.conda_env in prefix:
+            return sections.THIRDPARTY
+        path_obj = Path("/".join((prefix, top_level))).resolve()
+        for src_path in self.config.src_paths:
+            if src_path in path_obj.parents and not self.config.is_skipped(path_obj):
+                return sections.FIRSTPARTY
+
+        if os.path.normcase(prefix).startswith(self.stdlib_lib_prefix):
+            return sections.STDLIB  # pragma: no cover - edge case for one OS. Hard to test.
+
+        return self.config.default_section
+
+
+def _modified(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
         return None
 
 
+@lru_cache(maxsize=16)
+def _path_index(prefixes: Tuple[Tuple[str, Optional[int]], ...]) -> Dict[str, int]:
+    """Maps each top-level module name to the position of the first of the prefixes providing it,
+    given each prefix alongside its modification time, so the index is rebuilt when one changes.
+    """
+    index: Dict[str, int] = {}
+    for position, (prefix, modified) in enumerate(prefixes):
+        for name in _prefix_modules(prefix, modified):
+            index.setdefault(name, position)
+    return index
+
+
+@lru_cache(maxsize=100)
+def _prefix_modules(prefix: str, modified: Optional[int]) -> FrozenSet[str]:
+    """Returns the top-level modules found directly within prefix: its directories, and the files
+    named after a module with a source or extension module suffix. The prefix itself is included
+    as "" when it's a directory, as the top-level name of relative imports.
+    """
+    if modified is None or not os.path.isdir(prefix):
+        return frozenset()
+
+    suffixes = (".py", *importlib.machinery.EXTENSION_SUFFIXES)
+    modules = {""}
+    try:
+        with os.scandir(prefix) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_symlink() and not os.path.exists(entry.path):
+                        continue
+                    if entry.is_dir():
+                        modules.add(entry.name)
+                except OSError:  # pragma: no cover - vanished while being listed
+                    continue
+                for suffix in suffixes:
+                    if entry.name.endswith(suffix):
+                        modules.add(entry.name[: -len(suffix)])
+    except OSError:
+        return frozenset()
+    return frozenset(modules)
+
+
 class ReqsBaseFinder(BaseFinder):
     enabled = False
 
@@ -0,0 +1,295 @@
+"""Matches paths against git's ignore rules in-process.
+
+Follows the same rules as `git check-ignore`: patterns are read from the `.gitignore` file of the
+path's directory and of every parent directory up to the repository root (deeper files take
+precedence), then from `$GIT_DIR/info/exclude`, and finally from the global `core.excludesFile`.
+As with `git check-ignore`, paths tracked in the git index are never ignored, even if they match a
+pattern. Every ignore file is read and compiled once and the tracked files are listed once per
+repository, so checking a path never spawns a git process of its own.
+"""
+import os
+import re
+import subprocess  # nosec: Needed to read core.excludesFile and core.ignoreCase.
+from typing import Dict, FrozenSet, Iterable, List, Optional, Pattern, Tuple
+
+_Rule = Tuple[Pattern[str], bool, bool]  # (compiled pattern, negated, only matches directories)
+_TRUE_VALUES = frozenset(("", "true", "yes", "on", "1"))
+
+
+def _translate(pattern: str) -> str:
+    """Translates a single gitignore glob into an (unanchored) regular expression."""
+    result = []
+    index = 0
+    length = len(pattern)
+    while index < length:
+        char = pattern[index]
+        if char == "*":
+            if (
+                pattern.startswith("**", index)
+                and (index == 0 or pattern[index - 1] == "/")
+                and (index + 2 == length or pattern[index + 2] == "/")
+            ):
+                if index + 2 == length:  # a trailing "**" matches everything inside
+                    result.append(".*")
+                    index += 2
+                else:  # "**/" matches zero or more directories
+                    result.append("(?:.*/)?")
+                    index += 3
+                continue
+
+            while index < length and pattern[index] == "*":
+                index += 1
+            result.append("[^/]*")
+            continue
+
+        if char == "?":
+            result.append("[^/]")
+        elif char == "\\" and index + 1 < length:
+            index += 1
+            result.append(re.escape(pattern[index]))
+        elif char == "[":
+            end = index + 1
+            if end < length and pattern[end] in "!^":
+                end += 1
+            if end < length and pattern[end] == "]":
+                end += 1
+            while end < length and pattern[end] != "]":
+                end += 1
+            if end >= length:
+                result.append("\\[")
+            else:
+                body = pattern[index + 1 : end].replace("\\", "\\\\").replace("[", "\\[")
+                if body[:1] in ("!", "^"):
+                    body = "^" + body[1:]
+                result.append(f"[{body}]")
+                index = end
+        else:
+            result.append(re.escape(char))
+        index += 1
+    return "".join(result)
+
+
+def parse_rules(lines: Iterable[str], ignore_case: bool = False) -> List[_Rule]:
+    """Compiles the lines of an ignore file into rules, in the order they were defined."""
+    rules = []
+    flags = re.IGNORECASE if ignore_case else 0
+    for line in lines:
+        line = line.rstrip("\r\n")
+        pattern = line.rstrip(" ")
+        if pattern.endswith("\\") and len(pattern) < len(line):
+            pattern += " "
+        if not pattern or pattern.startswith("#"):
+            continue
+
+        negated = pattern.startswith("!")
+        if negated:
+            pattern = pattern[1:]
+        directories_only = pattern.endswith("/")
+        if directories_only:
+            pattern = pattern.rstrip("/")
+        anchored = "/" in pattern
+        pattern = pattern.lstrip("/")
+        if not pattern:
+            continue
+
+        regex = _translate(pattern)
+        if not anchored:
+            regex = f"(?:.*/)?{regex}"
+        rules.append((re.compile(f"{regex}\\Z", flags), negated, directories_only))
+    return rules
+
+
+def _read_rules(file_name: str, ignore_case: bool) -> List[_Rule]:
+    try:
+        with open(file_name, encoding="utf8", errors="replace") as ignore_file:
+            return parse_rules(ignore_file, ignore_case)
+    except OSError:
+        return []
+
+
+def _match(rules: List[_Rule], path: str, is_dir: bool) -> Optional[bool]:
+    """Returns whether the last of the given rules matching path ignores it, or `None` if no
+    rule matches.
+    """
+    for pattern, negated, directories_only in reversed(rules):
+        if (is_dir or not directories_only) and pattern.match(path):
+            return not negated
+    return None
+
+
+def _git_dir(root: str) -> str:
+    """Returns the directory holding the repository's shared metadata, including `info/exclude`."""
+    git_dir = os.path.join(root, ".git")
+    if os.path.isfile(git_dir):  # a submodule or linked worktree
+        try:
+            with open(git_dir, encoding="utf8") as git_file:
+                contents = git_file.read().strip()
+        except OSError:
+            return git_dir
+        if contents.startswith("gitdir:"):
+            git_dir = os.path.join(root, contents[len("gitdir:") :].strip())
+
+    try:
+        with open(os.path.join(git_dir, "commondir"), encoding="utf8") as commondir_file:
+            return os.path.join(git_dir, commondir_file.read().strip())
+    except OSError:
+        return git_dir
+
+
+def _git_settings(root: str) -> Dict[str, str]:
+    """Returns the core.excludesFile and core.ignoreCase settings git uses for the repository."""
+    try:
+        output = subprocess.run(  # nosec
+            [
+                "git",
+                "-C",
+                root,
+                "config",
+                "-z",
+                "--get-regexp",
+                r"^core\.(excludesfile|ignorecase)$",
+            ],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        ).stdout.decode("utf8", "replace")
+    except OSError:
+        output = ""
+
+    settings = {}
+    for entry in output.split("\0"):
+        key, _, value = entry.partition("\n")
+        if key:
+            settings[key.lower()] = value
+    return settings
+
+
+def _tracked_paths(root: str) -> FrozenSet[str]:
+    """Returns the `/` separated paths, relative to root, of every file in the repository's index
+    and of every directory containing one.
+    """
+    try:
+        output = subprocess.run(  # nosec
+            ["git", "-C", root, "ls-files", "-z"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        ).stdout
+    except OSError:
+        return frozenset()
+
+    paths = set()
+    for path in output.split(b"\0"):
+        tracked_path = os.fsdecode(path)
+        while tracked_path and tracked_path not in paths:
+            paths.add(tracked_path)
+            tracked_path = tracked_path.rpartition("/")[0]
+    return frozenset(paths)
+
+
+class _Repository:
+    """The ignore rules of a single git repository, loaded lazily one directory at a time."""
+
+    def __init__(self, root: str) -> None:
+        self.root = root
+        settings = _git_settings(root)
+        self.ignore_case = settings.get("core.ignorecase", "false").lower() in _TRUE_VALUES
+
+        excludes_file = settings.get("core.excludesfile", "")
+        if excludes_file:
+            excludes_file = os.path.join(root, os.path.expanduser(excludes_file))
+        else:
+            config_home = os.environ.get("XDG_CONFIG_HOME") or os.path.join(
+                os.path.expanduser("~"), ".config"
+            )
+            excludes_file = os.path.join(config_home, "git", "ignore")
+        self.excluded: Tuple[List[_Rule], ...] = (
+            _read_rules(os.path.join(_git_dir(root), "info", "exclude"), self.ignore_case),
+            _read_rules(excludes_file, self.ignore_case),
+        )
+        self._directory_rules: Dict[str, List[_Rule]] = {}
+        self._ignored_directories: Dict[str, bool] = {}
+        self._tracked: Optional[FrozenSet[str]] = None
+
+    def _is_tracked(self, path: str) -> bool:
+        if self._tracked is None:
+            tracked = _tracked_paths(self.root)
+            if self.ignore_case:
+                tracked = frozenset(tracked_path.lower() for tracked_path in tracked)
+            self._tracked = tracked
+        return (path.lower() if self.ignore_case else path) in self._tracked
+
+    def _rules(self, directory: str) -> List[_Rule]:
+        rules = self._directory_rules.get(directory)
+        if rules is None:
+            rules = _read_rules(os.path.join(self.root, directory, ".gitignore"), self.ignore_case)
+            self._directory_rules[directory] = rules
+        return rules
+
+    def _match(self, path: str, is_dir: bool) -> Optional[bool]:
+        directory = path
+        while directory:
+            directory = directory.rpartition("/")[0]
+            rules = self._rules(directory)
+            if rules:
+                matched = _match(rules, path[len(directory) + 1 :] if directory else path, is_dir)
+                if matched is not None:
+                    return matched
+
+        for rules in self.excluded:
+            matched = _match(rules, path, is_dir)
+            if matched is not None:
+                return matched
+        return None
+
+    def _is_ignored_directory(self, directory: str) -> bool:
+        ignored = self._ignored_directories.get(directory)
+        if ignored is None:
+            parent = directory.rpartition("/")[0]
+            ignored = bool(parent and self._is_ignored_directory(parent)) or bool(
+                self._match(directory, True)
+            )
+            self._ignored_directories[directory] = ignored
+        return ignored
+
+    def is_ignored(self, path: str, is_dir: bool) -> bool:
+        """Returns `True` if the given `/` separated path, relative to the repository root, is
+        ignored either directly or because one of its parent directories is, and isn't tracked.
+        """
+        parent = path.rpartition("/")[0]
+        ignored = bool(parent and self._is_ignored_directory(parent)) or bool(
+            self._match(path, is_dir)
+        )
+        return ignored and not self._is_tracked(path)
+
+
+class GitIgnore:
+    """Answers whether paths are ignored by git, reading each repository's ignore files once."""
+
+    def __init__(self) -> None:
+        self._repositories: Dict[str, Optional[_Repository]] = {}
+
+    def _repository(self, directory: str) -> Optional[_Repository]:
+        if directory in self._repositories:
+            return self._repositories[directory]
+
+        repository: Optional[_Repository]
+        if os.path.exists(os.path.join(directory, ".git")):
+            repository = _Repository(directory)
+        else:
+            parent = os.path.dirname(directory)
+            repository = None if parent == directory else self._repository(parent)
+        self._repositories[directory] = repository
+        return repository
+
+    def is_ignored(self, path: str, is_dir: Optional[bool] = None) -> bool:
+        """Returns `True` if git ignores the given path. Paths outside of any git repository are
+        never ignored.
+        """
+        path = os.path.abspath(path)
+        repository = self._repository(os.path.dirname(path))
+        if repository is None:
+            return False
+
+        relative_path = os.path.relpath(path, repository.root).replace(os.sep, "/")
+        if is_dir is None:
+            is_dir = os.path.isdir(path)
+        return repository.is_ignored(relative_path, is_dir)
@@ -7,6 +7,7 @@ from pathlib import Path
 from typing import Callable, Iterator, NamedTuple, TextIO, Union
 
 from isort.exceptions import UnsupportedEncoding
+from isort.timings import timed
 
 _ENCODING_PATTERN = re.compile(br"^[ \t\f]*#.*?coding[:=][ \t]*([-_.a-zA-Z0-9]+)")
 
@@ -33,6 +34,7 @@ class File(NamedTuple):
         return self.path.suffix.lstrip(".")
 
     @staticmethod
+    @timed("read")
     def _open(filename):
         """Open a file in read only mode using the encoding detected by
         detect_encoding().
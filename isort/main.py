@@ -1,20 +1,34 @@
 """Tool for sorting imports alphabetically, and automatically separated into sections."""
 import argparse
-import functools
+import hashlib
 import json
 import os
+import subprocess  # nosec: Needed for --changed-since support.
 import sys
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from io import TextIOWrapper
 from pathlib import Path
-from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Set
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
 from warnings import warn
 
-from . import __version__, api, sections
+from . import __version__, api, place, sections, timings
+from .cache import (
+    Placement,
+    PlacementCache,
+    PlacementDependencies,
+    ResultCache,
+    config_fingerprint,
+    file_digest,
+    placement_cache_path,
+    sorted_blocks,
+)
 from .exceptions import FileSkipped, UnsupportedEncoding
 from .format import create_terminal_printer
 from .logo import ASCII_ART
 from .profiles import profiles
-from .settings import DEFAULT_CONFIG, VALID_PY_TARGETS, Config, WrapModes
+from .settings import DEFAULT_CONFIG, VALID_PY_TARGETS, Config, ConfigResolver, WrapModes
 
 try:
     from .setuptools_commands import ISortCommand  # noqa: F401
@@ -64,6 +78,11 @@ Try one of the following:
 
 Visit https://pycqa.github.io/isort/ for complete information about how to use isort.
 """
+DISCOVERY_THREADS: int = min(32, (os.cpu_count() or 1) + 4)  # Threads used to walk directories
+MAX_JOB_CHUNK_SIZE: int = 32  # The most files sent to a --jobs worker process at once
+
+_worker_settings: Dict[str, Any] = {}  # Set once per --jobs worker process by _init_worker
+_ScannedDirectory = Tuple[List[Tuple[str, Tuple[int, int], bool]], List[str], List[str]]
 
 
 class SortAttempt:
@@ -83,47 +102,187 @@ def sort_imports(
 ) -> Optional[SortAttempt]:
     incorrectly_sorted: bool = False
     skipped: bool = False
-    try:
-        if check:
+    with timings.file(file_name):
+        try:
+            if check:
+                try:
+                    incorrectly_sorted = not api.check_file(file_name, config=config, **kwargs)
+                except FileSkipped:
+                    skipped = True
+                return SortAttempt(incorrectly_sorted, skipped, True)
+
             try:
-                incorrectly_sorted = not api.check_file(file_name, config=config, **kwargs)
+                incorrectly_sorted = api.sort_file(
+                    file_name,
+                    config=config,
+                    ask_to_apply=ask_to_apply,
+                    write_to_stdout=write_to_stdout,
+                    **kwargs,
+                )
             except FileSkipped:
                 skipped = True
             return SortAttempt(incorrectly_sorted, skipped, True)
-
-        try:
-            incorrectly_sorted = not api.sort_file(
-                file_name,
-                config=config,
-                ask_to_apply=ask_to_apply,
-                write_to_stdout=write_to_stdout,
-                **kwargs,
+        except (OSError, ValueError) as error:
+            warn(f"Unable to parse file {file_name} due to {error}")
+            return None
+        except UnsupportedEncoding:
+            if config.verbose:
+                warn(f"Encoding not supported for {file_name}")
+            return SortAttempt(incorrectly_sorted, skipped, False)
+        except KeyError as error:
+            if error.args[0] not in DEFAULT_CONFIG.sections:
+                _print_hard_fail(config, offending_file=file_name)
+                raise
+            msg = (
+                f"Found {error} imports while parsing, but {error} was not included "
+                "in the `sections` setting of your config. Please add it before continuing\n"
+                "See https://pycqa.github.io/isort/#custom-sections-and-ordering "
+                "for more info."
             )
-        except FileSkipped:
-            skipped = True
-        return SortAttempt(incorrectly_sorted, skipped, True)
-    except (OSError, ValueError) as error:
-        warn(f"Unable to parse file {file_name} due to {error}")
-        return None
-    except UnsupportedEncoding:
-        if config.verbose:
-            warn(f"Encoding not supported for {file_name}")
-        return SortAttempt(incorrectly_sorted, skipped, False)
-    except KeyError as error:
-        if error.args[0] not in DEFAULT_CONFIG.sections:
+            _print_hard_fail(config, message=msg)
+            sys.exit(os.EX_CONFIG)
+        except Exception:
             _print_hard_fail(config, offending_file=file_name)
             raise
-        msg = (
-            f"Found {error} imports while parsing, but {error} was not included "
-            "in the `sections` setting of your config. Please add it before continuing\n"
-            "See https://pycqa.github.io/isort/#custom-sections-and-ordering "
-            "for more info."
+
+
+def _init_worker(
+    config: Config,
+    sort_kwargs: Dict[str, Any],
+    config_resolver: Optional[ConfigResolver] = None,
+    collect_timings: bool = False,
+    collect_placements: bool = False,
+) -> None:
+    """Stores the config and sort options within a --jobs worker process, so that they are only
+    sent to each worker once rather than alongside every file.
+    """
+    _worker_settings["config"] = config
+    _worker_settings["sort_kwargs"] = sort_kwargs
+    _worker_settings["config_resolver"] = config_resolver
+    _worker_settings["collect_placements"] = collect_placements
+    if collect_placements:
+        place.placement_cache(config).collect_added()
+    if collect_timings:
+        timings.enable()
+
+
+def _sort_imports_chunk(
+    file_names: List[str],
+) -> Tuple[
+    List[Optional[Tuple[bool, bool, bool]]],
+    float,
+    Optional[Dict[str, Any]],
+    Tuple[int, int],
+    Optional[Dict[str, Tuple[Placement, PlacementDependencies]]],
+]:
+    """Sorts a chunk of files within a --jobs worker process. Returns a compact result tuple
+    per file alongside the time the worker spent busy on the chunk, when collecting them the
+    timings recorded while processing it, the hits and misses of the worker's sorted import
+    block cache during it, and when collecting them the module placements it made.
+    """
+    started = time.perf_counter()
+    block_hits, block_misses = sorted_blocks.hits, sorted_blocks.misses
+    results: List[Optional[Tuple[bool, bool, bool]]] = []
+    config_resolver = _worker_settings["config_resolver"]
+    for file_name in file_names:
+        attempt = sort_imports(
+            file_name,
+            config=config_resolver.config_for(file_name)
+            if config_resolver
+            else _worker_settings["config"],
+            **_worker_settings["sort_kwargs"],
+        )
+        results.append(
+            (attempt.incorrectly_sorted, attempt.skipped, attempt.supported_encoding)
+            if attempt
+            else None
+        )
+    collector = timings.collector()
+    return (
+        results,
+        time.perf_counter() - started,
+        collector.take() if collector else None,
+        (sorted_blocks.hits - block_hits, sorted_blocks.misses - block_misses),
+        place.placement_cache(_worker_settings["config"]).take_added()
+        if _worker_settings["collect_placements"]
+        else None,
+    )
+
+
+def _chunk_file_names(
+    file_names: Iterable[str], jobs: int, max_chunk_size: int = MAX_JOB_CHUNK_SIZE
+) -> Iterator[List[str]]:
+    """Groups file names into chunks for worker processes.
+
+    Chunks start out as single files, so every worker is busy as soon as the first files are
+    found, and double in size after each round of one chunk per worker, up to `max_chunk_size`,
+    to amortize the dispatch overhead on large runs.
+    """
+    chunk_size = 1
+    chunks_dispatched = 0
+    chunk: List[str] = []
+    for file_name in file_names:
+        chunk.append(file_name)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+            chunks_dispatched += 1
+            if chunks_dispatched % jobs == 0:
+                chunk_size = min(chunk_size * 2, max_chunk_size)
+    if chunk:
+        yield chunk
+
+
+def _pooled_sort_attempts(
+    executor: Any,
+    file_names: Iterable[str],
+    jobs: int,
+    busy_times: List[float],
+    sorted_block_counts: List[int],
+    placements: Optional[PlacementCache] = None,
+) -> Iterator[Optional[SortAttempt]]:
+    """Sorts the given files across the worker processes of `executor`, yielding one attempt
+    per file in order, recording how long each chunk kept its worker busy, adding the
+    workers' sorted import block cache hits and misses to `sorted_block_counts` and, when given,
+    the module placements they made to `placements`.
+    """
+    collector = timings.collector()
+    for results, busy_time, chunk_timings, block_counts, chunk_placements in executor.imap(
+        _sort_imports_chunk, _chunk_file_names(file_names, jobs)
+    ):
+        busy_times.append(busy_time)
+        sorted_block_counts[0] += block_counts[0]
+        sorted_block_counts[1] += block_counts[1]
+        if collector and chunk_timings:
+            collector.merge(chunk_timings)
+        if placements is not None and chunk_placements:
+            placements.update(
+                {name: placement for name, (placement, _) in chunk_placements.items()},
+                {name: dependencies for name, (_, dependencies) in chunk_placements.items()},
+            )
+        for result in results:
+            yield SortAttempt(*result) if result else None
+
+
+def _report_timings(
+    wall_time: float, jobs: int, report_path: Optional[str], slowest: Optional[int]
+) -> None:
+    """Prints a summary of the timings collected for --timings, writing the full report to
+    report_path when given.
+    """
+    collector = timings.collector()
+    if collector is None:
+        return
+
+    timings.disable()
+    print(collector.summary(wall_time, jobs), file=sys.stderr)
+    if report_path:
+        report = collector.report(
+            wall_time, timings.DEFAULT_SLOWEST_FILES if slowest is None else slowest
         )
-        _print_hard_fail(config, message=msg)
-        sys.exit(os.EX_CONFIG)
-    except Exception:
-        _print_hard_fail(config, offending_file=file_name)
-        raise
+        with open(report_path, "w", encoding="utf-8") as report_file:
+            json.dump(report, report_file, indent=4)
+        print(f"Wrote timings report to {report_path}", file=sys.stderr)
 
 
 def _print_hard_fail(
@@ -143,36 +302,239 @@ def iter_source_code(
     paths: Iterable[str], config: Config, skipped: List[str], broken: List[str]
 ) -> Iterator[str]:
     """Iterate over all Python source files defined in paths."""
-    visited_dirs: Set[Path] = set()
+    visited_dirs: Set[Tuple[int, int]] = set()
+    executor = ThreadPoolExecutor(max_workers=DISCOVERY_THREADS)
+    try:
+        for path in paths:
+            if os.path.isdir(path):
+                yield from _walk_source_code(path, config, skipped, visited_dirs, executor)
+            elif not os.path.exists(path):
+                broken.append(path)
+            else:
+                yield path
+    finally:
+        executor.shutdown(wait=False)
 
-    for path in paths:
-        if os.path.isdir(path):
-            for dirpath, dirnames, filenames in os.walk(path, topdown=True, followlinks=True):
-                base_path = Path(dirpath)
-                for dirname in list(dirnames):
-                    full_path = base_path / dirname
-                    resolved_path = full_path.resolve()
-                    if config.is_skipped(full_path):
-                        skipped.append(dirname)
-                        dirnames.remove(dirname)
+
+def _walk_source_code(
+    root: str,
+    config: Config,
+    skipped: List[str],
+    visited_dirs: Set[Tuple[int, int]],
+    executor: ThreadPoolExecutor,
+) -> Iterator[str]:
+    """Yields the source files below root in depth-first order.
+
+    Directories are scanned ahead of time by the executor's threads, as soon as their parent has
+    been scanned, so files can be yielded (and sorted) while the rest of the tree is still being
+    discovered.
+    """
+    try:
+        visited_dirs.add(_directory_identity(root))
+    except OSError:  # pragma: no cover - root was removed while being walked
+        return
+
+    pending: List["Future[_ScannedDirectory]"] = [executor.submit(_scan_directory, root, config)]
+    try:
+        while pending:
+            subdirectories, source_files, skipped_names = pending.pop().result()
+            skipped.extend(skipped_names)
+            yield from source_files
+
+            scheduled: List["Future[_ScannedDirectory]"] = []
+            for directory, identity, is_skipped in subdirectories:
+                if not is_skipped:
+                    if identity in visited_dirs:  # pragma: no cover
+                        if not config.quiet:
+                            real_path = os.path.realpath(directory)
+                            warn(f"Likely recursive symlink detected to {real_path}")
                     else:
-                        if resolved_path in visited_dirs:  # pragma: no cover
-                            if not config.quiet:
-                                warn(f"Likely recursive symlink detected to {resolved_path}")
-                            dirnames.remove(dirname)
-                    visited_dirs.add(resolved_path)
-
-                for filename in filenames:
-                    filepath = os.path.join(dirpath, filename)
-                    if config.is_supported_filetype(filepath):
-                        if config.is_skipped(Path(filepath)):
-                            skipped.append(filename)
-                        else:
-                            yield filepath
-        elif not os.path.exists(path):
-            broken.append(path)
+                        scheduled.append(executor.submit(_scan_directory, directory, config))
+                visited_dirs.add(identity)
+            pending.extend(reversed(scheduled))
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def _directory_identity(directory: str) -> Tuple[int, int]:
+    """Returns an identity for the given directory that is shared by all symlinks to it"""
+    directory_stat = os.stat(directory)
+    return (directory_stat.st_dev, directory_stat.st_ino)
+
+
+def _scan_directory(directory: str, config: Config) -> _ScannedDirectory:
+    """Lists the given directory, returning its subdirectories (alongside their identity and
+    whether they are skipped), the supported source files within it that aren't skipped, and the
+    names of any skipped files or directories.
+    """
+    subdirectories: List[Tuple[str, Tuple[int, int], bool]] = []
+    source_files: List[str] = []
+    skipped: List[str] = []
+    try:
+        entries = list(os.scandir(directory))
+    except OSError:
+        return (subdirectories, source_files, skipped)
+
+    resolved_directory = os.path.realpath(directory)
+
+    for entry in entries:
+        try:
+            is_dir = entry.is_dir()
+        except OSError:  # pragma: no cover - entry was removed while being scanned
+            is_dir = False
+
+        if is_dir:
+            try:
+                identity = _directory_identity(entry.path)
+            except OSError:  # pragma: no cover - entry was removed while being scanned
+                continue
+            is_skipped = config.is_skipped_entry(entry, resolved_directory)
+            if is_skipped:
+                skipped.append(entry.name)
+            subdirectories.append((entry.path, identity, is_skipped))
+        elif config.is_supported_filetype(entry.path):
+            if config.is_skipped_entry(entry, resolved_directory):
+                skipped.append(entry.name)
+            else:
+                source_files.append(entry.path)
+
+    return (subdirectories, source_files, skipped)
+
+
+def _git(directory: str, *arguments: str) -> str:
+    result = subprocess.run(  # nosec
+        ["git", "-C", directory, *arguments],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+    )
+    if result.returncode:
+        raise ValueError(result.stderr.strip() or f"git {arguments[0]} failed")
+    return result.stdout
+
+
+def git_changed_files(directory: str, ref: str) -> List[str]:
+    """Returns the absolute paths of every file within the git repository containing directory
+    that was added, modified, or renamed since ref, including untracked files that aren't ignored.
+    Deleted files are excluded.
+    """
+    root = _git(directory, "rev-parse", "--show-toplevel").strip()
+    changed = _git(root, "diff", "--name-only", "-z", "-M", "--diff-filter=d", ref, "--")
+    untracked = _git(root, "ls-files", "--others", "--exclude-standard", "-z")
+    return [
+        os.path.normpath(os.path.join(root, file_name))
+        for file_name in dict.fromkeys((changed + untracked).split("\0"))
+        if file_name
+    ]
+
+
+def iter_changed_source_code(
+    paths: Iterable[str], config: Config, ref: str, skipped: List[str], broken: List[str]
+) -> Iterator[str]:
+    """Iterate over the Python source files within paths that git reports as changed since ref.
+
+    Files are filtered in the same way as `iter_source_code`, including skipping files within
+    skipped directories, but without walking the directory tree. Git is asked once for each of the
+    repositories the paths are within, raising a `ValueError` for a path outside of any.
+    """
+    paths = list(paths)
+    existing_paths = []
+    for path in paths:
+        if os.path.exists(path):
+            existing_paths.append(path)
         else:
-            yield path
+            broken.append(path)
+    if not existing_paths:
+        return
+
+    repository_roots: Dict[str, str] = {}
+    repository_changes: Dict[str, Tuple[List[str], Set[str]]] = {}
+
+    def changed_files(path: str) -> Tuple[List[str], Set[str]]:
+        directory = path if os.path.isdir(path) else os.path.dirname(path) or "."
+        root = repository_roots.get(directory)
+        if root is None:
+            root = _git(directory, "rev-parse", "--show-toplevel").strip()
+            repository_roots[directory] = root
+        if root not in repository_changes:
+            files = git_changed_files(root, ref)
+            repository_changes[root] = (files, set(files))
+        return repository_changes[root]
+
+    skipped_dirs: Dict[str, bool] = {}
+
+    def is_skipped_dir(directory: str) -> bool:
+        if directory not in skipped_dirs:
+            skipped_dirs[directory] = config.is_skipped(Path(directory))
+            if skipped_dirs[directory]:
+                skipped.append(os.path.basename(directory))
+        return skipped_dirs[directory]
+
+    seen: Set[str] = set()
+    for path in existing_paths:
+        absolute_path = os.path.realpath(path)
+        if not os.path.isdir(path):
+            if absolute_path in changed_files(path)[1] and absolute_path not in seen:
+                seen.add(absolute_path)
+                yield path
+            continue
+
+        prefix = os.path.join(absolute_path, "")
+        for changed_file in changed_files(path)[0]:
+            if not changed_file.startswith(prefix) or changed_file in seen:
+                continue
+            seen.add(changed_file)
+            relative_parts = changed_file[len(prefix) :].split(os.sep)
+            directory = path
+            for part in relative_parts[:-1]:
+                directory = os.path.join(directory, part)
+                if is_skipped_dir(directory):
+                    break
+            else:
+                file_name = os.path.join(path, *relative_parts)
+                if config.is_supported_filetype(file_name):
+                    if config.is_skipped(Path(file_name)):
+                        skipped.append(relative_parts[-1])
+                    else:
+                        yield file_name
+
+
+def _uncached_files(
+    file_names: Iterable[str],
+    result_cache: ResultCache,
+    pending_digests: Deque[Optional[str]],
+    config_resolver: Optional[ConfigResolver] = None,
+) -> Iterator[str]:
+    """Yields only the files that aren't recorded as sorted within the given result cache,
+    appending the content hash of each yielded file to `pending_digests` in the same order.
+
+    When each file's config is resolved separately, the hash also covers the file's config.
+    """
+    config_fingerprints: Dict[int, str] = {}
+    for file_name in file_names:
+        digest = file_digest(file_name)
+        if digest and config_resolver:
+            config = config_resolver.config_for(file_name)
+            if id(config) not in config_fingerprints:
+                config_fingerprints[id(config)] = config_fingerprint(config)
+            digest = hashlib.sha256(
+                f"{digest}:{config_fingerprints[id(config)]}".encode("utf8")
+            ).hexdigest()
+        if not result_cache.is_sorted(digest):
+            pending_digests.append(digest)
+            yield file_name
+
+
+def _line_range(value: str) -> Tuple[int, int]:
+    first_line, _, last_line = value.partition("-")
+    try:
+        line_range = (int(first_line), int(last_line or first_line))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"{value!r} isn't a range of lines such as 10-20")
+    if not 0 < line_range[0] <= line_range[1]:
+        raise argparse.ArgumentTypeError(f"{value!r} isn't a range of lines such as 10-20")
+    return line_range
 
 
 def _build_arg_parser() -> argparse.ArgumentParser:
@@ -354,6 +716,66 @@ def _build_arg_parser() -> argparse.ArgumentParser:
     parser.add_argument(
         "-j", "--jobs", help="Number of files to process in parallel.", dest="jobs", type=int
     )
+    parser.add_argument(
+        "--cache-dir",
+        dest="cache_dir",
+        help="Directory used to remember files that were already found to be correctly sorted. "
+        "Files whose content and resolved config are unchanged since they were last seen sorted "
+        "are skipped entirely.",
+    )
+    parser.add_argument(
+        "--changed-since",
+        dest="changed_since",
+        metavar="REF",
+        help="Only process the files within the given paths that git reports as added, modified or "
+        "renamed since the given ref (compared against the working tree), along with any untracked "
+        "files that aren't ignored. Avoids walking the given directories.",
+    )
+    parser.add_argument(
+        "--resolve-all-configs",
+        dest="resolve_all_configs",
+        action="store_true",
+        help="Use the config file closest to each file being processed, rather than the one found "
+        "for the first path, so nested projects are sorted using their own settings.",
+    )
+    parser.add_argument(
+        "--watch",
+        dest="watch",
+        action="store_true",
+        help="After processing the given paths, keep running and re-process source files within "
+        "them whenever they change.",
+    )
+    parser.add_argument(
+        "--line-range",
+        dest="line_range",
+        metavar="START-END",
+        type=_line_range,
+        help="Only sort the import sections within the given lines, counting from 1, leaving the "
+        "rest of each file untouched and unprocessed. Intended for editors sorting the imports "
+        "around a change. Imports aren't added or floated to the top when a range is given.",
+    )
+    parser.add_argument(
+        "--timings",
+        dest="timings",
+        action="store_true",
+        help="Record the time spent within each phase of processing, such as discovering, reading, "
+        "parsing and writing files, and print a summary to stderr once done.",
+    )
+    parser.add_argument(
+        "--timings-report",
+        dest="timings_report",
+        metavar="PATH",
+        help="Write the recorded timings as JSON to the given path, including a per phase "
+        "breakdown of the slowest files. Implies --timings.",
+    )
+    parser.add_argument(
+        "--timings-slowest",
+        dest="timings_slowest",
+        metavar="N",
+        type=int,
+        help=f"How many of the slowest files to include in the --timings-report "
+        f"(default: {timings.DEFAULT_SLOWEST_FILES}).",
+    )
     parser.add_argument("--lai", "--lines-after-imports", dest="lines_after_imports", type=int)
     parser.add_argument("--lbt", "--lines-between-types", dest="lines_between_types", type=int)
     parser.add_argument(
@@ -892,6 +1314,9 @@ def main(argv: Optional[Sequence[str]] = None, stdin: Optional[TextIOWrapper] =
         if arguments:
             sys.exit("Error: arguments passed in without any paths or content.")
         return
+    resolve_all_configs = arguments.pop("resolve_all_configs", False)
+    if resolve_all_configs and ("settings_path" in arguments or "settings_file" in arguments):
+        sys.exit("Error: --resolve-all-configs can't be combined with --settings-path.")
     if "settings_path" not in arguments:
         arguments["settings_path"] = (
             os.path.abspath(file_names[0] if file_names else ".") or os.getcwd()
@@ -902,9 +1327,16 @@ def main(argv: Optional[Sequence[str]] = None, stdin: Optional[TextIOWrapper] =
     config_dict = arguments.copy()
     ask_to_apply = config_dict.pop("ask_to_apply", False)
     jobs = config_dict.pop("jobs", ())
+    cache_dir = config_dict.pop("cache_dir", None)
+    watch_mode = config_dict.pop("watch", False)
+    changed_since = config_dict.pop("changed_since", None)
+    timings_report = config_dict.pop("timings_report", None)
+    timings_slowest = config_dict.pop("timings_slowest", None)
+    collect_timings = config_dict.pop("timings", False) or bool(timings_report)
     check = config_dict.pop("check", False)
     show_diff = config_dict.pop("show_diff", False)
     write_to_stdout = config_dict.pop("write_to_stdout", False)
+    line_range = config_dict.pop("line_range", None)
     deprecated_flags = config_dict.pop("deprecated_flags", False)
     remapped_deprecated_args = config_dict.pop("remapped_deprecated_args", False)
     wrong_sorted_files = False
@@ -917,18 +1349,34 @@ def main(argv: Optional[Sequence[str]] = None, stdin: Optional[TextIOWrapper] =
         }
 
     config = Config(**config_dict)
+    config_resolver: Optional[ConfigResolver] = None
+    if resolve_all_configs:
+        config_resolver = ConfigResolver(
+            **{
+                key: value
+                for key, value in config_dict.items()
+                if key not in ("settings_path", "settings_file")
+            }
+        )
     if show_config:
         print(json.dumps(config.__dict__, indent=4, separators=(",", ": "), default=_preconvert))
         return
-    elif file_names == ["-"]:
+
+    if collect_timings:
+        timings.enable()
+    started = time.perf_counter()
+    if file_names == ["-"]:
         if show_files:
             sys.exit("Error: can't show files for streaming input.")
+        if watch_mode:
+            sys.exit("Error: can't watch streaming input.")
 
         if check:
             incorrectly_sorted = not api.check_stream(
                 input_stream=sys.stdin if stdin is None else stdin,
                 config=config,
                 show_diff=show_diff,
+                line_range=line_range,
             )
 
             wrong_sorted_files = incorrectly_sorted
@@ -938,7 +1386,9 @@ def main(argv: Optional[Sequence[str]] = None, stdin: Optional[TextIOWrapper] =
                 output_stream=sys.stdout,
                 config=config,
                 show_diff=show_diff,
+                line_range=line_range,
             )
+        _report_timings(time.perf_counter() - started, jobs, timings_report, timings_slowest)
     else:
         skipped: List[str] = []
         broken: List[str] = []
@@ -952,7 +1402,18 @@ def main(argv: Optional[Sequence[str]] = None, stdin: Optional[TextIOWrapper] =
                     filtered_files.append(file_name)
             file_names = filtered_files
 
-        file_names = iter_source_code(file_names, config, skipped, broken)
+        watched_paths = file_names
+        if changed_since:
+            try:
+                file_names = list(
+                    iter_changed_source_code(file_names, config, changed_since, skipped, broken)
+                )
+            except (OSError, ValueError) as error:
+                sys.exit(f"Error: unable to determine files changed since {changed_since}: {error}")
+        else:
+            file_names = iter_source_code(file_names, config, skipped, broken)
+        if collect_timings:
+            file_names = timings.timed_iterator("discovery", file_names)
         if show_files:
             for file_name in file_names:
                 print(file_name)
@@ -963,30 +1424,59 @@ def main(argv: Optional[Sequence[str]] = None, stdin: Optional[TextIOWrapper] =
         if config.verbose:
             print(ASCII_ART)
 
+        placements: Optional[PlacementCache] = None
+        placements_path: Optional[Path] = None
+        if cache_dir and not config_resolver:
+            placements = place.placement_cache(config)
+            placements_path = placement_cache_path(cache_dir, config)
+            placements.load(placements_path)
+
+        result_cache: Optional[ResultCache] = None
+        pending_digests: Deque[Optional[str]] = deque()
+        if cache_dir and not (
+            write_to_stdout or line_range or (not check and (show_diff or ask_to_apply))
+        ):
+            result_cache = ResultCache(cache_dir, config)
+            file_names = _uncached_files(file_names, result_cache, pending_digests, config_resolver)
+            if collect_timings:
+                file_names = timings.timed_iterator("cache", file_names)
+
+        pool_busy_time: List[float] = []
+        sorted_block_counts = [-sorted_blocks.hits, -sorted_blocks.misses]
         if jobs:
             import multiprocessing
 
-            executor = multiprocessing.Pool(jobs)
-            attempt_iterator = executor.imap(
-                functools.partial(
-                    sort_imports,
-                    config=config,
-                    check=check,
-                    ask_to_apply=ask_to_apply,
-                    write_to_stdout=write_to_stdout,
+            executor = multiprocessing.Pool(
+                jobs,
+                initializer=_init_worker,
+                initargs=(
+                    config,
+                    {
+                        "check": check,
+                        "ask_to_apply": ask_to_apply,
+                        "write_to_stdout": write_to_stdout,
+                        "line_range": line_range,
+                    },
+                    config_resolver,
+                    collect_timings,
+                    placements is not None,
                 ),
-                file_names,
+            )
+            pool_started = time.perf_counter()
+            attempt_iterator = _pooled_sort_attempts(
+                executor, file_names, jobs, pool_busy_time, sorted_block_counts, placements
             )
         else:
             # https://github.com/python/typeshed/pull/2814
             attempt_iterator = (
                 sort_imports(  # type: ignore
                     file_name,
-                    config=config,
+                    config=config_resolver.config_for(file_name) if config_resolver else config,
                     check=check,
                     ask_to_apply=ask_to_apply,
                     show_diff=show_diff,
                     write_to_stdout=write_to_stdout,
+                    line_range=line_range,
                 )
                 for file_name in file_names
             )
@@ -995,9 +1485,17 @@ def main(argv: Optional[Sequence[str]] = None, stdin: Optional[TextIOWrapper] =
         is_no_attempt = True
         any_encoding_valid = False
         for sort_attempt in attempt_iterator:
+            digest = pending_digests.popleft() if result_cache else None
             if not sort_attempt:
                 continue  # pragma: no cover - shouldn't happen, satisfies type constraint
             incorrectly_sorted = sort_attempt.incorrectly_sorted
+            if (
+                result_cache
+                and not incorrectly_sorted
+                and not sort_attempt.skipped
+                and sort_attempt.supported_encoding
+            ):
+                result_cache.mark_sorted(digest)
             if arguments.get("check", False) and incorrectly_sorted:
                 wrong_sorted_files = True
             if sort_attempt.skipped:
@@ -1012,6 +1510,44 @@ def main(argv: Optional[Sequence[str]] = None, stdin: Optional[TextIOWrapper] =
 
             is_no_attempt = False
 
+        if jobs:
+            executor.close()
+            executor.join()
+            if config.verbose:
+                pool_time = time.perf_counter() - pool_started
+                utilisation = sum(pool_busy_time) / (jobs * pool_time) if pool_time else 0.0
+                print(
+                    f"{jobs} worker processes were busy {utilisation:.0%} of {pool_time:.2f}s "
+                    f"processing {len(pool_busy_time)} chunks of files"
+                )
+
+        if config.verbose and not config.only_modified:
+            block_hits = sorted_block_counts[0] + sorted_blocks.hits
+            block_misses = sorted_block_counts[1] + sorted_blocks.misses
+            print(
+                f"{block_hits} import blocks were reused from earlier files, "
+                f"{block_misses} were sorted"
+            )
+
+        if placements is not None and placements_path:
+            placements.save(placements_path)
+            if config.verbose:
+                print(
+                    f"{placements.loaded} module placements were loaded from earlier runs, "
+                    f"{len(placements) - placements.loaded} were made (cache: {placements_path})"
+                )
+
+        if result_cache:
+            result_cache.save()
+            if result_cache.hits:
+                is_no_attempt = False
+                any_encoding_valid = True
+            if config.verbose:
+                print(
+                    f"{result_cache.hits} files unchanged since they were last found sorted, "
+                    f"{result_cache.misses} files processed (cache: {result_cache.path})"
+                )
+
         num_skipped += len(skipped)
         if num_skipped and not arguments.get("quiet", False):
             if config.verbose:
@@ -1034,6 +1570,26 @@ def main(argv: Optional[Sequence[str]] = None, stdin: Optional[TextIOWrapper] =
         if num_invalid_encoding > 0 and not any_encoding_valid:
             no_valid_encodings = True
 
+        _report_timings(time.perf_counter() - started, jobs, timings_report, timings_slowest)
+
+        if watch_mode:
+            from .watch import watch
+
+            watch(
+                watched_paths,
+                config,
+                lambda file_name: sort_imports(
+                    file_name,
+                    config=config_resolver.config_for(file_name) if config_resolver else config,
+                    check=check,
+                    ask_to_apply=ask_to_apply,
+                    show_diff=show_diff,
+                    write_to_stdout=write_to_stdout,
+                    line_range=line_range,
+                ),
+            )
+            return
+
     if not config.quiet and (remapped_deprecated_args or deprecated_flags):
         if remapped_deprecated_args:
             warn(
@@ -8,10 +8,12 @@ from isort.format import format_simplified
 from . import parse, sorting, wrap
 from .comments import add_to_line as with_comments
 from .settings import DEFAULT_CONFIG, Config
+from .timings import timed
 
 STATEMENT_DECLARATIONS: Tuple[str, ...] = ("def ", "cdef ", "cpdef ", "class ", "@", "async def")
 
 
+@timed("output")
 def sorted_imports(
     parsed: parse.ParsedContent,
     config: Config = DEFAULT_CONFIG,
@@ -1,14 +1,17 @@
 """Defines parsing functions used by isort for parsing import definitions"""
-from collections import OrderedDict, defaultdict
+import re
+from collections import defaultdict
 from functools import partial
 from itertools import chain
-from typing import TYPE_CHECKING, Any, Dict, List, NamedTuple, Optional, Tuple
+from sys import intern
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
 from warnings import warn
 
 from . import place
 from .comments import parse as parse_comments
 from .deprecated.finders import FindersManager
 from .settings import DEFAULT_CONFIG, Config
+from .timings import timed
 
 if TYPE_CHECKING:
     from mypy_extensions import TypedDict
@@ -27,6 +30,13 @@ if TYPE_CHECKING:
         },
     )
 
+    # The straight imports of a section map each module to whether it's imported without an
+    # alias, and its from imports map each module to the same for each name imported from it
+    SectionImportsDict = TypedDict(
+        "SectionImportsDict",
+        {"straight": Dict[str, bool], "from": Dict[str, Dict[str, bool]]},
+    )
+
 
 def _infer_line_separator(contents: str) -> str:
     if "\r\n" in contents:
@@ -78,6 +88,47 @@ def _strip_syntax(import_string: str) -> str:
     return import_string.replace("{ ", "{|").replace(" }", "|}")
 
 
+_QUOTE_OR_COMMENT = re.compile(r"[\\'\"#]")
+_QUOTE_END = {quote: re.compile(r"\\|" + quote) for quote in ('"', "'", '"""', "'''")}
+
+
+def track_quotes(line: str, in_quote: str = "") -> str:
+    """Returns the quote left open at the end of the given line, given the quote (if any) that
+    was open at its start. Shared by `core.process` and `parse.file_contents`, so both agree on
+    which lines are within strings.
+    """
+    if '"' not in line and "'" not in line:
+        return in_quote
+
+    index = 0
+    while True:
+        if in_quote:
+            quote_end = _QUOTE_END.get(in_quote) or re.compile(r"\\|" + re.escape(in_quote))
+            match = quote_end.search(line, index)
+        else:
+            match = _QUOTE_OR_COMMENT.search(line, index)
+        if not match:
+            return in_quote
+
+        index = match.start()
+        char = line[index]
+        if char == "\\":
+            index += 2
+        elif in_quote:
+            in_quote = ""
+            index += 1
+        elif char == "#":
+            return in_quote
+        else:
+            long_quote = line[index : index + 3]
+            if long_quote in ('"""', "'''"):
+                in_quote = long_quote
+                index += 3
+            else:
+                in_quote = char
+                index += 1
+
+
 def skip_line(
     line: str,
     in_quote: str,
@@ -93,24 +144,7 @@ def skip_line(
      in_quote: str,)
     """
     should_skip = bool(in_quote)
-    if '"' in line or "'" in line:
-        char_index = 0
-        while char_index < len(line):
-            if line[char_index] == "\\":
-                char_index += 1
-            elif in_quote:
-                if line[char_index : char_index + len(in_quote)] == in_quote:
-                    in_quote = ""
-            elif line[char_index] in ("'", '"'):
-                long_quote = line[char_index : char_index + 3]
-                if long_quote in ('"""', "'''"):
-                    in_quote = long_quote
-                    char_index += 2
-                else:
-                    in_quote = line[char_index]
-            elif line[char_index] == "#":
-                break
-            char_index += 1
+    in_quote = track_quotes(line, in_quote)
 
     if ";" in line.split("#")[0] and needs_import:
         for part in (part.strip() for part in line.split(";")):
@@ -131,7 +165,7 @@ class ParsedContent(NamedTuple):
     place_imports: Dict[str, List[str]]
     import_placements: Dict[str, str]
     as_map: Dict[str, Dict[str, List[str]]]
-    imports: Dict[str, Dict[str, Any]]
+    imports: Dict[str, "SectionImportsDict"]
     categorized_comments: "CommentsDict"
     change_count: int
     original_line_count: int
@@ -140,6 +174,7 @@ class ParsedContent(NamedTuple):
     verbose_output: List[str]
 
 
+@timed("parse")
 def file_contents(contents: str, config: Config = DEFAULT_CONFIG) -> ParsedContent:
     """Parses a python file taking out and categorizing imports."""
     line_separator: str = config.line_ending or _infer_line_separator(contents)
@@ -151,8 +186,16 @@ def file_contents(contents: str, config: Config = DEFAULT_CONFIG) -> ParsedConte
     original_line_count = len(in_lines)
     if config.old_finders:
         finder = FindersManager(config=config).find
+
+        def placer(names: Iterable[str]) -> Dict[str, str]:
+            return {name: finder(name) for name in names}  # type: ignore
+
+        def was_loaded(name: str) -> bool:
+            return False
+
     else:
-        finder = partial(place.module, config=config)
+        placer = partial(place.modules, config=config)
+        was_loaded = place.placement_cache(config).was_loaded
 
     line_count = len(in_lines)
 
@@ -162,11 +205,16 @@ def file_contents(contents: str, config: Config = DEFAULT_CONFIG) -> ParsedConte
         "straight": defaultdict(list),
         "from": defaultdict(list),
     }
-    imports: OrderedDict[str, Dict[str, Any]] = OrderedDict()
+    imports: Dict[str, SectionImportsDict] = {}
     verbose_output: List[str] = []
+    # Modules are only placed into sections once all of them have been found, so they can all be
+    # placed at once: each with its type of import and line, in the order they were found
+    found_modules: List[Tuple[str, str, str]] = []
+    from_imports: Dict[str, Dict[str, bool]] = {}
+    straight_imports: Dict[str, bool] = {}
 
     for section in chain(config.sections, config.forced_separate):
-        imports[section] = {"straight": OrderedDict(), "from": OrderedDict()}
+        imports[section] = {"straight": {}, "from": {}}
     categorized_comments: CommentsDict = {
         "from": {},
         "straight": {},
@@ -360,8 +408,9 @@ def file_contents(contents: str, config: Config = DEFAULT_CONFIG) -> ParsedConte
                     [from_import[0] + " " + "".join(from_import[1:])] + parts[1:]
                 )
 
+            # Module and imported names repeat across statements and files, so they're interned
             just_imports = [
-                item.replace("{|", "{ ").replace("|}", " }")
+                intern(item.replace("{|", "{ ").replace("|}", " }"))
                 for item in _strip_syntax(import_string).split()
             ]
 
@@ -416,20 +465,7 @@ def file_contents(contents: str, config: Config = DEFAULT_CONFIG) -> ParsedConte
 
             if type_of_import == "from":
                 import_from = just_imports.pop(0)
-                placed_module = finder(import_from)
-                if config.verbose and not config.only_modified:
-                    print(f"from-type place_module for {import_from} returned {placed_module}")
-
-                elif config.verbose:
-                    verbose_output.append(
-                        f"from-type place_module for {import_from} returned {placed_module}"
-                    )
-                if placed_module == "":
-                    warn(
-                        f"could not place module {import_from} of line {line} --"
-                        " Do you need to define a default section?"
-                    )
-                root = imports[placed_module][type_of_import]  # type: ignore
+                found_modules.append((type_of_import, import_from, line))
                 for import_name in just_imports:
                     associated_comment = nested_comments.get(import_name)
                     if associated_comment:
@@ -465,13 +501,17 @@ def file_contents(contents: str, config: Config = DEFAULT_CONFIG) -> ParsedConte
                             categorized_comments["above"]["from"].get(import_from, [])
                         )
 
-                if import_from not in root:
-                    root[import_from] = OrderedDict(
-                        (module, module in direct_imports) for module in just_imports
-                    )
+                if import_from not in from_imports:
+                    from_imports[import_from] = {
+                        module: module in direct_imports for module in just_imports
+                    }
                 else:
-                    root[import_from].update(
-                        (module, root[import_from].get(module, False) or module in direct_imports)
+                    from_imports[import_from].update(
+                        (
+                            module,
+                            from_imports[import_from].get(module, False)
+                            or module in direct_imports,
+                        )
                         for module in just_imports
                     )
 
@@ -510,24 +550,32 @@ def file_contents(contents: str, config: Config = DEFAULT_CONFIG) -> ParsedConte
                             import_index -= len(
                                 categorized_comments["above"]["straight"].get(module, [])
                             )
-                    placed_module = finder(module)
-                    if config.verbose and not config.only_modified:
-                        print(f"else-type place_module for {module} returned {placed_module}")
-
-                    elif config.verbose:
-                        verbose_output.append(
-                            f"else-type place_module for {module} returned {placed_module}"
-                        )
-                    if placed_module == "":
-                        warn(
-                            f"could not place module {module} of line {line} --"
-                            " Do you need to define a default section?"
-                        )
-                        imports.setdefault("", {"straight": OrderedDict(), "from": OrderedDict()})
-                    straight_import |= imports[placed_module][type_of_import].get(  # type: ignore
-                        module, False
-                    )
-                    imports[placed_module][type_of_import][module] = straight_import  # type: ignore
+                    found_modules.append((type_of_import, module, line))
+                    straight_import |= straight_imports.get(module, False)
+                    straight_imports[module] = straight_import
+
+    placements = placer(module for _type_of_import, module, _line in found_modules)
+    for type_of_import, module, line in found_modules:
+        placed_module = placements[module]
+        if config.verbose:
+            kind = "from" if type_of_import == "from" else "else"
+            verbose_output.append(
+                f"{kind}-type place_module for {module} returned {placed_module}"
+                + (" (placed by an earlier run)" if was_loaded(module) else "")
+            )
+            if not config.only_modified:
+                print(verbose_output[-1])
+        if placed_module == "":
+            warn(
+                f"could not place module {module} of line {line} --"
+                " Do you need to define a default section?"
+            )
+            if type_of_import == "straight":
+                imports.setdefault("", {"straight": {}, "from": {}})
+    for import_from, from_imported in from_imports.items():
+        imports[placements[import_from]]["from"][import_from] = from_imported
+    for module, straight_import in straight_imports.items():
+        imports[placements[module]]["straight"][module] = straight_import
 
     change_count = len(out_lines) - original_line_count
 
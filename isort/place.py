@@ -1,45 +1,165 @@
 """Contains all logic related to placing an import within a certain section."""
 import importlib
-from fnmatch import fnmatch
-from functools import lru_cache
+import os
+import re
+import weakref
+from fnmatch import translate
+from functools import wraps
 from pathlib import Path
-from typing import FrozenSet, Iterable, Optional, Tuple
+from typing import (
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Pattern,
+    Tuple,
+    TypeVar,
+)
 
 from isort import sections
+from isort.cache import PlacementCache, PlacementDependencies
 from isort.settings import DEFAULT_CONFIG, Config
+from isort.timings import timed
 from isort.utils import exists_case_sensitive
 
 LOCAL = "LOCALFOLDER"
 
+# Known patterns are compiled from module names and globs: "^name$" patterns are looked up by name,
+# and other patterns made up of the same characters hold no groups, so can be combined into one
+_NAME_PATTERN = re.compile(r"\^[\w\-]+\$")
+_GLOB_PATTERN = re.compile(r"\^[\w\-.*?]*\$")
 
+_PackagePlacement = Tuple[Optional[Tuple[str, str]], bool, PlacementDependencies]
+_Index = TypeVar("_Index")
+
+
+class _KnownPatterns(NamedTuple):
+    """The known patterns of a section, each alongside its position within `Config.known_patterns`
+    so that where several match, the one listed first is the one reported.
+    """
+
+    placement: str
+    names: Dict[str, Tuple[int, Pattern[str]]]
+    globs: Optional[Pattern[str]]  # A group for each of glob_patterns, in order
+    glob_patterns: Tuple[Tuple[int, Pattern[str]], ...]
+    other_patterns: Tuple[Tuple[int, Pattern[str]], ...]
+
+    def match(self, name: str) -> Optional[Tuple[int, Pattern[str]]]:
+        matched = self.names.get(name)
+        if self.globs is not None:
+            glob_match = self.globs.match(name)
+            if glob_match:
+                glob_matched = self.glob_patterns[glob_match.lastindex - 1]  # type: ignore
+                if matched is None or glob_matched[0] < matched[0]:
+                    matched = glob_matched
+        for other_matched in self.other_patterns:
+            if matched is not None and matched[0] < other_matched[0]:
+                break
+            if other_matched[1].match(name):
+                return other_matched
+        return matched
+
+
+@timed("place")
 def module(name: str, config: Config = DEFAULT_CONFIG) -> str:
     """Returns the section placement for the given module name."""
     return module_with_reason(name, config)[0]
 
 
-@lru_cache(maxsize=1000)
+@timed("place")
+def modules(names: Iterable[str], config: Config = DEFAULT_CONFIG) -> Dict[str, str]:
+    """Returns the section placement of each of the given module names, keyed by name.
+
+    Every name is only placed once however often it's given, and the `src_paths` of each top-level
+    package are only searched once, however many of its modules are placed.
+    """
+    placements: Dict[str, str] = {}
+    for name in names:
+        if name not in placements:
+            placements[name] = module_with_reason(name, config)[0]
+    return placements
+
+
 def module_with_reason(name: str, config: Config = DEFAULT_CONFIG) -> Tuple[str, str]:
     """Returns the section placement for the given module name alongside the reasoning."""
-    return (
-        _forced_separate(name, config)
-        or _local(name, config)
-        or _known_pattern(name, config)
-        or _src_path(name, config)
-        or (config.default_section, "Default option in Config or universal default.")
-    )
+    cache = placement_cache(config)
+    placement = cache.get(name)
+    if placement is None:
+        # The directories looked in, so placements persisted between runs can be checked
+        dependencies: Dict[str, Optional[int]] = {}
+        placement = (
+            _forced_separate(name, config)
+            or _local(name, config)
+            or _known_pattern(name, config)
+            or _src_path(name, config, dependencies=dependencies)
+            or (config.default_section, "Default option in Config or universal default.")
+        )
+        cache.put(name, placement, tuple(dependencies.items()))
+    return placement
+
+
+_placement_caches: "weakref.WeakSet[PlacementCache]" = weakref.WeakSet()
+
+
+def placement_cache(config: Config = DEFAULT_CONFIG) -> PlacementCache:
+    """Returns the cache of the placements made for the given config, which lasts as long as the
+    config does.
+    """
+    cache = config._placement_cache
+    if cache is None:
+        cache = config._placement_cache = PlacementCache()
+        _placement_caches.add(cache)
+    return cache
+
+
+def _config_index(function: Callable[[Config], _Index]) -> Callable[[Config], _Index]:
+    """Stores what the given function works out from a config on the config's placement cache,
+    so it's only worked out once for as long as the config lasts.
+    """
+    key = function.__name__
+
+    @wraps(function)
+    def config_index(config: Config) -> _Index:
+        indexes = placement_cache(config).indexes
+        if key not in indexes:
+            indexes[key] = function(config)
+        return indexes[key]
+
+    return config_index
 
 
 def _forced_separate(name: str, config: Config) -> Optional[Tuple[str, str]]:
-    for forced_separate in config.forced_separate:
-        # Ensure all forced_separate patterns will match to end of string
+    forced_separate_pattern = _forced_separate_pattern(config)
+    if forced_separate_pattern is None:
+        return None
+
+    matched = forced_separate_pattern.match(os.path.normcase(name))
+    if matched is None:
+        return None
+
+    forced_separate = config.forced_separate[int(matched.lastgroup[1:])]  # type: ignore
+    return (forced_separate, f"Matched forced_separate ({forced_separate}) config value.")
+
+
+@_config_index
+def _forced_separate_pattern(config: Config) -> Optional[Pattern[str]]:
+    """Combines the forced_separate globs into one regex, with a group named after the position of
+    each glob, so matching a module name against them all, in order, takes a single match.
+    """
+    if not config.forced_separate:
+        return None
+
+    globs = []
+    for position, forced_separate in enumerate(config.forced_separate):
+        # Ensure all forced_separate patterns will match to end of string, optionally after a dot
         path_glob = forced_separate
         if not forced_separate.endswith("*"):
             path_glob = "%s*" % forced_separate
-
-        if fnmatch(name, path_glob) or fnmatch(name, "." + path_glob):
-            return (forced_separate, f"Matched forced_separate ({forced_separate}) config value.")
-
-    return None
+        globs.append(f"(?P<_{position}>\\.?{translate(os.path.normcase(path_glob))})")
+    return re.compile("|".join(globs))
 
 
 def _local(name: str, config: Config) -> Optional[Tuple[str, str]]:
@@ -52,49 +172,230 @@ def _local(name: str, config: Config) -> Optional[Tuple[str, str]]:
 def _known_pattern(name: str, config: Config) -> Optional[Tuple[str, str]]:
     parts = name.split(".")
     module_names_to_check = (".".join(parts[:first_k]) for first_k in range(len(parts), 0, -1))
+    known_patterns = _known_patterns(config)
     for module_name_to_check in module_names_to_check:
-        for pattern, placement in config.known_patterns:
-            if placement in config.sections and pattern.match(module_name_to_check):
-                return (placement, f"Matched configured known pattern {pattern}")
+        for section_patterns in known_patterns:
+            matched = section_patterns.match(module_name_to_check)
+            if matched is not None:
+                return (
+                    section_patterns.placement,
+                    f"Matched configured known pattern {matched[1]}",
+                )
 
     return None
 
 
+@_config_index
+def _known_patterns(config: Config) -> Tuple[_KnownPatterns, ...]:
+    """Indexes the known patterns of each of the configured sections, in the order they're
+    checked, so checking a module name takes a lookup and at most one regex match per section.
+    """
+    sections_patterns: List[Tuple[str, List[Tuple[int, Pattern[str]]]]] = []
+    for position, (pattern, placement) in enumerate(config.known_patterns):
+        if placement not in config.sections:
+            continue
+        if not sections_patterns or sections_patterns[-1][0] != placement:
+            sections_patterns.append((placement, []))
+        sections_patterns[-1][1].append((position, pattern))
+
+    known_patterns = []
+    for placement, patterns in sections_patterns:
+        names: Dict[str, Tuple[int, Pattern[str]]] = {}
+        glob_patterns = []
+        other_patterns = []
+        for position, pattern in patterns:
+            if _NAME_PATTERN.fullmatch(pattern.pattern) and not pattern.flags & re.IGNORECASE:
+                names.setdefault(pattern.pattern[1:-1], (position, pattern))
+            elif _GLOB_PATTERN.fullmatch(pattern.pattern) and not pattern.flags & re.IGNORECASE:
+                glob_patterns.append((position, pattern))
+            else:
+                other_patterns.append((position, pattern))
+        globs = None
+        if glob_patterns:
+            globs = re.compile("|".join(f"({pattern.pattern})" for _, pattern in glob_patterns))
+        known_patterns.append(
+            _KnownPatterns(placement, names, globs, tuple(glob_patterns), tuple(other_patterns))
+        )
+    return tuple(known_patterns)
+
+
 def _src_path(
     name: str,
     config: Config,
     src_paths: Optional[Iterable[Path]] = None,
     prefix: Tuple[str, ...] = (),
+    dependencies: Optional[Dict[str, Optional[int]]] = None,
 ) -> Optional[Tuple[str, str]]:
+    if dependencies is None:
+        dependencies = {}
+    root_module_name, *nested_module = name.split(".", 1)
     if src_paths is None:
+        placement, is_namespace, package_dependencies = _package_src_path(root_module_name, config)
+        dependencies.update(package_dependencies)
+        if not nested_module or not (is_namespace or root_module_name in config.namespace_packages):
+            return placement
         src_paths = config.src_paths
 
-    root_module_name, *nested_module = name.split(".", 1)
     new_prefix = prefix + (root_module_name,)
     namespace = ".".join(new_prefix)
 
     for src_path in src_paths:
-        module_path = (src_path / root_module_name).resolve()
-        if not prefix and not module_path.is_dir() and src_path.name == root_module_name:
-            module_path = src_path.resolve()
+        found, is_package, module_path = _find_module(
+            src_path, root_module_name, not prefix, dependencies
+        )
         if nested_module and (
             namespace in config.namespace_packages
-            or (
-                config.auto_identify_namespace_packages
-                and _is_namespace_package(module_path, config.supported_extensions)
-            )
-        ):
-            return _src_path(nested_module[0], config, (module_path,), new_prefix)
-        if (
-            _is_module(module_path)
-            or _is_package(module_path)
-            or _src_path_is_module(src_path, root_module_name)
+            or (config.auto_identify_namespace_packages and is_package)
         ):
+            module_path = module_path or (src_path / root_module_name).resolve()
+            if namespace in config.namespace_packages:
+                return _src_path(nested_module[0], config, (module_path,), new_prefix, dependencies)
+            dependencies[str(module_path)] = _modified(module_path)
+            if _is_namespace_package(module_path, config.supported_extensions):
+                return _src_path(nested_module[0], config, (module_path,), new_prefix, dependencies)
+        if found:
             return (sections.FIRSTPARTY, f"Found in one of the configured src_paths: {src_path}.")
 
     return None
 
 
+def _package_src_path(package: str, config: Config) -> _PackagePlacement:
+    """Returns the placement of a top-level package from the configured src_paths, alongside
+    whether the package is a namespace package there, in which case its modules have to be placed
+    by `_src_path` one by one, and the directories that took looking in.
+    """
+    packages = placement_cache(config).packages
+    package_placement: Optional[_PackagePlacement] = packages.get(package)
+    if package_placement is None:
+        package_placement = packages[package] = _find_package(package, config)
+    return package_placement
+
+
+def _find_package(package: str, config: Config) -> _PackagePlacement:
+    dependencies: Dict[str, Optional[int]] = {}
+    for src_path in config.src_paths:
+        found, is_package, module_path = _find_module(src_path, package, True, dependencies)
+        if found:
+            is_namespace = False
+            if config.auto_identify_namespace_packages and is_package:
+                module_path = module_path or (src_path / package).resolve()
+                dependencies[str(module_path)] = _modified(module_path)
+                is_namespace = _is_namespace_package(module_path, config.supported_extensions)
+            return (
+                (sections.FIRSTPARTY, f"Found in one of the configured src_paths: {src_path}."),
+                is_namespace,
+                tuple(dependencies.items()),
+            )
+
+    return (None, False, tuple(dependencies.items()))
+
+
+def _find_module(
+    src_path: Path, module_name: str, top_level: bool, dependencies: Dict[str, Optional[int]]
+) -> Tuple[bool, bool, Optional[Path]]:
+    """Returns whether the named module is found directly within src_path and whether it's a
+    package there, alongside its resolved path if finding it took working that out. Records
+    src_path and when it was last modified within dependencies.
+    """
+    index = _directory_index(src_path) if src_path.name != module_name else None
+    if index is not None:
+        dependencies[str(src_path)] = index.modified
+        is_package = module_name in index.packages
+        return (is_package or module_name in index.modules, is_package, None)
+
+    dependencies[str(src_path)] = _modified(src_path)
+    module_path = (src_path / module_name).resolve()
+    if top_level and not module_path.is_dir() and src_path.name == module_name:
+        module_path = src_path.resolve()
+    is_package = _is_package(module_path)
+    found = is_package or _is_module(module_path) or _src_path_is_module(src_path, module_name)
+    return (found, is_package, module_path)
+
+
+class _DirectoryIndex(NamedTuple):
+    """The modules and packages found directly within a src_paths directory, as of when it was
+    last modified.
+    """
+
+    modified: Optional[int]  # Modification time in ns, or `None` if the directory doesn't exist
+    modules: FrozenSet[str]
+    packages: FrozenSet[str]
+
+
+_directory_indexes: Dict[str, Optional[_DirectoryIndex]] = {}
+_relisted_directories = 0  # How many times a directory was listed again after being modified
+_refreshed_directories = 0  # The value of _relisted_directories as of the last refresh
+
+
+def _directory_index(directory: Path) -> Optional[_DirectoryIndex]:
+    """Returns the index of a src_paths directory, listing it again whenever it's been modified
+    since it was last listed, or `None` if it can't be listed, in which case modules are looked for
+    within it one by one.
+    """
+    global _relisted_directories
+
+    key = str(directory)
+    modified = _modified(directory)
+    if key in _directory_indexes:
+        listed = _directory_indexes[key]
+        if listed is None or listed.modified == modified:
+            return listed
+        _relisted_directories += 1
+
+    module_suffixes = (".py", *importlib.machinery.EXTENSION_SUFFIXES)
+    modules = set()
+    packages = set()
+    try:
+        with os.scandir(key) as entries:
+            for entry in entries:
+                # Like os.path.exists, only count symlinks to files or directories that exist
+                if entry.is_symlink() and not os.path.exists(entry.path):
+                    continue
+                if entry.is_dir():
+                    packages.add(entry.name)
+                for suffix in module_suffixes:
+                    if entry.name.endswith(suffix):
+                        modules.add(entry.name[: -len(suffix)])
+        index: Optional[_DirectoryIndex] = _DirectoryIndex(
+            modified, frozenset(modules), frozenset(packages)
+        )
+    except (FileNotFoundError, NotADirectoryError):
+        index = _DirectoryIndex(modified, frozenset(), frozenset())
+    except OSError:
+        index = None
+    _directory_indexes[key] = index
+    return index
+
+
+def refresh_src_paths() -> bool:
+    """Forgets every placement made if any src_paths directory has been modified since the last
+    refresh, so long running processes that keep their configs, such as watch mode or the `isortd`
+    daemon, place modules by what's on disk now. Returns whether anything was forgotten.
+
+    Directories are listed again as soon as they're modified regardless, so placements made with
+    a new config always reflect what's on disk.
+    """
+    global _refreshed_directories
+
+    for directory in list(_directory_indexes):
+        _directory_index(Path(directory))
+    if _relisted_directories == _refreshed_directories:
+        return False
+
+    _refreshed_directories = _relisted_directories
+    for cache in list(_placement_caches):
+        cache.clear()
+    return True
+
+
+def _modified(path: Path) -> Optional[int]:
+    """Returns when the given path was last modified in ns, or `None` if it doesn't exist."""
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
 def _is_module(path: Path) -> bool:
     return (
         exists_case_sensitive(str(path.with_suffix(".py")))
@@ -8,11 +8,22 @@ import os
 import posixpath
 import re
 import stat
-import subprocess  # nosec: Needed for gitignore support.
 import sys
 from functools import lru_cache
 from pathlib import Path
-from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Pattern, Set, Tuple
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Optional,
+    Pattern,
+    Set,
+    Tuple,
+)
 from warnings import warn
 
 from . import stdlibs
@@ -24,13 +35,17 @@ from .exceptions import (
     ProfileDoesNotExist,
     UnsupportedSettings,
 )
+from .gitignore import GitIgnore
 from .profiles import profiles
 from .sections import DEFAULT as SECTION_DEFAULTS
 from .sections import FIRSTPARTY, FUTURE, LOCALFOLDER, STDLIB, THIRDPARTY
 from .wrap_modes import WrapModes
 from .wrap_modes import from_string as wrap_mode_from_string
 
-_SHEBANG_RE = re.compile(br"^#!.*\bpython[23w]?\b")
+if TYPE_CHECKING:
+    from .cache import PlacementCache
+
+_SHEBANG_RE = re.compile(rb"^#!.*\bpython[23w]?\b")
 SUPPORTED_EXTENSIONS = frozenset({"py", "pyi", "pyx", "pxd"})
 BLOCKED_EXTENSIONS = frozenset({"pex"})
 FILE_SKIP_COMMENTS: Tuple[str, ...] = (
@@ -249,6 +264,69 @@ class _Config:
 _DEFAULT_SETTINGS = {**vars(_Config()), "source": "defaults"}
 
 
+class _SkipMatcher:
+    """The skip, skip_glob and directory settings of a Config, compiled for fast per path checks."""
+
+    def __init__(self, skip: FrozenSet[str], skip_glob: FrozenSet[str], directory: str) -> None:
+        skip_paths = {posixpath.normpath(path.replace("\\", "/")) for path in skip}
+        self.relative_paths = frozenset(path for path in skip_paths if not posixpath.isabs(path))
+        self.absolute_paths = frozenset(path for path in skip_paths if posixpath.isabs(path))
+        self.names = frozenset(name for name in skip if name)
+        self.glob: Optional[Pattern[str]] = (
+            re.compile("|".join(fnmatch.translate(os.path.normcase(glob)) for glob in skip_glob))
+            if skip_glob
+            else None
+        )
+        self.directory = ""
+        if directory:
+            self.directory = os.path.normcase(str(Path(directory)))
+            if not self.directory.endswith(os.sep):
+                self.directory += os.sep
+        self._cwd_paths: Tuple[str, FrozenSet[str]] = ("", frozenset())
+
+    def matches_path(self, path: str) -> bool:
+        """Returns True if the given path refers to the same location as one of the skip entries."""
+        if not (self.relative_paths or self.absolute_paths):
+            return False
+
+        normalized_path = path.replace("\\", "/")
+        if normalized_path[1:2] == ":":
+            normalized_path = normalized_path[2:]
+        normalized_path = posixpath.normpath(normalized_path)
+        if not posixpath.isabs(normalized_path):
+            if normalized_path in self.relative_paths:
+                return True
+            # The same location may be spelled differently, such as "../project/" + path
+            normalized_path = posixpath.abspath(normalized_path)
+        return normalized_path in self._absolute_skip_paths(os.getcwd())
+
+    def _absolute_skip_paths(self, cwd: str) -> FrozenSet[str]:
+        if self._cwd_paths[0] != cwd:
+            posix_cwd = cwd.replace("\\", "/")
+            self._cwd_paths = (
+                cwd,
+                self.absolute_paths.union(
+                    posixpath.normpath(posixpath.join(posix_cwd, path))
+                    for path in self.relative_paths
+                ),
+            )
+        return self._cwd_paths[1]
+
+    def matches_name(self, file_name: str) -> bool:
+        """Returns True if a component of the given path is skipped or the path matches a glob."""
+        if self.names:
+            parts = file_name.replace(os.altsep, os.sep) if os.altsep else file_name
+            if not self.names.isdisjoint(parts.split(os.sep)):
+                return True
+
+        if self.glob:
+            normalized_name = os.path.normcase(file_name)
+            if self.glob.match(normalized_name) or self.glob.match("/" + normalized_name):
+                return True
+
+        return False
+
+
 class Config(_Config):
     def __init__(
         self,
@@ -259,6 +337,9 @@ class Config(_Config):
     ):
         self._known_patterns: Optional[List[Tuple[Pattern[str], str]]] = None
         self._section_comments: Optional[Tuple[str, ...]] = None
+        self._gitignore: Optional[GitIgnore] = None
+        self._skip_matcher: Optional[_SkipMatcher] = None
+        self._placement_cache: Optional["PlacementCache"] = None
 
         if config:
             config_vars = vars(config).copy()
@@ -266,6 +347,9 @@ class Config(_Config):
             config_vars["py_version"] = config_vars["py_version"].replace("py", "")
             config_vars.pop("_known_patterns")
             config_vars.pop("_section_comments")
+            config_vars.pop("_gitignore")
+            config_vars.pop("_skip_matcher")
+            config_vars.pop("_placement_cache")
             super().__init__(**config_vars)  # type: ignore
             return
 
@@ -491,47 +575,55 @@ class Config(_Config):
 
     def is_skipped(self, file_path: Path) -> bool:
         """Returns True if the file and/or folder should be skipped based on current settings."""
-        if self.directory and Path(self.directory) in file_path.resolve().parents:
-            file_name = os.path.relpath(file_path.resolve(), self.directory)
-        else:
-            file_name = str(file_path)
-
         os_path = str(file_path)
+        if self._is_skipped(os_path, file_path.name, lambda: str(file_path.resolve()), None):
+            return True
 
-        if self.skip_gitignore:
-            if file_path.name == ".git":  # pragma: no cover
-                return True
-
-            result = subprocess.run(  # nosec
-                ["git", "-C", str(file_path.parent), "check-ignore", "--quiet", os_path]
-            )
-            if result.returncode == 0:
-                return True
+        if not (os.path.isfile(os_path) or os.path.isdir(os_path) or os.path.islink(os_path)):
+            return True
 
-        normalized_path = os_path.replace("\\", "/")
-        if normalized_path[1:2] == ":":
-            normalized_path = normalized_path[2:]
+        return False
 
-        for skip_path in self.skip:
-            if posixpath.abspath(normalized_path) == posixpath.abspath(
-                skip_path.replace("\\", "/")
-            ):
-                return True
+    def is_skipped_entry(self, entry: "os.DirEntry[str]", resolved_directory: str) -> bool:
+        """Returns True if the given entry, listed by `os.scandir` from the directory that resolves
+        to resolved_directory, should be skipped. Unlike `is_skipped`, it doesn't check the entry
+        exists or resolve its path unless it's a symlink, so walking a tree takes no extra stats.
+        """
+        if entry.is_symlink():
+            resolved_path = os.path.realpath(entry.path)
+        else:
+            resolved_path = os.path.join(resolved_directory, entry.name)
+        try:
+            is_dir: Optional[bool] = entry.is_dir()
+        except OSError:  # pragma: no cover - entry was removed while being scanned
+            is_dir = None
+        return self._is_skipped(entry.path, entry.name, lambda: resolved_path, is_dir)
+
+    def _is_skipped(
+        self, os_path: str, name: str, resolve: Callable[[], str], is_dir: Optional[bool]
+    ) -> bool:
+        if self._skip_matcher is None:
+            self._skip_matcher = _SkipMatcher(self.skip, self.skip_glob, self.directory)
+        skip_matcher = self._skip_matcher
+
+        file_name = os_path
+        if skip_matcher.directory:
+            resolved_path = resolve()
+            if len(resolved_path) > len(skip_matcher.directory) and os.path.normcase(
+                resolved_path
+            ).startswith(skip_matcher.directory):
+                file_name = resolved_path[len(skip_matcher.directory) :]
 
-        position = os.path.split(file_name)
-        while position[1]:
-            if position[1] in self.skip:
+        if self.skip_gitignore:
+            if name == ".git":  # pragma: no cover
                 return True
-            position = os.path.split(position[0])
 
-        for glob in self.skip_glob:
-            if fnmatch.fnmatch(file_name, glob) or fnmatch.fnmatch("/" + file_name, glob):
+            if self._gitignore is None:
+                self._gitignore = GitIgnore()
+            if self._gitignore.is_ignored(os_path, is_dir):
                 return True
 
-        if not (os.path.isfile(os_path) or os.path.isdir(os_path) or os.path.islink(os_path)):
-            return True
-
-        return False
+        return skip_matcher.matches_path(os_path) or skip_matcher.matches_name(file_name)
 
     @property
     def known_patterns(self):
@@ -603,28 +695,39 @@ def _abspaths(cwd: str, values: Iterable[str]) -> Set[str]:
     return paths
 
 
+def _directory_config(directory: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+    """Returns the isort config defined directly within directory, an empty config if the
+    directory ends the search for one, or `None` if the search should continue in its parent.
+    """
+    for config_file_name in CONFIG_SOURCES:
+        potential_config_file = os.path.join(directory, config_file_name)
+        if os.path.isfile(potential_config_file):
+            config_data: Dict[str, Any]
+            try:
+                config_data = _get_config_data(
+                    potential_config_file, CONFIG_SECTIONS[config_file_name]
+                )
+            except Exception:
+                warn(f"Failed to pull configuration information from {potential_config_file}")
+                config_data = {}
+            if config_data:
+                return (directory, config_data)
+
+    for stop_dir in STOP_CONFIG_SEARCH_ON_DIRS:
+        if os.path.isdir(os.path.join(directory, stop_dir)):
+            return (directory, {})
+
+    return None
+
+
 @lru_cache()
 def _find_config(path: str) -> Tuple[str, Dict[str, Any]]:
     current_directory = path
     tries = 0
     while current_directory and tries < MAX_CONFIG_SEARCH_DEPTH:
-        for config_file_name in CONFIG_SOURCES:
-            potential_config_file = os.path.join(current_directory, config_file_name)
-            if os.path.isfile(potential_config_file):
-                config_data: Dict[str, Any]
-                try:
-                    config_data = _get_config_data(
-                        potential_config_file, CONFIG_SECTIONS[config_file_name]
-                    )
-                except Exception:
-                    warn(f"Failed to pull configuration information from {potential_config_file}")
-                    config_data = {}
-                if config_data:
-                    return (current_directory, config_data)
-
-        for stop_dir in STOP_CONFIG_SEARCH_ON_DIRS:
-            if os.path.isdir(os.path.join(current_directory, stop_dir)):
-                return (current_directory, {})
+        found_config = _directory_config(current_directory)
+        if found_config is not None:
+            return found_config
 
         new_directory = os.path.split(current_directory)[0]
         if new_directory == current_directory:
@@ -737,4 +840,64 @@ def _as_bool(value: str) -> bool:
         raise ValueError(f"invalid truth value {value}")
 
 
+class ConfigResolver:
+    """Resolves the Config that applies to each file from the config file closest to it, rather
+    than using one Config for every file.
+
+    Config discovery is memoized per directory for the lifetime of the resolver, so every
+    directory is only checked for config files once. Resolved Configs that only differ in where
+    they were loaded from are shared, along with any caches keyed on them.
+    """
+
+    def __init__(self, **config_overrides: Any) -> None:
+        self.config_overrides = config_overrides
+        self._project_roots: Dict[str, str] = {}
+        self._configs: Dict[str, Config] = {}
+        self._unique_configs: List[Tuple[Dict[str, Any], Config]] = []
+
+    def _project_root(self, directory: str) -> str:
+        """Returns the directory holding the config that applies to directory, or an empty
+        string if none does.
+        """
+        project_root = self._project_roots.get(directory)
+        if project_root is None:
+            found_config = _directory_config(directory)
+            if found_config is not None:
+                project_root = directory if found_config[1] else ""
+            else:
+                parent = os.path.dirname(directory)
+                project_root = "" if parent == directory else self._project_root(parent)
+            self._project_roots[directory] = project_root
+        return project_root
+
+    def config_for(self, file_name: str) -> Config:
+        """Returns the Config isort would use if run against the given file alone."""
+        project_root = self._project_root(os.path.dirname(os.path.abspath(file_name)))
+        config = self._configs.get(project_root)
+        if config is None:
+            if project_root:
+                config = Config(settings_path=project_root, **self.config_overrides)
+            else:
+                config = Config(**self.config_overrides)
+
+            settings = {
+                name: value
+                for name, value in vars(config).items()
+                if name != "sources" and not name.startswith("_")
+            }
+            for unique_settings, unique_config in self._unique_configs:
+                if unique_settings == settings:
+                    config = unique_config
+                    break
+            else:
+                self._unique_configs.append((settings, config))
+            self._configs[project_root] = config
+        return config
+
+    @property
+    def configs(self) -> List[Config]:
+        """The distinct Configs resolved so far."""
+        return [config for _, config in self._unique_configs]
+
+
 DEFAULT_CONFIG = Config()
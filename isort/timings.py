@@ -0,0 +1,239 @@
+"""Defines the phase level timing instrumentation behind isort's `--timings` flag.
+
+The functions making up each phase of processing a file are wrapped with `timed`, which only
+costs a global lookup while timings aren't being collected. While they are, time is attributed
+to the innermost phase running on the current thread, so the phase totals partition the time
+spent, and it is recorded per file as well as for the run as a whole. Timings collected within
+`--jobs` worker processes are sent back alongside each chunk of results and merged.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, TypeVar
+
+PHASES = (
+    "discovery",
+    "cache",
+    "read",
+    "scan",
+    "parse",
+    "place",
+    "output",
+    "wrap",
+    "write",
+    "other",
+)
+PHASE_DESCRIPTIONS = {
+    "discovery": "Finding the source files to process",
+    "cache": "Looking up files in the --cache-dir result cache",
+    "read": "Opening files and detecting their encoding (io.File)",
+    "scan": "Scanning for import sections (core.process)",
+    "parse": "Parsing import sections (parse.file_contents)",
+    "place": "Placing modules into sections (place.module)",
+    "output": "Building the sorted output (output.sorted_imports)",
+    "wrap": "Wrapping long import lines (wrap)",
+    "write": "Writing and replacing changed files (api.sort_file)",
+    "other": "Everything else while processing a file",
+}
+DEFAULT_SLOWEST_FILES = 10
+
+_collector: Optional["Timings"] = None
+
+TimedFunction = TypeVar("TimedFunction", bound=Callable[..., Any])
+
+
+class Timings:
+    """Accumulates the wall time and number of calls of each phase, overall and per file."""
+
+    def __init__(self) -> None:
+        self.phases: Dict[str, List[float]] = {}  # phase: [seconds, calls]
+        self.files: Dict[str, Dict[str, float]] = {}  # file: {"total": seconds, phase: seconds}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _state(self) -> Any:
+        state = self._local
+        if not hasattr(state, "stack"):
+            state.stack = []
+            state.mark = 0.0
+            state.file_phases = None
+        return state
+
+    def _charge(self, state: Any, now: float) -> None:
+        """Attributes the time since the last phase change to the innermost running phase."""
+        if state.stack:
+            phase = state.stack[-1]
+            elapsed = now - state.mark
+            with self._lock:
+                self.phases[phase][0] += elapsed
+            if state.file_phases is not None:
+                state.file_phases[phase] = state.file_phases.get(phase, 0.0) + elapsed
+        state.mark = now
+
+    def start(self, phase: str) -> None:
+        state = self._state()
+        self._charge(state, time.perf_counter())
+        state.stack.append(phase)
+        with self._lock:
+            self.phases.setdefault(phase, [0.0, 0])[1] += 1
+
+    def stop(self) -> None:
+        state = self._state()
+        self._charge(state, time.perf_counter())
+        state.stack.pop()
+
+    @contextmanager
+    def phase(self, phase: str) -> Iterator[None]:
+        self.start(phase)
+        try:
+            yield
+        finally:
+            self.stop()
+
+    @contextmanager
+    def file(self, file_name: str) -> Iterator[None]:
+        """Records the phases run while processing file_name, any time not spent within one of
+        them being attributed to "other".
+        """
+        state = self._state()
+        outer_file_phases = state.file_phases
+        state.file_phases = file_phases = {}
+        started = time.perf_counter()
+        try:
+            with self.phase("other"):
+                yield
+        finally:
+            state.file_phases = outer_file_phases
+            file_phases["total"] = time.perf_counter() - started
+            with self._lock:
+                self.files[file_name] = file_phases
+
+    def take(self) -> Dict[str, Any]:
+        """Returns everything collected so far as plain data, starting afresh."""
+        with self._lock:
+            data = {"phases": self.phases, "files": self.files}
+            self.phases = {}
+            self.files = {}
+        return data
+
+    def merge(self, data: Dict[str, Any]) -> None:
+        """Adds timings previously returned by `take`, such as those of a worker process."""
+        with self._lock:
+            for phase, (seconds, calls) in data["phases"].items():
+                totals = self.phases.setdefault(phase, [0.0, 0])
+                totals[0] += seconds
+                totals[1] += calls
+            self.files.update(data["files"])
+
+    def slowest_files(self, count: int = DEFAULT_SLOWEST_FILES) -> List[Dict[str, Any]]:
+        slowest = sorted(self.files.items(), key=lambda item: item[1]["total"], reverse=True)
+        return [
+            {
+                "file": file_name,
+                "seconds": file_phases["total"],
+                "phases": {
+                    phase: file_phases[phase] for phase in _ordered(file_phases) if phase in PHASES
+                },
+            }
+            for file_name, file_phases in slowest[:count]
+        ]
+
+    def report(self, wall_time: float, count: int = DEFAULT_SLOWEST_FILES) -> Dict[str, Any]:
+        """Returns a JSON serializable report of the phase totals and the slowest files."""
+        return {
+            "wall_time": wall_time,
+            "files": len(self.files),
+            "phases": {
+                phase: {"seconds": self.phases[phase][0], "calls": int(self.phases[phase][1])}
+                for phase in _ordered(self.phases)
+            },
+            "slowest_files": self.slowest_files(count),
+        }
+
+    def summary(self, wall_time: float, jobs: int = 0) -> str:
+        """Returns a table of the time spent and calls made within each phase."""
+        total = sum(seconds for seconds, _ in self.phases.values())
+        lines = [f"{'Phase':<12}{'Calls':>10}{'Seconds':>12}{'Share':>9}  Description"]
+        for phase in _ordered(self.phases):
+            seconds, calls = self.phases[phase]
+            share = seconds / total if total else 0.0
+            lines.append(
+                f"{phase:<12}{int(calls):>10}{seconds:>12.3f}{share:>9.1%}  "
+                f"{PHASE_DESCRIPTIONS.get(phase, '')}"
+            )
+        lines.append(f"{'Total':<12}{'':>10}{total:>12.3f}{1:>9.1%}")
+        lines.append(
+            f"Processed {len(self.files)} files in {wall_time:.3f}s"
+            + (f", phase times are summed across {jobs} worker processes." if jobs else ".")
+        )
+        return "\n".join(lines)
+
+
+def _ordered(phases: Iterable[str]) -> List[str]:
+    return sorted(
+        (phase for phase in phases if phase != "total"),
+        key=lambda phase: (PHASES.index(phase) if phase in PHASES else len(PHASES), phase),
+    )
+
+
+def enable() -> Timings:
+    """Starts collecting timings within this process, returning the collector used."""
+    global _collector
+    _collector = Timings()
+    return _collector
+
+
+def disable() -> None:
+    global _collector
+    _collector = None
+
+
+def collector() -> Optional[Timings]:
+    return _collector
+
+
+def timed(phase: str) -> Callable[[TimedFunction], TimedFunction]:
+    """Decorates a function, so the time spent within it is recorded under phase."""
+
+    def decorator(function: TimedFunction) -> TimedFunction:
+        @wraps(function)
+        def timed_function(*args: Any, **kwargs: Any) -> Any:
+            if _collector is None:
+                return function(*args, **kwargs)
+            _collector.start(phase)
+            try:
+                return function(*args, **kwargs)
+            finally:
+                _collector.stop()
+
+        return timed_function  # type: ignore
+
+    return decorator
+
+
+@contextmanager
+def file(file_name: str) -> Iterator[None]:
+    """Records the time spent processing file_name, if timings are being collected."""
+    if _collector is None:
+        yield
+    else:
+        with _collector.file(file_name):
+            yield
+
+
+def timed_iterator(phase: str, iterable: Iterable[Any]) -> Iterator[Any]:
+    """Yields from iterable, recording the time spent producing each item under phase."""
+    iterator = iter(iterable)
+    while True:
+        if _collector is None:
+            yield from iterator
+            return
+        _collector.start(phase)
+        try:
+            item = next(iterator)
+        except StopIteration:
+            return
+        finally:
+            _collector.stop()
+        yield item
@@ -0,0 +1,314 @@
+"""Defines isort's watch mode, which re-sorts or re-checks source files as they change on disk.
+
+Changes are detected using inotify on Linux, falling back to polling modification times elsewhere
+(or when inotify is unavailable or out of watches). A file is only reported when its inode,
+modification time or size differ from the last time it was recorded, so once a batch of changed
+files has been processed and recorded, the writes isort made to them are not reported again.
+"""
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from . import place
+from .cache import sorted_blocks
+from .main import _directory_identity, _scan_directory, iter_source_code
+from .settings import Config
+
+POLL_INTERVAL: float = 1.0  # Seconds between scans of the watched paths when polling
+DEBOUNCE_DELAY: float = 0.1  # Seconds without new changes before a batch of changes is reported
+MAX_BATCH_DELAY: float = 1.0  # Upper bound on how long a burst of changes can delay reporting
+TEMPORARY_SUFFIX = ".isorted"  # Used by `api.sort_file` for its in-progress output
+
+_FileState = Tuple[int, int, int]  # (inode, modification time in ns, size)
+
+
+def _file_state(file_name: str) -> Optional[_FileState]:
+    try:
+        file_stat = os.stat(file_name)
+    except OSError:
+        return None
+    return (file_stat.st_ino, file_stat.st_mtime_ns, file_stat.st_size)
+
+
+class _Inotify:
+    """A minimal ctypes binding of the Linux inotify API, watching directories for changes."""
+
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ONLYDIR = 0x01000000
+    IN_ISDIR = 0x40000000
+    WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_ONLYDIR
+    EVENT_HEADER = struct.Struct("iIII")
+
+    def __init__(self) -> None:
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.file_descriptor = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.file_descriptor < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+    @classmethod
+    def create(cls) -> Optional["_Inotify"]:
+        """Returns an inotify instance, or `None` if inotify isn't available on this platform."""
+        if not sys.platform.startswith("linux"):
+            return None
+        try:
+            return cls()
+        except (OSError, AttributeError):
+            return None
+
+    def add_watch(self, directory: str) -> int:
+        watch_descriptor = self._libc.inotify_add_watch(
+            self.file_descriptor, os.fsencode(directory), self.WATCH_MASK
+        )
+        if watch_descriptor < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno), directory)
+        return watch_descriptor
+
+    def read(self, timeout: Optional[float]) -> List[Tuple[int, int, str]]:
+        """Waits up to timeout seconds for events, returning them as (watch, mask, name)."""
+        if not select.select([self.file_descriptor], [], [], timeout)[0]:
+            return []
+        try:
+            data = os.read(self.file_descriptor, 64 * 1024)
+        except BlockingIOError:  # pragma: no cover
+            return []
+
+        events = []
+        offset = 0
+        while offset < len(data):
+            watch_descriptor, mask, _, name_length = self.EVENT_HEADER.unpack_from(data, offset)
+            offset += self.EVENT_HEADER.size
+            name = os.fsdecode(data[offset : offset + name_length].rstrip(b"\0"))
+            offset += name_length
+            events.append((watch_descriptor, mask, name))
+        return events
+
+    def close(self) -> None:
+        os.close(self.file_descriptor)
+
+
+class Watcher:
+    """Tracks the source files isort would process for the given paths, reporting any that change.
+
+    The files considered are exactly those a regular run over the same paths would process:
+    directories are walked with the same filtering as `iter_source_code`, and files that change
+    are checked against `Config.is_supported_filetype` and `Config.is_skipped`.
+    """
+
+    def __init__(
+        self,
+        paths: Iterable[str],
+        config: Config,
+        poll_interval: float = POLL_INTERVAL,
+        debounce_delay: float = DEBOUNCE_DELAY,
+        use_inotify: bool = True,
+    ) -> None:
+        self.paths = list(paths)
+        self.config = config
+        self.poll_interval = poll_interval
+        self.debounce_delay = debounce_delay
+        self._states: Dict[str, _FileState] = {}
+        self._inotify = _Inotify.create() if use_inotify else None
+        self._watches: Dict[int, str] = {}  # Watched directories whose source files are tracked
+        self._file_watches: Dict[Tuple[int, str], str] = {}  # Explicitly given files
+        self._visited_dirs: Set[Tuple[int, int]] = set()
+        self.record(self._scan(self.paths))
+
+    @property
+    def uses_inotify(self) -> bool:
+        return self._inotify is not None
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def close(self) -> None:
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+
+    def record(self, file_names: Iterable[str]) -> None:
+        """Records the current state of the given files, so only later changes are reported."""
+        for file_name in file_names:
+            state = _file_state(file_name)
+            if state is None:
+                self._states.pop(file_name, None)
+            else:
+                self._states[file_name] = state
+
+    def _changed(self, file_names: Iterable[str]) -> List[str]:
+        changed = []
+        for file_name in sorted(set(file_names)):
+            state = _file_state(file_name)
+            if state is None:
+                self._states.pop(file_name, None)
+            elif self._states.get(file_name) != state:
+                changed.append(file_name)
+        return changed
+
+    def _scan(self, paths: Iterable[str]) -> List[str]:
+        """Returns the source files within paths, watching their directories for changes."""
+        if self._inotify is None:
+            return list(iter_source_code(paths, self.config, [], []))
+
+        source_files = []
+        try:
+            for path in paths:
+                if os.path.isdir(path):
+                    source_files.extend(self._watch_tree(path))
+                elif os.path.exists(path):
+                    watch = self._inotify.add_watch(os.path.dirname(path) or os.curdir)
+                    self._file_watches[(watch, os.path.basename(path))] = path
+                    source_files.append(path)
+        except OSError:  # Out of inotify watches, or unable to watch: fall back to polling
+            self.close()
+            self._watches.clear()
+            self._file_watches.clear()
+            return list(iter_source_code(self.paths, self.config, [], []))
+        return source_files
+
+    def _watch_tree(self, root: str) -> List[str]:
+        assert self._inotify is not None  # nosec - only called when using inotify
+        source_files: List[str] = []
+        pending = [root]
+        try:
+            self._visited_dirs.add(_directory_identity(root))
+        except OSError:  # pragma: no cover - root was removed before it could be watched
+            return source_files
+
+        while pending:
+            directory = pending.pop()
+            self._watches[self._inotify.add_watch(directory)] = directory
+            subdirectories, directory_files, _ = _scan_directory(directory, self.config)
+            source_files.extend(directory_files)
+            for subdirectory, identity, is_skipped in subdirectories:
+                if not is_skipped and identity not in self._visited_dirs:
+                    self._visited_dirs.add(identity)
+                    pending.append(subdirectory)
+        return source_files
+
+    def _is_source_file(self, file_name: str) -> bool:
+        return (
+            not file_name.endswith(TEMPORARY_SUFFIX)
+            and self.config.is_supported_filetype(file_name)
+            and not self.config.is_skipped(Path(file_name))
+        )
+
+    def wait(self, timeout: Optional[float] = None) -> List[str]:
+        """Blocks until some of the watched source files change, returning them once no further
+        changes have been seen for the debounce delay. Returns an empty list if nothing changed
+        within timeout seconds.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            if self._inotify is not None:
+                candidates = self._wait_for_events(deadline)
+            else:
+                candidates = self._poll(deadline)
+            changed = self._changed(candidates)
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+
+    def _poll(self, deadline: Optional[float]) -> List[str]:
+        while True:
+            candidates = self._changed(iter_source_code(self.paths, self.config, [], []))
+            if candidates:
+                break
+            delay = self.poll_interval
+            if deadline is not None:
+                delay = min(delay, deadline - time.monotonic())
+                if delay <= 0:
+                    return []
+            time.sleep(delay)
+
+        # Wait for a burst of writes to settle before reporting it
+        batch_deadline = time.monotonic() + MAX_BATCH_DELAY
+        states = {file_name: _file_state(file_name) for file_name in candidates}
+        while time.monotonic() < batch_deadline:
+            time.sleep(self.debounce_delay)
+            settled = {file_name: _file_state(file_name) for file_name in candidates}
+            if settled == states:
+                break
+            states = settled
+        return candidates
+
+    def _wait_for_events(self, deadline: Optional[float]) -> List[str]:
+        assert self._inotify is not None  # nosec - only called when using inotify
+        candidates: Set[str] = set()
+        batch_deadline: Optional[float] = None
+        while True:
+            now = time.monotonic()
+            if batch_deadline is not None:
+                timeout: Optional[float] = max(0.0, min(self.debounce_delay, batch_deadline - now))
+            elif deadline is not None:
+                timeout = max(0.0, deadline - now)
+            else:
+                timeout = None
+
+            events = self._inotify.read(timeout) if self._inotify is not None else []
+            if not events:
+                break
+            if batch_deadline is None:
+                batch_deadline = time.monotonic() + MAX_BATCH_DELAY
+            for watch, mask, name in events:
+                candidates.update(self._handle_event(watch, mask, name))
+            if self._inotify is None or time.monotonic() >= batch_deadline:
+                break
+        return list(candidates)
+
+    def _handle_event(self, watch: int, mask: int, name: str) -> List[str]:
+        if mask & _Inotify.IN_Q_OVERFLOW:  # pragma: no cover - events were lost, so rescan
+            return list(iter_source_code(self.paths, self.config, [], []))
+        if mask & _Inotify.IN_IGNORED:
+            self._watches.pop(watch, None)
+            return []
+
+        if (watch, name) in self._file_watches:
+            return [self._file_watches[(watch, name)]]
+        directory = self._watches.get(watch)
+        if directory is None:
+            return []
+
+        path = os.path.join(directory, name)
+        if mask & (_Inotify.IN_DELETE | _Inotify.IN_MOVED_FROM):
+            self._states.pop(path, None)
+            return []
+        if mask & _Inotify.IN_ISDIR:
+            if os.path.isdir(path) and not self.config.is_skipped(Path(path)):
+                return self._scan([path])
+            return []
+        return [path] if self._is_source_file(path) else []
+
+
+def watch(
+    paths: Iterable[str], config: Config, process: Callable[[str], Any], **watcher_kwargs
+) -> None:
+    """Calls process for every watched source file each time it changes, until interrupted."""
+    watcher = Watcher(paths, config, **watcher_kwargs)
+    if not config.quiet:
+        method = "inotify" if watcher.uses_inotify else "polling"
+        print(f"Watching {len(watcher)} files for changes using {method}, press Ctrl+C to stop.")
+
+    try:
+        while True:
+            changed = watcher.wait()
+            if place.refresh_src_paths():  # Modules were added or removed since they were placed
+                sorted_blocks.clear()
+            for file_name in changed:
+                process(file_name)
+            watcher.record(changed)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
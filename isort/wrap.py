@@ -3,10 +3,12 @@ import re
 from typing import List, Optional, Sequence
 
 from .settings import DEFAULT_CONFIG, Config
+from .timings import timed
 from .wrap_modes import WrapModes as Modes
 from .wrap_modes import formatter_from_string
 
 
+@timed("wrap")
 def import_statement(
     import_start: str,
     from_imports: List[str],
@@ -61,6 +63,7 @@ def import_statement(
     return statement
 
 
+@timed("wrap")
 def line(content: str, line_separator: str, config: Config = DEFAULT_CONFIG) -> str:
     """Returns a line wrapped to the specified line-length, if possible."""
     wrap_mode = config.multi_line_output
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""Runs isort's benchmark suite (tests/benchmarks), comparing results against a saved baseline.
+
+Usage:
+    python scripts/bench.py                     # run everything, compare to the saved baseline
+    python scripts/bench.py -k place -k wrap    # only run the matching benchmarks
+    python scripts/bench.py --save-baseline     # record the results as the new baseline
+
+Exits with a non-zero status if any benchmark is slower, or uses more memory, than the baseline
+by more than the threshold. Baselines are specific to the machine and Python they were recorded
+with, so none is committed: record one before making changes, then compare against it.
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from tests.benchmarks import suite  # noqa: E402 isort:skip
+
+DEFAULT_BASELINE = ROOT / "tests" / "benchmarks" / "baseline.json"
+
+
+def _parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument(
+        "-k",
+        dest="patterns",
+        action="append",
+        default=[],
+        help="Only run benchmarks whose name contains, or glob matches, this pattern.",
+    )
+    parser.add_argument("--list", action="store_true", help="List the benchmarks and exit.")
+    parser.add_argument(
+        "--quick",
+        action="store_true",
+        help="Run a single short round per benchmark, for smoke testing rather than comparison.",
+    )
+    parser.add_argument(
+        "--min-time",
+        type=float,
+        default=suite.DEFAULT_MIN_TIME,
+        help="Seconds each round of a benchmark runs for at least.",
+    )
+    parser.add_argument("--rounds", type=int, default=suite.DEFAULT_ROUNDS)
+    parser.add_argument(
+        "--no-memory",
+        dest="memory",
+        action="store_false",
+        help="Skip measuring peak memory, which needs an extra, much slower, traced pass.",
+    )
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        default=DEFAULT_BASELINE,
+        help="JSON file of previously recorded results to compare against.",
+    )
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="Write the results to the baseline file instead of comparing against it. "
+        "Results for benchmarks that weren't run are kept.",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=suite.DEFAULT_THRESHOLD,
+        help="Fraction by which a benchmark may get slower or use more memory than the baseline "
+        "before it is reported as a regression.",
+    )
+    parser.add_argument("-o", "--output", type=Path, help="Also write the results to this file.")
+    return parser.parse_args(argv)
+
+
+def _print_result(name: str, result: Dict[str, Optional[float]]) -> None:
+    peak_memory = result["peak_memory"]
+    print(
+        f"{name:<60}{result['ops_per_second']:>14,.1f} ops/s"
+        + (f"{peak_memory / 1024:>12,.0f} KiB" if peak_memory is not None else ""),
+        flush=True,
+    )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    arguments = _parse_args(argv)
+    benchmarks = suite.select(suite.benchmarks(), arguments.patterns)
+    if arguments.list:
+        for benchmark in benchmarks:
+            print(benchmark.name)
+        return 0
+    if not benchmarks:
+        print("No benchmarks match the given patterns.", file=sys.stderr)
+        return 2
+
+    if arguments.quick:
+        arguments.min_time, arguments.rounds = 0.0, 1
+    results = suite.run(
+        benchmarks, arguments.min_time, arguments.rounds, arguments.memory, _print_result
+    )
+    if arguments.output:
+        arguments.output.write_text(json.dumps(results, indent=4, sort_keys=True) + "\n")
+
+    baseline = json.loads(arguments.baseline.read_text()) if arguments.baseline.is_file() else None
+    if arguments.save_baseline:
+        if baseline:
+            baseline["benchmarks"].update(results["benchmarks"])
+            results["benchmarks"] = baseline["benchmarks"]
+        arguments.baseline.write_text(json.dumps(results, indent=4, sort_keys=True) + "\n")
+        print(f"Saved baseline to {arguments.baseline}")
+        return 0
+    if baseline is None:
+        print(f"No baseline found at {arguments.baseline}, use --save-baseline to record one.")
+        return 0
+
+    print(
+        f"\nCompared to the baseline recorded with isort {baseline.get('isort')} on Python "
+        f"{baseline.get('python')} ({baseline.get('platform')}):"
+    )
+    regressions: List[suite.Comparison] = []
+    for comparison in suite.compare(results, baseline, arguments.threshold):
+        flag = "REGRESSED" if comparison.regressed else ""
+        memory_change = comparison.memory_change
+        print(
+            f"{comparison.name:<60}{comparison.ops_change:>+10.1%} ops/s"
+            + (f"{memory_change:>+10.1%} memory" if memory_change is not None else " " * 17)
+            + f"  {flag}"
+        )
+        if comparison.regressed:
+            regressions.append(comparison)
+    if regressions:
+        print(f"\n{len(regressions)} benchmarks regressed by more than {arguments.threshold:.0%}.")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,173 @@
+"""Generates the deterministic synthetic corpora used by the benchmark suite, and loads the
+vendored snapshots of real-world files.
+"""
+import random
+from pathlib import Path
+from typing import List
+
+from isort.stdlibs import py3
+
+REAL_WORLD_DIR = Path(__file__).parent / "real_world"
+REAL_WORLD_SUFFIX = ".py.txt"
+SEED = 1556
+
+STDLIB = sorted(py3.stdlib)
+THIRD_PARTY = sorted(
+    [
+        "attr",
+        "click",
+        "django",
+        "django.db.models",
+        "flask",
+        "jinja2",
+        "numpy",
+        "pandas",
+        "pytest",
+        "requests",
+        "sqlalchemy.orm",
+        "yaml",
+    ]
+    + [f"vendor{index}.package" for index in range(40)]
+)
+FIRST_PARTY = [
+    f"project.{area}.{module}"
+    for area in ("api", "core", "models", "utils", "views")
+    for module in ("base", "helpers", "handlers", "schema", "tasks")
+]
+NAMES = [
+    f"{prefix}{suffix}"
+    for prefix in ("get", "set", "load", "make", "Parse", "Render", "VALUE", "_private")
+    for suffix in ("", "_config", "Item", "_all", "Handler", "2", "_FLAG")
+]
+
+
+def module_names(count: int = 1000, seed: int = SEED) -> List[str]:
+    """Returns module names to place: a mix of standard library, third party, first party,
+    relative and unknown modules, including submodules.
+    """
+    rng = random.Random(seed)
+    kinds = (STDLIB, THIRD_PARTY, FIRST_PARTY)
+    names = []
+    for index in range(count):
+        if index % 20 == 0:
+            names.append("." * rng.randint(1, 3) + rng.choice(("", "sibling", "sibling.child")))
+        elif index % 7 == 0:
+            names.append(f"unknown_{index}.module")
+        else:
+            name = rng.choice(rng.choice(kinds))
+            names.append(f"{name}.sub{index}" if rng.random() < 0.5 else name)
+    return names
+
+
+def import_lines(count: int, seed: int = SEED) -> List[str]:
+    """Returns count unsorted import statements of every shape isort handles."""
+    rng = random.Random(seed)
+    lines = []
+    for index in range(count):
+        module = rng.choice(rng.choice((STDLIB, THIRD_PARTY, FIRST_PARTY)))
+        shape = index % 6
+        if shape == 0:
+            lines.append(f"import {module}")
+        elif shape == 1:
+            lines.append(f"import {module} as alias{index}  # comment {index}")
+        elif shape == 2:
+            names = ", ".join(rng.sample(NAMES, rng.randint(1, 6)))
+            lines.append(f"from {module} import {names}")
+        elif shape == 3:
+            names = rng.sample(NAMES, rng.randint(4, 12))
+            lines.append(f"from {module} import (\n    " + ",\n    ".join(names) + ",\n)")
+        elif shape == 4:
+            lines.append(f"from {'.' * rng.randint(1, 2)}sibling{index} import {rng.choice(NAMES)}")
+        else:
+            lines.append(f"from {module} import {rng.choice(NAMES)} as renamed{index}")
+    return lines
+
+
+def _code(index: int) -> str:
+    return (
+        f"\n\nclass Model{index}:\n"
+        f'    """Docstring for model {index}."""\n\n'
+        f"    def method(self, value):\n"
+        f"        return value * {index}\n"
+    )
+
+
+def small_files(count: int = 200, imports: int = 12) -> List[str]:
+    """Many small modules, each with a short import block followed by code."""
+    return [
+        "\n".join(import_lines(imports, seed=SEED + index)) + _code(index) for index in range(count)
+    ]
+
+
+def shared_header_files(count: int = 200, imports: int = 30) -> List[str]:
+    """Many modules starting with the same import block, followed by different code."""
+    header = "\n".join(import_lines(imports))
+    return [header + _code(index) for index in range(count)]
+
+
+def huge_import_block(imports: int = 2000) -> List[str]:
+    """A single module made up of one very large import block."""
+    return ["\n".join(import_lines(imports)) + _code(0)]
+
+
+def commented_import_block(imports: int = 2000) -> List[str]:
+    """A single module made up of one very large import block, with comments containing quotes
+    on every statement.
+    """
+    return [
+        "\n".join(
+            f'{line}  # {index}: it\'s "{NAMES[index % len(NAMES)]}"'
+            for index, line in enumerate(import_lines(imports))
+        )
+        + _code(0)
+    ]
+
+
+def nested_imports(depth: int = 8, blocks: int = 40) -> List[str]:
+    """A module whose imports are spread across deeply nested, indented blocks."""
+    lines = ['"""Nested imports."""']
+    for block in range(blocks):
+        lines.append(f"def function{block}():")
+        for level in range(1, depth + 1):
+            indent = "    " * level
+            for line in import_lines(4, seed=SEED + block * depth + level):
+                lines.extend(indent + part for part in line.split("\n"))
+            lines.append(f"{indent}if value{level}:")
+        lines.append("    " * (depth + 1) + "pass")
+    return ["\n".join(lines) + "\n"]
+
+
+def scattered_imports(files: int = 20, sections: int = 25) -> List[str]:
+    """Modules with imports interleaved with code throughout, as float_to_top collects."""
+    return [
+        "".join(
+            "\n".join(import_lines(3, seed=SEED + file_index * sections + section)) + _code(section)
+            for section in range(sections)
+        )
+        for file_index in range(files)
+    ]
+
+
+def generated_module(sections: int = 1000) -> List[str]:
+    """A single large generated module with imports interleaved with code throughout."""
+    return scattered_imports(files=1, sections=sections)
+
+
+def medium_files(count: int = 20, imports: int = 80) -> List[str]:
+    """Typical modules, with a sizeable import block at the top."""
+    return [
+        '"""A typical module."""\n'
+        + "\n".join(import_lines(imports, seed=SEED + index))
+        + _code(index)
+        for index in range(count)
+    ]
+
+
+def real_world_names() -> List[str]:
+    """Returns the names of the vendored real-world files."""
+    return sorted(path.name[: -len(REAL_WORLD_SUFFIX)] for path in REAL_WORLD_DIR.glob("*.py.txt"))
+
+
+def real_world(name: str) -> List[str]:
+    """Returns the contents of the named vendored real-world file."""
+    return [(REAL_WORLD_DIR / f"{name}{REAL_WORLD_SUFFIX}").read_text(encoding="utf-8")]
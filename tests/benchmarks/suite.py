@@ -0,0 +1,329 @@
+"""Defines the benchmarks run by `scripts/bench.py`, how they are measured, and how results are
+compared against a saved baseline.
+
+Each benchmark processes a fixed corpus in passes, with throughput reported as operations (files
+sorted, modules placed, statements wrapped, ...) per second for the fastest of several rounds,
+and memory as the peak traced by `tracemalloc` during a single pass.
+"""
+import os
+import platform
+import tempfile
+import time
+import tracemalloc
+from fnmatch import fnmatch
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import isort
+from isort import parse, place, wrap
+from isort.cache import sorted_blocks
+from isort.profiles import profiles
+from isort.settings import Config
+from isort.wrap_modes import WrapModes
+
+from . import corpora
+
+DEFAULT_MIN_TIME = 0.2  # Seconds each round of passes over a corpus should take at least
+DEFAULT_ROUNDS = 3
+DEFAULT_THRESHOLD = 0.1  # The fraction by which a result may be worse than the baseline
+
+
+def _nothing() -> None:
+    pass
+
+
+class Workload(NamedTuple):
+    run: Callable[[], int]  # Processes the corpus once, returning the number of operations
+    reset: Callable[[], None] = _nothing  # Called untimed before every pass, e.g. to clear caches
+
+
+class Benchmark(NamedTuple):
+    name: str
+    setup: Callable[[], Workload]
+
+
+def _code_workload(function: Callable[..., Any], code_corpus: Callable[[], List[str]], **config):
+    def setup() -> Workload:
+        codes = code_corpus()
+        benchmark_config = Config(quiet=True, **config)
+
+        def run() -> int:
+            for code in codes:
+                function(code, config=benchmark_config)
+            return len(codes)
+
+        # Every pass starts from an empty cache of sorted import blocks, like a fresh run would
+        return Workload(run, reset=sorted_blocks.clear)
+
+    return setup
+
+
+def _parse_workload(code_corpus: Callable[[], List[str]]) -> Callable[[], Workload]:
+    def setup() -> Workload:
+        codes = code_corpus()
+        benchmark_config = Config()
+
+        def run() -> int:
+            for code in codes:
+                parse.file_contents(code, config=benchmark_config)
+            return len(codes)
+
+        return Workload(run)
+
+    return setup
+
+
+def _clear_place_caches(config: Config) -> None:
+    place.placement_cache(config).clear()
+    place._directory_indexes.clear()
+
+
+def _place_workload(
+    batch: bool = False, count: int = 1000, warm: bool = False, **config: Any
+) -> Callable[[], Workload]:
+    def setup() -> Workload:
+        names = corpora.module_names(count)
+        benchmark_config = Config(**config)
+
+        def run() -> int:
+            if batch:
+                place.modules(names, benchmark_config)
+            else:
+                for name in names:
+                    place.module(name, benchmark_config)
+            return len(names)
+
+        if warm:  # Placements are only made on the first pass
+            return Workload(run)
+        return Workload(run, reset=partial(_clear_place_caches, benchmark_config))
+
+    return setup
+
+
+def _wrap_workload(mode: WrapModes) -> Callable[[], Workload]:
+    def setup() -> Workload:
+        statements = [
+            (f"from {module} import ", corpora.NAMES[: 4 + index % 20])
+            for index, module in enumerate(corpora.THIRD_PARTY + corpora.FIRST_PARTY)
+        ]
+        benchmark_config = Config(multi_line_output=mode, line_length=79)
+
+        def run() -> int:
+            for import_start, from_imports in statements:
+                wrap.import_statement(import_start, from_imports, config=benchmark_config)
+            return len(statements)
+
+        return Workload(run)
+
+    return setup
+
+
+def _is_skipped_workload(count: int = 10_000) -> Callable[[], Workload]:
+    directories = ("src/app", "src/app/api/v1", "src/app/generated", "tests/unit", "lib/migrations")
+
+    def setup() -> Workload:
+        temporary_directory = tempfile.TemporaryDirectory(prefix="isort-bench-")
+        root = temporary_directory.name
+        for directory in directories:
+            os.makedirs(os.path.join(root, directory))
+        paths = [
+            Path(root, directories[index % len(directories)], f"module_{index}.py")
+            for index in range(count)
+        ]
+        for path in paths[: len(directories) * 20]:
+            path.touch()
+        benchmark_config = Config(
+            directory=root,
+            skip=("migrations", "node_modules", "third_party", "setup.py", "docs/conf.py"),
+            skip_glob=("*/generated/*", "*_pb2.py", "build/*", "*/.ipynb_checkpoints/*"),
+        )
+
+        def run() -> int:
+            assert temporary_directory  # nosec - kept alive for as long as the workload
+            for path in paths:
+                benchmark_config.is_skipped(path)
+            return len(paths)
+
+        return Workload(run)
+
+    return setup
+
+
+def code_corpora() -> Dict[str, Tuple[Callable[[], List[str]], Dict[str, Any]]]:
+    """Returns the code corpora sorted and checked, alongside the config used for each."""
+    code: Dict[str, Tuple[Callable[[], List[str]], Dict[str, Any]]] = {
+        "small_files": (corpora.small_files, {}),
+        "shared_header_files": (corpora.shared_header_files, {}),
+        "huge_import_block": (corpora.huge_import_block, {}),
+        "commented_import_block": (corpora.commented_import_block, {}),
+        "nested_imports": (corpora.nested_imports, {}),
+        "float_to_top": (corpora.scattered_imports, {"float_to_top": True}),
+        "float_to_top_generated_module": (corpora.generated_module, {"float_to_top": True}),
+        "force_sort_within_sections": (corpora.medium_files, {"force_sort_within_sections": True}),
+    }
+    for profile in sorted(profiles):
+        code[f"profile_{profile}"] = (corpora.medium_files, {"profile": profile})
+    for name in corpora.real_world_names():
+        code[f"real_world_{name}"] = (partial(corpora.real_world, name), {})
+    return code
+
+
+def benchmarks() -> List[Benchmark]:
+    suite = []
+    for function in (isort.code, isort.check_code):
+        label = "sort_code_string" if function is isort.code else "check_code_string"
+        for corpus, (code_corpus, config) in code_corpora().items():
+            suite.append(
+                Benchmark(f"{label}[{corpus}]", _code_workload(function, code_corpus, **config))
+            )
+    suite.append(
+        Benchmark(
+            "sort_code_string[nested_imports_line_range]",
+            # Sorts the first nested block, as editors do around a change near the top of a file
+            _code_workload(partial(isort.code, line_range=(1, 12)), corpora.nested_imports),
+        )
+    )
+    for corpus in ("huge_import_block", "medium_files"):
+        suite.append(
+            Benchmark(f"parse.file_contents[{corpus}]", _parse_workload(getattr(corpora, corpus)))
+        )
+    suite.append(Benchmark("place.module[default]", _place_workload()))
+    suite.append(
+        Benchmark(
+            "place.module[known_patterns]",
+            _place_workload(
+                known_first_party=["project.*", "internal"],
+                known_third_party=["vendor1*", "django"] + corpora.THIRD_PARTY[:20],
+                known_vendored=["vendor3*"],
+                sections=(
+                    "FUTURE",
+                    "STDLIB",
+                    "THIRDPARTY",
+                    "VENDORED",
+                    "FIRSTPARTY",
+                    "LOCALFOLDER",
+                ),
+            ),
+        )
+    )
+    suite.append(
+        Benchmark(
+            "place.module[src_paths]", _place_workload(src_paths=[str(Path(__file__).parent)])
+        )
+    )
+    suite.append(Benchmark("place.module[warm_5000_names]", _place_workload(count=5000, warm=True)))
+    suite.append(
+        Benchmark(
+            "place.modules[src_paths]",
+            _place_workload(batch=True, src_paths=[str(Path(__file__).parent)]),
+        )
+    )
+    for mode in WrapModes:
+        suite.append(Benchmark(f"wrap.import_statement[{mode.name}]", _wrap_workload(mode)))
+    suite.append(Benchmark("Config.is_skipped[skip_and_skip_glob]", _is_skipped_workload()))
+    return suite
+
+
+def select(suite: Iterable[Benchmark], patterns: Iterable[str]) -> List[Benchmark]:
+    """Returns the benchmarks whose names contain, or glob match, any of the given patterns."""
+    patterns = list(patterns)
+    if not patterns:
+        return list(suite)
+    return [
+        benchmark
+        for benchmark in suite
+        if any(
+            pattern in benchmark.name or fnmatch(benchmark.name, pattern) for pattern in patterns
+        )
+    ]
+
+
+def measure(
+    workload: Workload,
+    min_time: float = DEFAULT_MIN_TIME,
+    rounds: int = DEFAULT_ROUNDS,
+    memory: bool = True,
+) -> Dict[str, Optional[float]]:
+    """Returns the operations per second of the fastest round and, unless memory is `False`, the
+    peak memory of a pass. Tracing memory allocations makes a pass an order of magnitude slower.
+    """
+    workload.reset()
+    workload.run()  # Warm up, so imports and one-off initialization aren't measured
+
+    best = 0.0
+    for _ in range(rounds):
+        operations = 0
+        elapsed = 0.0
+        while not operations or elapsed < min_time:
+            workload.reset()
+            started = time.perf_counter()
+            operations += workload.run()
+            elapsed += time.perf_counter() - started
+        best = max(best, operations / elapsed if elapsed else float("inf"))
+    if not memory:
+        return {"ops_per_second": best, "peak_memory": None}
+
+    workload.reset()
+    tracemalloc.start()
+    try:
+        workload.run()
+        peak_memory = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {"ops_per_second": best, "peak_memory": peak_memory}
+
+
+def run(
+    suite: Iterable[Benchmark],
+    min_time: float = DEFAULT_MIN_TIME,
+    rounds: int = DEFAULT_ROUNDS,
+    memory: bool = True,
+    progress: Optional[Callable[[str, Dict[str, Optional[float]]], None]] = None,
+) -> Dict[str, Any]:
+    """Runs each benchmark, returning the results alongside a description of the environment."""
+    results: Dict[str, Dict[str, Optional[float]]] = {}
+    for benchmark in suite:
+        results[benchmark.name] = measure(benchmark.setup(), min_time, rounds, memory)
+        if progress:
+            progress(benchmark.name, results[benchmark.name])
+    return {
+        "isort": isort.__version__,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "benchmarks": results,
+    }
+
+
+class Comparison(NamedTuple):
+    name: str
+    ops_change: float  # Fractional change in operations per second, positive is faster
+    memory_change: Optional[float]  # Fractional change in peak memory, positive is more
+    regressed: bool
+
+
+def compare(
+    results: Dict[str, Any], baseline: Dict[str, Any], threshold: float = DEFAULT_THRESHOLD
+) -> List[Comparison]:
+    """Compares each benchmark also present in baseline, flagging those that became more than
+    threshold slower, or use more than threshold more memory.
+    """
+    comparisons = []
+    for name, result in results["benchmarks"].items():
+        base = baseline["benchmarks"].get(name)
+        if not base:
+            continue
+        ops_change = result["ops_per_second"] / base["ops_per_second"] - 1
+        memory_change = None
+        if result["peak_memory"] is not None and base["peak_memory"]:
+            memory_change = result["peak_memory"] / base["peak_memory"] - 1
+        comparisons.append(
+            Comparison(
+                name,
+                ops_change,
+                memory_change,
+                ops_change < -threshold or (memory_change or 0.0) > threshold,
+            )
+        )
+    return comparisons
@@ -0,0 +1,51 @@
+"""Smoke tests making sure every benchmark still runs, without measuring anything.
+
+These are left out of test runs unless selected: `pytest tests/benchmarks -m benchmark`.
+"""
+import pytest
+
+from . import suite
+
+pytestmark = pytest.mark.benchmark
+
+
+@pytest.mark.parametrize("benchmark", suite.benchmarks(), ids=lambda benchmark: benchmark.name)
+def test_benchmark_runs(benchmark):
+    workload = benchmark.setup()
+    workload.reset()
+    assert workload.run() > 0
+
+
+def test_measure_and_compare():
+    workload = suite.Workload(lambda: 10)
+    result = suite.measure(workload, min_time=0.0, rounds=1)
+    assert result["ops_per_second"] > 0
+    assert result["peak_memory"] is not None
+    assert suite.measure(workload, min_time=0.0, rounds=1, memory=False)["peak_memory"] is None
+
+    baseline = {
+        "benchmarks": {
+            "steady": {"ops_per_second": 100.0, "peak_memory": 1000},
+            "slower": {"ops_per_second": 100.0, "peak_memory": 1000},
+            "bigger": {"ops_per_second": 100.0, "peak_memory": 1000},
+        }
+    }
+    results = {
+        "benchmarks": {
+            "steady": {"ops_per_second": 95.0, "peak_memory": 1050},
+            "slower": {"ops_per_second": 80.0, "peak_memory": 1000},
+            "bigger": {"ops_per_second": 100.0, "peak_memory": None},
+            "new": {"ops_per_second": 1.0, "peak_memory": 1},
+        }
+    }
+    comparisons = {
+        comparison.name: comparison for comparison in suite.compare(results, baseline, 0.1)
+    }
+    assert set(comparisons) == {"steady", "slower", "bigger"}
+    assert not comparisons["steady"].regressed
+    assert comparisons["slower"].regressed
+    assert comparisons["bigger"].memory_change is None
+    assert not comparisons["bigger"].regressed
+    assert [benchmark.name for benchmark in suite.select(suite.benchmarks(), ["[NOQA]"])] == [
+        "wrap.import_statement[NOQA]"
+    ]
@@ -1,5 +1,7 @@
 import ast
+from io import StringIO
 from typing import get_type_hints
+from unittest import mock
 
 import hypothesis
 import libcst
@@ -7,6 +9,8 @@ from hypothesis import strategies as st
 from hypothesmith import from_grammar, from_node
 
 import isort
+from isort import core
+from isort.exceptions import FileSkipComment
 
 
 def _as_config(kw) -> isort.Config:
@@ -70,17 +74,19 @@ def configs(**force_strategies: st.SearchStrategy) -> st.SearchStrategy[isort.Co
 
 st.register_type_strategy(isort.Config, configs())
 
+source_codes = st.lists(
+    from_grammar(auto_target=False)
+    | from_node(auto_target=False)
+    | from_node(libcst.Import, auto_target=False)
+    | from_node(libcst.ImportFrom, auto_target=False),
+    min_size=1,
+    max_size=10,
+).map("\n".join)
+
 
 @hypothesis.example("import A\nimportA\r\n\n", isort.Config(), False)
 @hypothesis.given(
-    source_code=st.lists(
-        from_grammar(auto_target=False)
-        | from_node(auto_target=False)
-        | from_node(libcst.Import, auto_target=False)
-        | from_node(libcst.ImportFrom, auto_target=False),
-        min_size=1,
-        max_size=10,
-    ).map("\n".join),
+    source_code=source_codes,
     config=st.builds(isort.Config),
     disregard_skip=st.booleans(),
 )
@@ -94,3 +100,30 @@ def test_isort_is_idempotent(source_code: str, config: isort.Config, disregard_s
     _record_targets(source_code)
     result = isort.code(source_code, config=config, disregard_skip=disregard_skip)
     assert result == isort.code(result, config=config, disregard_skip=disregard_skip)
+
+
+def _process(source_code: str, config: isort.Config, newline: str):
+    output = StringIO()
+    try:
+        changed = core.process(StringIO(source_code, newline=newline), output, config=config)
+    except FileSkipComment:
+        return "skipped"
+    return changed, output.getvalue()
+
+
+@hypothesis.example("x = 1\n# isort: list\n[b, a]\n\nimport b\n", isort.Config(), "")
+@hypothesis.example("import b\rimport a\r\rx = 1\r", isort.Config(), "")
+@hypothesis.given(
+    source_code=source_codes,
+    config=st.builds(isort.Config),
+    newline=st.sampled_from(("\n", "")),
+)
+@hypothesis.seed(235738473415671197623909623354096762459)
+@hypothesis.settings(
+    suppress_health_check=[hypothesis.HealthCheck.too_slow, hypothesis.HealthCheck.filter_too_much]
+)
+def test_prescan_is_equivalent(source_code: str, config: isort.Config, newline: str) -> None:
+    _record_targets(source_code)
+    result = _process(source_code, config, newline)
+    with mock.patch.object(core, "_prescan", lambda input_stream: (input_stream, -1)):
+        assert result == _process(source_code, config, newline)
@@ -7,6 +7,8 @@ from unittest.mock import MagicMock, patch
 import pytest
 
 from isort import api
+from isort.core import Edit
+from isort.exceptions import FileSkipComment
 from isort.settings import Config
 
 imperfect_content = "import b\nimport a\n"
@@ -88,3 +90,91 @@ def test_get_import_file(imperfect, capsys):
     api.get_imports_file(imperfect, sys.stdout)
     out, _ = capsys.readouterr()
     assert out == imperfect_content.replace("\n", os.linesep)
+
+
+def test_sort_code_string_line_range():
+    code = (
+        "import sys\n"
+        "import os\n"
+        "\n"
+        "\n"
+        "def first():\n"
+        "    import b\n"
+        "    import a\n"
+        "\n"
+        "\n"
+        "def second():\n"
+        "    import d\n"
+        "    import c\n"
+        "    # isort: list\n"
+        "    names = ['b', 'a']\n"
+        "\n"
+        "    return names\n"
+    )
+    assert api.sort_code_string(code, line_range=(6, 6)) == code.replace(
+        "import b\n    import a", "import a\n    import b"
+    )
+    assert api.sort_code_string(code, line_range=(1, 1)) == code.replace(
+        "import sys\nimport os", "import os\nimport sys"
+    )
+    assert api.sort_code_string(code, line_range=(11, 14)) == code.replace(
+        "import d\n    import c", "import c\n    import d"
+    ).replace("['b', 'a']", "['a', 'b']")
+    assert api.sort_code_string(code, line_range=(1, 100)) == api.sort_code_string(code)
+    assert api.sort_code_string(code, line_range=(3, 5)) == code.replace(
+        "import sys\nimport os", "import os\nimport sys"
+    )
+    assert api.sort_code_string(code, line_range=(10, 10)) == code
+    assert api.check_code_string(code, line_range=(10, 10))
+    assert not api.check_code_string(code, line_range=(7, 10))
+
+    # adding imports and floating them to the top affect the whole file, so are left out
+    assert api.sort_code_string(code, line_range=(6, 6), add_imports=["import abc"]) == (
+        api.sort_code_string(code, line_range=(6, 6))
+    )
+    assert api.sort_code_string(code, line_range=(6, 6), float_to_top=True) == (
+        api.sort_code_string(code, line_range=(6, 6))
+    )
+
+    # the code after the range isn't sorted, but still can't ask for the file to be skipped
+    with pytest.raises(FileSkipComment):
+        api.sort_code_string(code + "# isort: skip_file\n", line_range=(1, 1))
+
+
+def test_find_edits():
+    code = (
+        "import sys\n"
+        "import os\n"
+        "\n"
+        "\n"
+        "def function():\n"
+        "    import b\n"
+        "    import a\n"
+        "    # isort: list\n"
+        "    names = ['b', 'a']\n"
+        "\n"
+        "    return names\n"
+    )
+    edits = api.find_edits_in_code(code)
+    assert edits == [
+        Edit(1, 5, "import os\nimport sys\n\n\ndef function():\n"),
+        Edit(6, 7, "    import a\n    import b\n"),
+        Edit(9, 9, "    names = ['a', 'b']\n"),
+    ]
+    assert api.apply_edits(code, edits) == api.sort_code_string(code)
+    assert api.find_edits_in_code(code, line_range=(6, 6)) == [edits[1]]
+    assert api.find_edits_in_code(api.sort_code_string(code)) == []
+
+    # added imports are inserted, and floating imports to the top replaces the whole file
+    assert api.find_edits_in_code("x = 1\n", add_imports=["import os"]) == [
+        Edit(1, 1, "import os\n\nx = 1\n")
+    ]
+    floated = "x = 1\nimport b\nimport a\n"
+    assert api.find_edits_in_code(floated, float_to_top=True) == [
+        Edit(1, 3, api.sort_code_string(floated, float_to_top=True))
+    ]
+
+
+def test_find_edits_in_file(imperfect) -> None:
+    assert api.find_edits_in_file(imperfect) == [Edit(1, 2, fixed_content)]
+    assert imperfect.read() == imperfect_content
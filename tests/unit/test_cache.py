@@ -0,0 +1,258 @@
+import gc
+import json
+import os
+import time
+import weakref
+
+import pytest
+
+import isort
+from isort import cache
+from isort.settings import Config
+
+
+def test_config_fingerprint(tmpdir):
+    assert cache.config_fingerprint(Config()) == cache.config_fingerprint(Config())
+    assert cache.config_fingerprint(Config()) != cache.config_fingerprint(Config(line_length=100))
+    assert cache.config_fingerprint(Config()) == cache.config_fingerprint(Config(verbose=True))
+
+    config_file = tmpdir.join(".isort.cfg")
+    config_file.write("[settings]\nline_length=100\n")
+    config = Config(settings_file=str(config_file))
+    fingerprint = cache.config_fingerprint(config)
+    assert fingerprint == cache.config_fingerprint(config)
+
+    # changing a config source invalidates the fingerprint even if the resolved config is the same
+    config_file.write("[settings]\nline_length = 100\n")
+    assert cache.config_fingerprint(config) != fingerprint
+
+
+def test_file_digest(tmpdir):
+    source = tmpdir.join("file.py")
+    source.write("import os\n")
+    stub = tmpdir.join("file.pyi")
+    stub.write("import os\n")
+    assert cache.file_digest(str(source)) == cache.file_digest(str(source))
+    assert cache.file_digest(str(source)) != cache.file_digest(str(stub))
+    assert cache.file_digest(str(tmpdir.join("missing.py"))) is None
+
+
+def test_result_cache(tmpdir):
+    cache_dir = tmpdir.join("cache")
+    config = Config()
+
+    result_cache = cache.ResultCache(str(cache_dir), config)
+    assert not result_cache.is_sorted("digest")
+    assert not result_cache.is_sorted(None)
+    result_cache.mark_sorted("digest")
+    result_cache.mark_sorted(None)
+    result_cache.save()
+    assert result_cache.misses == 2
+
+    reloaded = cache.ResultCache(str(cache_dir), config)
+    assert reloaded.is_sorted("digest")
+    assert not reloaded.is_sorted("other")
+    assert reloaded.hits == 1
+
+    # a different config gets its own cache
+    assert not cache.ResultCache(str(cache_dir), Config(line_length=100)).is_sorted("digest")
+
+    # as does a different version of isort
+    data = json.loads(open(reloaded.path).read())
+    data["version"] = "0.0.0"
+    reloaded.path.write_text(json.dumps(data))
+    assert not cache.ResultCache(str(cache_dir), config).is_sorted("digest")
+
+
+def test_result_cache_pruning(tmpdir):
+    cache_dir = tmpdir.join("cache")
+    result_cache = cache.ResultCache(str(cache_dir), Config(), max_entries=2)
+    result_cache._now -= 3600
+    for digest in ("one", "two", "three"):
+        result_cache.mark_sorted(digest)
+        result_cache._now += 1
+    result_cache.save()
+    assert sorted(json.loads(result_cache.path.read_text())["entries"]) == ["three", "two"]
+
+    # entries that have not been seen for longer than the max age are dropped
+    assert cache.ResultCache(str(cache_dir), Config()).is_sorted("three")
+    assert not cache.ResultCache(str(cache_dir), Config(), max_age=60).is_sorted("three")
+
+    # as are cache files, of results or placements, not used within the max age
+    stale_cache = cache_dir.join(f"stale{cache.CACHE_FILE_SUFFIX}")
+    stale_placements = cache_dir.join(f"stale{cache.PLACEMENT_CACHE_FILE_SUFFIX}")
+    placements_path = cache.placement_cache_path(str(cache_dir), Config())
+    placement_cache = cache.PlacementCache()
+    placement_cache.put("os", ("STDLIB", "reason"))
+    placement_cache.save(placements_path)
+    stale_cache.write("{}")
+    stale_placements.write("{}")
+    an_hour_ago = time.time() - 3600
+    for cache_file in (stale_cache, stale_placements, placements_path, result_cache.path):
+        os.utime(str(cache_file), (an_hour_ago, an_hour_ago))
+    cache.ResultCache(str(cache_dir), Config(), max_age=60).save()
+    assert not stale_cache.exists()
+    assert not stale_placements.exists()
+    assert placements_path.exists()
+
+    # files in use are touched, however long ago they were last written
+    assert result_cache.path.stat().st_mtime > an_hour_ago
+    cache.PlacementCache().load(placements_path)
+    assert placements_path.stat().st_mtime > an_hour_ago
+
+
+def test_sorted_block_cache():
+    config = Config()
+    block_cache = cache.SortedBlockCache(max_size=2)
+    first = ("import b\nimport a\n", "py", "import", "", config)
+    second = ("import d\nimport c\n", "py", "import", "", config)
+    assert block_cache.get(first) is None
+    block_cache.put(first, ("import a\nimport b\n", ()))
+    block_cache.put(second, ("import c\nimport d\n", ()))
+    assert block_cache.get(first) == ("import a\nimport b\n", ())
+    assert block_cache.get(first[:4] + (Config(),)) is None
+
+    block_cache.put(("import e\n", "py", "import", "", config), ("import e\n", ()))
+    assert block_cache.get(second) is None  # least recently used, so evicted
+    assert block_cache.get(first)
+    assert (block_cache.hits, block_cache.misses) == (2, 3)
+
+    block_cache.clear()
+    assert block_cache.get(first) is None
+    assert (block_cache.hits, block_cache.misses) == (0, 1)
+
+    # blocks are only held for as long as their config is
+    block_cache.put(first, ("import a\nimport b\n", ()))
+    config_reference = weakref.ref(config)
+    del config, first, second
+    gc.collect()
+    assert config_reference() is None
+    assert len(block_cache._entries) == 0
+
+
+def test_placement_cache():
+    placement_cache = cache.PlacementCache(max_size=2)
+    assert placement_cache.get("os") is None
+    placement_cache.put("os", ("STDLIB", "reason"))
+    placement_cache.update({"requests": ("THIRDPARTY", "reason"), "isort": ("FIRSTPARTY", "")})
+    assert len(placement_cache) == 2
+    assert placement_cache.get("os") is None  # oldest, so dropped
+    assert placement_cache.get("isort") == ("FIRSTPARTY", "")
+    assert (placement_cache.hits, placement_cache.misses) == (1, 2)
+
+    placement_cache.clear()
+    assert len(placement_cache) == 0
+    assert (placement_cache.hits, placement_cache.misses) == (0, 0)
+    assert len(cache.PlacementCache()) == 0
+
+
+def test_placement_cache_persistence(tmpdir):
+    src = tmpdir.mkdir("src")
+    package = src.mkdir("package")
+    dependencies = ((str(src), src.stat().mtime_ns), (str(package), package.stat().mtime_ns))
+    path = cache.placement_cache_path(tmpdir.join("cache"), Config())
+    placement_cache = cache.PlacementCache()
+    placement_cache.put("os", ("STDLIB", "reason"))
+    placement_cache.put("package", ("FIRSTPARTY", "reason"), dependencies)
+    placement_cache.put("requests", ("THIRDPARTY", "reason"), dependencies[:1])
+    placement_cache.save(path)
+
+    loaded = cache.PlacementCache()
+    loaded.load(path)
+    assert loaded.loaded == len(loaded) == 3
+    assert loaded.get("package") == ("FIRSTPARTY", "reason")
+    assert loaded.was_loaded("package") and not placement_cache.was_loaded("package")
+    assert not loaded.modified
+
+    # placements are only reused while the directories they were made from are unchanged
+    os.utime(str(package), ns=(package.stat().mtime_ns + 1_000_000,) * 2)
+    loaded = cache.PlacementCache()
+    loaded.load(path)
+    assert (loaded.get("os"), loaded.get("requests"), loaded.get("package")) == (
+        ("STDLIB", "reason"),
+        ("THIRDPARTY", "reason"),
+        None,
+    )
+
+    # placements made while collecting are handed over to be merged elsewhere
+    loaded.collect_added()
+    loaded.put("package", ("FIRSTPARTY", "reason"))
+    assert loaded.take_added() == {"package": (("FIRSTPARTY", "reason"), ())}
+    assert loaded.take_added() == {}
+
+    # unreadable or outdated cache files are ignored
+    tmpdir.join("broken.json").write("{")
+    loaded.load(str(tmpdir.join("broken.json")))
+    path.write_text(json.dumps({"version": "0", "directories": [], "placements": {"a": []}}))
+    loaded.load(path)
+    loaded.load(str(tmpdir.join("missing.json")))
+    assert loaded.loaded == 2
+
+
+@pytest.mark.parametrize(
+    "directories,placements",
+    (
+        ([], []),
+        ([], {"os": ["STDLIB", "reason"]}),
+        ([], {"os": ["STDLIB", "reason", [0]]}),
+        ([["src", None]], {"os": ["STDLIB", "reason", [-1]]}),
+        ([["src", None]], {"os": ["STDLIB", "reason", ["0"]]}),
+        ([["src", None]], {"os": ["STDLIB", "reason", None]}),
+        ([["src", None]], {"os": [None, "reason", []]}),
+        ([["src", "0"]], {"os": ["STDLIB", "reason", [0]]}),
+        ([[None, None]], {"os": ["STDLIB", "reason", [0]]}),
+        ([["src"]], {}),
+        ("src", {}),
+    ),
+)
+def test_malformed_placement_cache_is_discarded(tmpdir, directories, placements):
+    path = tmpdir.join("placements.json")
+    path.write(
+        json.dumps(
+            {
+                "version": isort.__version__,
+                "directories": directories,
+                "placements": {"sys": ["STDLIB", "reason", []], **placements}
+                if isinstance(placements, dict)
+                else placements,
+            }
+        )
+    )
+    placement_cache = cache.PlacementCache()
+    placement_cache.load(str(path))
+    assert placement_cache.loaded == len(placement_cache) == 0
+
+
+def test_sorted_blocks_are_reused(capsys):
+    config = Config(verbose=True)
+    code = "import sys\nimport os\n\n\ndef function():\n    import b, a\n"
+    cache.sorted_blocks.clear()
+    assert isort.code(code, config=config) == isort.code(code, config=config)
+    assert (cache.sorted_blocks.hits, cache.sorted_blocks.misses) == (2, 2)
+
+    # verbose output is repeated for blocks sorted from the cache
+    first, second = capsys.readouterr().out.split("else-type place_module for sys", 2)[1:]
+    assert first == second
+    assert first.count("place_module for") == 3
+
+
+def test_sorted_blocks_are_shared_between_files_with_different_code():
+    config = Config()
+    header = "import sys\nimport os\n"
+    codes = [
+        header + "value = 1\n",
+        header + "\ndef function():\n    pass\n",
+        header + "other_value = 2\n",
+        header + "\nclass Class:\n    pass\n",
+        header + "value = 'quoted'\n",
+    ]
+    expected = []
+    for code in codes:
+        cache.sorted_blocks.clear()
+        expected.append(isort.code(code, config=config))
+
+    cache.sorted_blocks.clear()
+    assert [isort.code(code, config=config) for code in codes] == expected
+    assert expected[2] == "import os\nimport sys\n\nother_value = 2\n"
+    assert expected[3] == "import os\nimport sys\n\n\nclass Class:\n    pass\n"
+    assert (cache.sorted_blocks.hits, cache.sorted_blocks.misses) == (2, 3)
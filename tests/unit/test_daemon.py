@@ -0,0 +1,186 @@
+import json
+import os
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+import pytest
+
+from isort import api, daemon
+
+pytestmark = pytest.mark.skipif(
+    sys.platform == "win32", reason="isortd serves requests over a Unix socket"
+)
+
+UNSORTED = "import sys\nimport os\n"
+SORTED = "import os\nimport sys\n"
+
+
+@pytest.fixture
+def server():
+    # Unix socket paths are limited to ~100 characters, so keep it short
+    socket_directory = tempfile.mkdtemp(prefix="isortd-")
+    socket_path = os.path.join(socket_directory, "test.sock")
+    with daemon.SortServer(socket_path) as sort_server:
+        thread = threading.Thread(target=sort_server.serve_forever)
+        thread.start()
+        try:
+            yield sort_server
+        finally:
+            sort_server.shutdown()
+            thread.join()
+    os.rmdir(socket_directory)
+
+
+def test_default_socket_path(monkeypatch):
+    monkeypatch.setenv("ISORTD_SOCKET", "/tmp/custom.sock")
+    assert daemon.default_socket_path() == "/tmp/custom.sock"
+    monkeypatch.delenv("ISORTD_SOCKET")
+    monkeypatch.setenv("XDG_RUNTIME_DIR", "/run/user/1000")
+    assert daemon.default_socket_path().startswith("/run/user/1000/isortd-")
+    monkeypatch.delenv("XDG_RUNTIME_DIR")
+    monkeypatch.setattr(tempfile, "gettempdir", lambda: "/tmp")
+    assert daemon.default_socket_path() == f"/tmp/isortd-{os.getuid()}/isortd.sock"
+
+
+def test_socket_ownership(server, tmpdir, monkeypatch):
+    socket_directory = os.path.dirname(server.socket_path)
+    assert os.stat(socket_directory).st_mode & 0o777 == 0o700
+    assert os.stat(server.socket_path).st_mode & 0o777 == 0o600
+    assert daemon.Client(server.socket_path).ping()
+
+    # sockets made by other users, or within directories others can write to, aren't trusted
+    monkeypatch.setattr(os, "getuid", lambda: os.stat(server.socket_path).st_uid + 1)
+    client = daemon.Client(server.socket_path)
+    assert not client.ping()
+    assert client.sort_code_string(UNSORTED) == SORTED  # sorted in-process instead
+    monkeypatch.undo()
+
+    os.chmod(socket_directory, 0o777)
+    try:
+        assert not daemon.Client(server.socket_path).ping()
+    finally:
+        os.chmod(socket_directory, 0o700)
+
+    shared = tmpdir.mkdir("shared")
+    shared.chmod(0o777)
+    with pytest.raises(OSError):
+        daemon.SortServer(str(shared.join("isortd.sock")))
+    with pytest.raises(SystemExit):
+        daemon.serve(str(shared.join("isortd.sock")))
+    private = str(tmpdir.join("private", "isortd.sock"))
+    with daemon.SortServer(private):
+        assert os.stat(os.path.dirname(private)).st_mode & 0o777 == 0o700
+
+    # isortd refuses to start rather than listen on anything but a Unix socket
+    monkeypatch.delattr(daemon.socket, "AF_UNIX")
+    with pytest.raises(OSError):
+        daemon.SortServer(private)
+    with pytest.raises(SystemExit):
+        daemon.serve(private)
+
+
+def test_client_without_daemon(tmpdir):
+    client = daemon.Client(str(tmpdir.join("missing.sock")))
+    assert not client.ping()
+    assert client.sort_code_string(UNSORTED) == SORTED
+    assert client.check_code_string(SORTED)
+    assert not client.check_code_string(UNSORTED, force_single_line=True)
+    assert client.find_edits_in_code(UNSORTED) == [(1, 2, SORTED)]
+
+
+def test_client_with_daemon(server, tmpdir, monkeypatch):
+    client = daemon.Client(server.socket_path)
+    assert client.ping()
+    assert client.sort_code_string(UNSORTED) == SORTED
+    assert not client.check_code_string(UNSORTED)
+    assert client.sort_code_string("from a import c, b\n", force_single_line=True) == (
+        "from a import b\nfrom a import c\n"
+    )
+    nested = "import sys\nimport os\n\n\ndef function():\n    import b\n    import a\n"
+    assert client.sort_code_string(nested, line_range=(6, 7)) == api.sort_code_string(
+        nested, line_range=(6, 7)
+    )
+    assert client.check_code_string(nested, line_range=(5, 5))
+    assert client.find_edits_in_code(nested) == api.find_edits_in_code(nested)
+    assert client.find_edits_in_code(SORTED) == []
+    assert server.respond(json.dumps({"code": UNSORTED, "edits": True}).encode("utf8")) == {
+        "edits": [[1, 2, SORTED]]
+    }
+
+    # configs are found relative to the file being sorted, and rebuilt when they change
+    monkeypatch.chdir(tmpdir)
+    project = tmpdir.mkdir("project")
+    project.mkdir(".git")
+    project.join("source.py").write("import os\nimport project\nimport requests\n")
+    source = Path(str(project.join("source.py")))
+    code = source.read_text()
+    assert client.sort_code_string(code, file_path=source) == api.sort_code_string(
+        code, file_path=source
+    )
+    project.join(".isort.cfg").write("[settings]\nknown_first_party=requests\n")
+    assert client.sort_code_string(code, file_path=source) == api.sort_code_string(
+        code, file_path=source
+    )
+    assert client.sort_code_string(code, file_path=source) == (
+        "import os\n\nimport project\nimport requests\n"
+    )
+    misses = server.config_cache.misses
+    assert client.check_code_string("import os\n", file_path=source)
+    assert server.config_cache.misses == misses
+
+    # modules added to the project are placed as first party from then on
+    code = "import widgets\nimport requests\nimport os\n"
+    assert client.sort_code_string(code, file_path=source) == (
+        "import os\n\nimport widgets\n\nimport requests\n"
+    )
+    project.join("widgets.py").write("")
+    modified = os.stat(str(project)).st_mtime_ns + 1_000_000_000
+    os.utime(str(project), ns=(modified, modified))
+    assert client.sort_code_string(code, file_path=source) == (
+        "import os\n\nimport requests\nimport widgets\n"
+    )
+
+    # errors are raised by sorting in-process
+    with pytest.raises(Exception):
+        client.sort_code_string(code, file_path=source.with_name("missing.py"))
+    client.close()
+
+
+def test_client_without_file_path(server, tmpdir, monkeypatch):
+    assert os.stat(server.socket_path).st_mode & 0o777 == 0o600
+
+    # as with isort.api, config files in the working directory are only read for a file path
+    monkeypatch.chdir(tmpdir)
+    tmpdir.join(".isort.cfg").write("[settings]\nforce_single_line=true\n")
+    client = daemon.Client(server.socket_path)
+    fallback = daemon.Client(str(tmpdir.join("missing.sock")))
+    code = "from a import c, b\n"
+    assert (
+        client.sort_code_string(code) == fallback.sort_code_string(code) == "from a import b, c\n"
+    )
+    assert client.sort_code_string(code) == api.sort_code_string(code)
+    assert client.sort_code_string(code, line_length=10) == fallback.sort_code_string(
+        code, line_length=10
+    )
+    assert client.sort_code_string(code, settings_path=str(tmpdir)) == (
+        "from a import b\nfrom a import c\n"
+    )
+    client.close()
+
+
+def test_client_main(server, tmpdir, capsys):
+    source = tmpdir.join("source.py")
+    source.write(UNSORTED)
+    arguments = ["--socket", server.socket_path]
+
+    with pytest.raises(SystemExit):
+        daemon.client_main(arguments + ["--check-only", str(source)])
+    assert "incorrectly sorted" in capsys.readouterr().err
+    assert source.read() == UNSORTED
+
+    daemon.client_main(arguments + [str(source)])
+    assert "Fixing" in capsys.readouterr().out
+    assert source.read() == SORTED
+    daemon.client_main(arguments + ["--check-only", str(source)])
@@ -1,6 +1,5 @@
 import importlib.machinery
 import os
-import posixpath
 from pathlib import Path
 from unittest.mock import patch
 
@@ -183,28 +182,37 @@ def test_pipfile_finder(tmpdir) -> None:
     pipfile.remove()
 
 
-def test_path_finder(monkeypatch) -> None:
-    config = config = Config()
-    finder = finders.PathFinder(config=config)
-    third_party_prefix = next(path for path in finder.paths if "site-packages" in path)
+def test_path_finder(tmpdir, monkeypatch) -> None:
+    stdlib = tmpdir.mkdir("stdlib")
+    stdlib.join("example_1.py").write("")
+    third_party_prefix = tmpdir.mkdir("venv").mkdir("lib").mkdir("python3").mkdir("site-packages")
+    third_party_prefix.join("example_2.py").write("")
+    tmpdir.join("example_3.py").write("")
     ext_suffixes = importlib.machinery.EXTENSION_SUFFIXES
-    imaginary_paths = {
-        posixpath.join(finder.stdlib_lib_prefix, "example_1.py"),
-        posixpath.join(third_party_prefix, "example_2.py"),
-        posixpath.join(os.getcwd(), "example_3.py"),
-    }
-    imaginary_paths.update(
-        {
-            posixpath.join(third_party_prefix, "example_" + str(i) + ext_suffix)
-            for i, ext_suffix in enumerate(ext_suffixes, 4)
-        }
-    )
-
+    for i, ext_suffix in enumerate(ext_suffixes, 4):
+        third_party_prefix.join("example_" + str(i) + ext_suffix).write("")
+    third_party_prefix.mkdir("example_package")
+    third_party_prefix.join("example_3.py").write("")  # the first path providing a module wins
     monkeypatch.setattr(
-        "isort.deprecated.finders.exists_case_sensitive", lambda p: p in imaginary_paths
+        "isort.deprecated.finders.sysconfig.get_paths", lambda: {"stdlib": str(stdlib)}
     )
+
+    config = Config(virtual_env=str(tmpdir.join("venv")))
+    finder = finders.PathFinder(config=config, path=str(tmpdir))
     assert finder.find("example_1") == sections.STDLIB
     assert finder.find("example_2") == sections.THIRDPARTY
     assert finder.find("example_3") == settings.DEFAULT_CONFIG.default_section
     for i, _ in enumerate(ext_suffixes, 4):
         assert finder.find("example_" + str(i)) == sections.THIRDPARTY
+    assert finder.find("example_package.module") == sections.THIRDPARTY
+    assert finder.find("Example_2") is None
+    assert finder.find("missing") is None
+
+    # modules added to a path are found by finders created after it was modified
+    third_party_prefix.join("example_added.py").write("")
+    modified = third_party_prefix.stat().mtime_ns + 1_000_000
+    os.utime(str(third_party_prefix), ns=(modified, modified))
+    assert finder.find("example_added") is None
+    assert finders.PathFinder(config=config, path=str(tmpdir)).find("example_added") == (
+        sections.THIRDPARTY
+    )
@@ -0,0 +1,123 @@
+import os
+import subprocess
+
+import pytest
+
+from isort import gitignore
+
+IGNORE_RULES = """
+# comment
+*.log
+!keep.log
+/build
+docs/_generated/
+**/cache/**
+deep/**/leaf.py
+lib/*/private.py
+file[0-9].py
+\\#hash.py
+\\!bang.py
+trailing.py   
+vendored/
+!vendored/allowed.py
+"""  # noqa: W291
+
+PATHS = (
+    "a.py",
+    "debug.log",
+    "keep.log",
+    "sub/debug.log",
+    "sub/keep.log",
+    "build/a.py",
+    "sub/build/a.py",
+    "docs/_generated/a.py",
+    "docs/_generated",
+    "sub/cache/a.py",
+    "cache/sub/a.py",
+    "deep/leaf.py",
+    "deep/a/b/leaf.py",
+    "other/deep/leaf.py",
+    "lib/x/private.py",
+    "lib/x/y/private.py",
+    "file1.py",
+    "fileA.py",
+    "#hash.py",
+    "!bang.py",
+    "trailing.py",
+    "vendored/a.py",
+    "vendored/allowed.py",
+    "nested/a.py",
+    "nested/ignored_here.py",
+    "nested/inner/ignored_here.py",
+    "nested/local.log",
+    "excluded.py",
+)
+
+
+def test_parse_rules():
+    rules = gitignore.parse_rules(["# comment", "", "!keep.log", "/build/", "*.py"])
+    assert [(negated, directories_only) for _, negated, directories_only in rules] == [
+        (True, False),
+        (False, True),
+        (False, False),
+    ]
+    assert gitignore.parse_rules(["*.PY"], ignore_case=True)[0][0].match("a.py")
+    assert not gitignore.parse_rules(["*.PY"])[0][0].match("a.py")
+
+
+def test_gitignore_matches_git(tmpdir):
+    if subprocess.run(["git", "init", str(tmpdir)], stdout=subprocess.DEVNULL).returncode:
+        pytest.skip("git is not available")  # pragma: no cover
+
+    tmpdir.join(".gitignore").write(IGNORE_RULES)
+    tmpdir.mkdir("nested").join(".gitignore").write("ignored_here.py\n!local.log\n")
+    tmpdir.join(".git", "info").ensure(dir=True).join("exclude").write("excluded.py\n")
+    for path in PATHS:
+        if path != "docs/_generated":
+            tmpdir.join(*path.split("/")).ensure()
+
+    matcher = gitignore.GitIgnore()
+    for path in PATHS:
+        expected = (
+            subprocess.run(
+                ["git", "-C", str(tmpdir), "check-ignore", "--quiet", path],
+                env={**os.environ, "GIT_CONFIG_NOSYSTEM": "1"},
+            ).returncode
+            == 0
+        )
+        assert matcher.is_ignored(str(tmpdir.join(*path.split("/")))) == expected, path
+
+    assert not matcher.is_ignored(os.path.dirname(str(tmpdir)))
+
+
+def test_gitignore_never_ignores_tracked_files(tmpdir):
+    if subprocess.run(["git", "init", str(tmpdir)], stdout=subprocess.DEVNULL).returncode:
+        pytest.skip("git is not available")  # pragma: no cover
+
+    tmpdir.join(".gitignore").write("*.log\n/build\n/other\n")
+    for path in (
+        "tracked.log",
+        "untracked.log",
+        "build/tracked.py",
+        "build/untracked.py",
+        "other/a.py",
+    ):
+        tmpdir.join(*path.split("/")).ensure()
+    subprocess.run(
+        ["git", "-C", str(tmpdir), "add", "--force", "tracked.log", "build/tracked.py"], check=True
+    )
+
+    matcher = gitignore.GitIgnore()
+    for path, ignored in (
+        ("tracked.log", False),
+        ("untracked.log", True),
+        ("build/tracked.py", False),
+        ("build/untracked.py", True),
+        ("build", False),
+        ("other", True),
+    ):
+        assert (
+            subprocess.run(["git", "-C", str(tmpdir), "check-ignore", "--quiet", path]).returncode
+            == 0
+        ) == ignored, path
+        assert matcher.is_ignored(str(tmpdir.join(*path.split("/")))) == ignored, path
@@ -10,10 +10,13 @@ def test_importable():
     import isort._future._dataclasses
     import isort._version
     import isort.api
+    import isort.cache
     import isort.comments
+    import isort.daemon
     import isort.deprecated.finders
     import isort.exceptions
     import isort.format
+    import isort.gitignore
     import isort.hooks
     import isort.logo
     import isort.main
@@ -34,7 +37,9 @@ def test_importable():
     import isort.stdlibs.py35
     import isort.stdlibs.py36
     import isort.stdlibs.py37
+    import isort.timings
     import isort.utils
+    import isort.watch
     import isort.wrap
     import isort.wrap_modes
 
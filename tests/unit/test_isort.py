@@ -4976,3 +4976,29 @@ def test_get_imports_stdout() -> None:
     test_output = NonSeekableTestStream()
     api.get_imports_stream(test_input, test_output)
     assert "".join(global_output) == "import m2\nimport m1\n"
+
+
+def test_code_after_last_import_is_output_unchanged() -> None:
+    """Ensure skipping ahead past the last import or isort comment doesn't change the output."""
+    trailing_code = "\n\ndef function():\n    return 'from and import in a string'\n" * 50
+    assert isort.code("import b\nimport a\n" + trailing_code) == (
+        "import a\nimport b\n" + trailing_code
+    )
+    assert isort.code(trailing_code) == trailing_code
+    assert isort.code(trailing_code + "\n\ndef nested():\n    import b, a\n") == (
+        trailing_code + "\n\ndef nested():\n    import a\n    import b\n"
+    )
+    assert isort.code("import a\n" + trailing_code + "# isort: list\nvalues = ['b', 'a']\n") == (
+        "import a\n" + trailing_code + "# isort: list\nvalues = ['a', 'b']\n"
+    )
+    with pytest.raises(FileSkipped):
+        isort.code("import b\nimport a\n" + trailing_code + "# isort: skip_file\n")
+    assert isort.check_code("import a\nimport b\n" + trailing_code)
+    assert not isort.check_code("import a\n" + trailing_code + "import c\nimport b\n")
+
+
+def test_float_to_top_keeps_blank_lines_between_split_chunks() -> None:
+    test_input = "import b\nx = 1\nimport a\n\n\n\n# isort: split\nimport d\ny = 2\nimport c\n"
+    assert isort.code(test_input, float_to_top=True) == (
+        "import a\nimport b\n\nx = 1\n\n\n\n# isort: split\nimport c\nimport d\n\ny = 2\n"
+    )
@@ -1,15 +1,19 @@
 import json
 import os
+import re
 import subprocess
+import sys
 from datetime import datetime
 from io import BytesIO, TextIOWrapper
+from typing import List
 
 import pytest
 from hypothesis import given
 from hypothesis import strategies as st
 
-from isort import main
+from isort import main, settings
 from isort._version import __version__
+from isort.cache import sorted_blocks
 from isort.exceptions import InvalidSettingsPath
 from isort.settings import DEFAULT_CONFIG, Config
 from isort.wrap_modes import WrapModes
@@ -927,3 +931,351 @@ def test_identify_imports_main(tmpdir, capsys):
 
     out, error = capsys.readouterr()
     assert out == file_imports.replace("\n", os.linesep)
+
+
+def test_cache_dir(tmpdir, capsys, mocker):
+    cache_dir = tmpdir.join("cache")
+    sorted_file = tmpdir.join("sorted.py")
+    sorted_file.write("import os\nimport sys\n")
+    unsorted_file = tmpdir.join("unsorted.py")
+    unsorted_file.write("import sys\nimport abc\n")
+    args = [str(sorted_file), str(unsorted_file), "--cache-dir", str(cache_dir), "--check-only"]
+
+    with pytest.raises(SystemExit):
+        main.main(args)
+    out, error = capsys.readouterr()
+    assert "unsorted.py Imports are incorrectly sorted" in error
+
+    # files that were previously found sorted are not processed again
+    check_file = mocker.spy(main.api, "check_file")
+    with pytest.raises(SystemExit):
+        main.main(args + ["--verbose"])
+    out, error = capsys.readouterr()
+    assert "1 files unchanged since they were last found sorted, 1 files processed" in out
+    assert check_file.call_count == 1
+    assert check_file.call_args[0][0] == str(unsorted_file)
+
+    # once sorted, a file is remembered as such
+    main.main([str(unsorted_file), "--cache-dir", str(cache_dir)])
+    main.main(args)
+    main.main(args + ["--verbose"])
+    out, error = capsys.readouterr()
+    assert "2 files unchanged since they were last found sorted, 0 files processed" in out
+    assert check_file.call_count == 2
+
+    # changing either the config or the file contents invalidates the cached result
+    main.main(args + ["--line-length", "100"])
+    assert check_file.call_count == 4
+    sorted_file.write("import sys\nimport os\n")
+    with pytest.raises(SystemExit):
+        main.main(args)
+    assert check_file.call_count == 5
+
+
+@pytest.mark.parametrize("jobs", ([], ["--jobs", "2"]))
+def test_cache_dir_placements(tmpdir, capsys, jobs):
+    src = tmpdir.mkdir("src")
+    src.mkdir("package").join("__init__.py").write("")
+    source = tmpdir.join("source.py")
+    source.write("import os\nimport package\n")
+    args = [str(source), "--src", str(src), "--cache-dir", str(tmpdir.join("cache")), "--verbose"]
+
+    main.main(args + jobs)
+    out, error = capsys.readouterr()
+    assert "0 module placements were loaded from earlier runs, 2 were made" in out
+
+    # placements are reused by later runs while the src_paths they were made from are unchanged
+    source.write("import package\nimport os\n")
+    main.main(args + jobs)
+    out, error = capsys.readouterr()
+    if not jobs:  # the output of worker processes isn't captured
+        assert "place_module for package returned FIRSTPARTY (placed by an earlier run)" in out
+    assert "2 module placements were loaded from earlier runs, 0 were made" in out
+    assert source.read() == "import os\n\nimport package\n"
+
+    src.join("added.py").write("")
+    os.utime(str(src), ns=(src.stat().mtime_ns + 1_000_000,) * 2)
+    source.write("import package\nimport os\n")
+    main.main(args + jobs)
+    out, error = capsys.readouterr()
+    assert "1 module placements were loaded from earlier runs, 1 were made" in out
+
+
+def test_chunk_file_names():
+    file_names = [f"file{index}.py" for index in range(20)]
+    chunks = list(main._chunk_file_names(file_names, jobs=2, max_chunk_size=4))
+    assert [len(chunk) for chunk in chunks] == [1, 1, 2, 2, 4, 4, 4, 2]
+    assert [file_name for chunk in chunks for file_name in chunk] == file_names
+    assert list(main._chunk_file_names([], jobs=2)) == []
+
+
+def test_sort_imports_chunk(tmpdir):
+    sorted_file = tmpdir.join("sorted.py")
+    sorted_file.write("import os\nimport sys\n")
+    unsorted_file = tmpdir.join("unsorted.py")
+    unsorted_file.write("import sys\nimport os\n")
+
+    main._init_worker(Config(), {"check": True})
+    sorted_blocks.clear()
+    results, busy_time, chunk_timings, block_counts, placements = main._sort_imports_chunk(
+        [str(sorted_file), str(unsorted_file), str(sorted_file)]
+    )
+    assert results == [(False, False, True), (True, False, True), (False, False, True)]
+    assert busy_time >= 0
+    assert chunk_timings is None
+    assert block_counts == (1, 2)
+    assert placements is None
+
+    # when collecting them, the placements made within the chunk are returned
+    main._init_worker(Config(), {"check": True}, collect_placements=True)
+    placements = main._sort_imports_chunk([str(unsorted_file)])[-1]
+    assert placements == {
+        "os": (("STDLIB", "Matched configured known pattern re.compile('^os$')"), ()),
+        "sys": (("STDLIB", "Matched configured known pattern re.compile('^sys$')"), ()),
+    }
+    assert main._sort_imports_chunk([str(unsorted_file)])[-1] == {}
+
+
+def test_jobs(tmpdir, capsys):
+    for index in range(10):
+        tmpdir.join(f"file{index}.py").write("import sys\nimport os\n")
+
+    main.main([str(tmpdir), "--jobs", "2", "--verbose"])
+    out, error = capsys.readouterr()
+    assert "2 worker processes were busy" in out
+    reused, sorted_afresh = re.search(
+        r"(\d+) import blocks were reused from earlier files, (\d+) were sorted", out
+    ).groups()
+    assert int(reused) + int(sorted_afresh) == 10
+    assert int(sorted_afresh) <= 2
+    for index in range(10):
+        assert tmpdir.join(f"file{index}.py").read() == "import os\nimport sys\n"
+    main.main([str(tmpdir), "--jobs", "2", "--check-only"])
+
+
+def test_sorted_block_cache_summary(tmpdir, capsys):
+    for index in range(3):
+        tmpdir.join(f"file{index}.py").write(f"import sys\nimport os\n\nvalue = {index}\n")
+
+    main.main([str(tmpdir), "--verbose"])
+    out, error = capsys.readouterr()
+    assert "2 import blocks were reused from earlier files, 1 were sorted" in out
+
+
+def test_iter_source_code_walks_tree(tmpdir):
+    tmpdir.join("a.py").write("import os\n")
+    tmpdir.join("README.md").write("# readme\n")
+    package = tmpdir.mkdir("package")
+    package.join("b.py").write("import os\n")
+    nested = package.mkdir("nested")
+    nested.join("c.pyi").write("import os\n")
+    tmpdir.mkdir("build").join("d.py").write("import os\n")
+    skipped: List[str] = []
+    broken: List[str] = []
+
+    source_files = list(
+        main.iter_source_code(
+            [str(tmpdir), str(tmpdir.join("missing.py"))], DEFAULT_CONFIG, skipped, broken
+        )
+    )
+    assert sorted(source_files) == sorted(
+        [str(tmpdir.join("a.py")), str(package.join("b.py")), str(nested.join("c.pyi"))]
+    )
+    # directories are walked depth first, with files found before those in subdirectories
+    assert source_files.index(str(package.join("b.py"))) < source_files.index(
+        str(nested.join("c.pyi"))
+    )
+    assert skipped == ["build"]
+    assert broken == [str(tmpdir.join("missing.py"))]
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="symlinks need elevated rights on Windows")
+def test_iter_source_code_symlink_loop(tmpdir):
+    package = tmpdir.mkdir("package")
+    package.join("a.py").write("import os\n")
+    os.symlink(str(tmpdir), str(package.join("loop")))
+
+    with pytest.warns(UserWarning, match="Likely recursive symlink"):
+        source_files = list(main.iter_source_code([str(tmpdir)], DEFAULT_CONFIG, [], []))
+    assert source_files == [str(package.join("a.py"))]
+
+
+def test_watch(tmpdir, mocker):
+    source = tmpdir.join("source.py")
+    source.write("import sys\nimport os\n")
+    watch = mocker.patch("isort.watch.watch")
+
+    main.main([str(tmpdir), "--watch"])
+    assert source.read() == "import os\nimport sys\n"
+    paths, config = watch.call_args[0][:2]
+    assert paths == [str(tmpdir)]
+
+    # changed files are processed with the same options as the initial run
+    source.write("import sys\nimport os\n")
+    watch.call_args[0][2](str(source))
+    assert source.read() == "import os\nimport sys\n"
+
+    with pytest.raises(SystemExit):
+        main.main(["-", "--watch"])
+
+
+def test_changed_since(tmpdir, tmpdir_factory, capsys):
+    def git(*arguments, directory=tmpdir):
+        subprocess.run(
+            ["git", "-C", str(directory), "-c", "user.name=isort", "-c", "user.email=isort@test"]
+            + list(arguments),
+            check=True,
+            stdout=subprocess.DEVNULL,
+        )
+
+    git("init")
+    package = tmpdir.mkdir("package")
+    for name in ("modified.py", "unchanged.py", "renamed.py", "deleted.py"):
+        package.join(name).write(f"import sys\nimport os\n# {name}\n")
+    tmpdir.mkdir("build").join("modified.py").write("import sys\nimport os\n")
+    git("add", ".")
+    git("commit", "-m", "initial")
+
+    package.join("modified.py").write("import sys\nimport os\n# changed\n")
+    tmpdir.join("build", "modified.py").write("import sys\nimport os\n# changed\n")
+    package.join("untracked.py").write("import sys\nimport os\n")
+    package.join("notes.txt").write("notes")
+    git("mv", "package/renamed.py", "package/moved.py")
+    git("rm", "-q", "package/deleted.py")
+
+    skipped: List[str] = []
+    broken: List[str] = []
+    source_files = main.iter_changed_source_code(
+        [str(tmpdir), str(tmpdir.join("missing.py"))], DEFAULT_CONFIG, "HEAD", skipped, broken
+    )
+    assert sorted(source_files) == [
+        str(package.join("modified.py")),
+        str(package.join("moved.py")),
+        str(package.join("untracked.py")),
+    ]
+    assert skipped == ["build"]
+    assert broken == [str(tmpdir.join("missing.py"))]
+    assert list(
+        main.iter_changed_source_code(
+            [str(package.join("unchanged.py")), str(package.join("untracked.py"))],
+            DEFAULT_CONFIG,
+            "HEAD",
+            [],
+            [],
+        )
+    ) == [str(package.join("untracked.py"))]
+
+    with pytest.raises(SystemExit):
+        main.main([str(tmpdir), "--changed-since", "HEAD", "--check-only"])
+    out, error = capsys.readouterr()
+    assert "modified.py Imports are incorrectly sorted" in error
+    assert "unchanged.py" not in error
+
+    main.main([str(tmpdir), "--changed-since", "HEAD", "--jobs", "2"])
+    assert package.join("untracked.py").read() == "import os\nimport sys\n"
+    assert package.join("unchanged.py").read() == "import sys\nimport os\n# unchanged.py\n"
+
+    with pytest.raises(SystemExit):
+        main.main([str(tmpdir), "--changed-since", "no-such-ref"])
+
+    # git is asked about each repository the paths are within
+    other = tmpdir_factory.mktemp("other")
+    git("init", directory=other)
+    other.join("committed.py").write("import sys\n")
+    git("add", ".", directory=other)
+    git("commit", "-m", "initial", directory=other)
+    other.join("untracked.py").write("import sys\n")
+    assert list(
+        main.iter_changed_source_code(
+            [str(package.join("untracked.py")), str(other.join("untracked.py")), str(other)],
+            DEFAULT_CONFIG,
+            "HEAD",
+            [],
+            [],
+        )
+    ) == [str(package.join("untracked.py")), str(other.join("untracked.py"))]
+
+    # and paths outside of any repository are reported rather than left out
+    outside = tmpdir_factory.mktemp("outside").join("outside.py")
+    outside.write("import sys\n")
+    with pytest.raises(SystemExit) as error:
+        main.main([str(tmpdir), str(outside), "--changed-since", "HEAD"])
+    assert "unable to determine files changed since HEAD" in str(error.value)
+
+
+@pytest.mark.parametrize("jobs", ([], ["--jobs", "2"]))
+def test_resolve_all_configs(tmpdir, jobs):
+    tmpdir.join(".isort.cfg").write("[settings]\nforce_single_line=true\n")
+    nested = tmpdir.mkdir("nested")
+    nested.mkdir(".git")
+    nested.join(".isort.cfg").write("[settings]\nprofile=black\n")
+    code = "from a import b, c\n"
+    tmpdir.join("root.py").write(code)
+    nested.join("nested.py").write(code)
+
+    cache_dir = str(tmpdir.join(".cache"))
+    main.main([str(tmpdir), "--resolve-all-configs", "--cache-dir", cache_dir] + jobs)
+    assert tmpdir.join("root.py").read() == "from a import b\nfrom a import c\n"
+    assert nested.join("nested.py").read() == code
+
+    # cached results are only reused while the config of each file is unchanged
+    nested.join(".isort.cfg").write("[settings]\nprofile=black\nforce_single_line=true\n")
+    settings._find_config.cache_clear()  # as would be the case in a new isort process
+    settings._get_config_data.cache_clear()
+    main.main([str(tmpdir), "--resolve-all-configs", "--cache-dir", cache_dir] + jobs)
+    assert nested.join("nested.py").read() == "from a import b\nfrom a import c\n"
+
+    with pytest.raises(SystemExit):
+        main.main([str(tmpdir), "--resolve-all-configs", "--settings-path", str(tmpdir)])
+
+
+@pytest.mark.parametrize("jobs", [[], ["--jobs", "2"]])
+def test_timings(tmpdir, capsys, jobs):
+    tmpdir.join("one.py").write("import sys\nimport os\n")
+    tmpdir.join("two.py").write("from a import " + ", ".join(f"name{i}" for i in range(40)) + "\n")
+    report_path = str(tmpdir.join("timings.json"))
+
+    main.main([str(tmpdir), "--timings-report", report_path, "--timings-slowest", "1"] + jobs)
+    summary = capsys.readouterr().err
+    for phase in ("discovery", "read", "scan", "parse", "place", "output", "wrap", "write"):
+        assert f"\n{phase} " in summary
+    assert "Processed 2 files" in summary
+
+    report = json.loads(tmpdir.join("timings.json").read())
+    assert report["files"] == 2
+    assert report["phases"]["place"]["calls"] >= 2
+    if not jobs:  # phases partition the time spent, but are summed across workers
+        assert sum(phase["seconds"] for phase in report["phases"].values()) <= report["wall_time"]
+    (slowest,) = report["slowest_files"]
+    assert slowest["file"] in (str(tmpdir.join("one.py")), str(tmpdir.join("two.py")))
+    assert slowest["seconds"] >= sum(slowest["phases"].values()) * 0.99
+
+    # timings are only collected when asked for
+    main.main([str(tmpdir), "--check-only"] + jobs)
+    assert "Phase" not in capsys.readouterr().err
+
+
+@pytest.mark.parametrize("jobs", ([], ["--jobs", "2"]))
+def test_line_range(tmpdir, capsys, jobs):
+    assert main.parse_args(["--line-range", "3-7"]) == {"line_range": (3, 7)}
+    assert main.parse_args(["--line-range", "3"]) == {"line_range": (3, 3)}
+    for invalid in ("7-3", "0-2", "a-b"):
+        with pytest.raises(SystemExit):
+            main.parse_args(["--line-range", invalid])
+    assert "isn't a range of lines" in capsys.readouterr().err
+
+    code = "import sys\nimport os\n\n\ndef function():\n    import b\n    import a\n"
+    source = tmpdir.join("source.py")
+    source.write(code)
+    main.main([str(source), "--line-range", "6-6", "--cache-dir", str(tmpdir)] + jobs)
+    assert source.read() == code.replace("import b\n    import a", "import a\n    import b")
+    # only the sorted range is checked, so the file isn't remembered as sorted
+    with pytest.raises(SystemExit):
+        main.main([str(source), "--check-only", "--cache-dir", str(tmpdir)] + jobs)
+    capsys.readouterr()
+
+    main.main(
+        ["-", "--line-range", "1-2"], stdin=UnseekableTextIOWrapper(BytesIO(code.encode("utf8")))
+    )
+    out, _ = capsys.readouterr()
+    assert out == code.replace("import sys\nimport os", "import os\nimport sys")
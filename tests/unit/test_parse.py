@@ -46,6 +46,16 @@ def test_file_contents():
     assert original_line_count == len(in_lines)
 
 
+def test_track_quotes():
+    assert parse.track_quotes("import os") == ""
+    assert parse.track_quotes("x = \"one\" + 'two'") == ""
+    assert parse.track_quotes('x = """start') == '"""'
+    assert parse.track_quotes('end""" + "open', '"""') == '"'
+    assert parse.track_quotes("still \\' within", "'") == "'"
+    assert parse.track_quotes("x = 1  # it's a comment") == ""
+    assert parse.track_quotes("# it's within a string", "'") == ""
+
+
 # These tests were written by the `hypothesis.extra.ghostwriter` module
 # and is provided under the Creative Commons Zero public domain dedication.
 
@@ -80,3 +90,8 @@ def test_fuzz_skip_line(line, in_quote, index, section_comments, needs_import):
         section_comments=section_comments,
         needs_import=needs_import,
     )
+
+
+@given(line=st.text(), in_quote=st.text())
+def test_fuzz_track_quotes(line, in_quote):
+    parse.track_quotes(line=line, in_quote=in_quote)
@@ -1,4 +1,8 @@
 """Tests for the isort import placement module"""
+import gc
+import os
+import pickle
+import weakref
 from functools import partial
 
 from isort import place, sections
@@ -54,3 +58,135 @@ def test_namespace_package_placement(examples_path):
         assert place.module("root.nested", config=config) == "FIRSTPARTY"
         assert place.module("root.name", config=manual_namespace) == "THIRDPARTY"
         assert place.module("root.nested", config=config) == "FIRSTPARTY"
+
+
+def test_modules(src_path, examples_path):
+    config = Config(src_paths=[src_path])
+    names = ["isort", "os", "isort.place", ".deprecated", "hug", "os", "isort.settings"]
+    placements = place.modules(names, config=config)
+    assert placements == {
+        "isort": sections.FIRSTPARTY,
+        "os": sections.STDLIB,
+        "isort.place": sections.FIRSTPARTY,
+        ".deprecated": sections.LOCALFOLDER,
+        "hug": sections.THIRDPARTY,
+        "isort.settings": sections.FIRSTPARTY,
+    }
+    assert list(placements) == [
+        "isort",
+        "os",
+        "isort.place",
+        ".deprecated",
+        "hug",
+        "isort.settings",
+    ]
+    assert place.modules([], config=config) == {}
+
+    # Modules of a namespace package are still placed one by one
+    config = Config(settings_path=examples_path / "namespaces" / "implicit")
+    assert place.modules(["root.name", "root.nested"], config=config) == {
+        "root.name": sections.THIRDPARTY,
+        "root.nested": sections.FIRSTPARTY,
+    }
+
+
+def test_known_pattern_precedence():
+    config = Config(
+        known_first_party=["project", "project.vendored.*", "lib?", "odd+name"],
+        known_third_party=["project.*", "lib*", "os.path"],
+    )
+    place_tester = partial(place.module, config=config)
+    # The longest matching prefix of a name decides its placement
+    assert place_tester("project") == sections.FIRSTPARTY
+    assert place_tester("project.module") == sections.THIRDPARTY
+    assert place_tester("project.vendored.module") == sections.FIRSTPARTY
+    # Between sections, the one checked first wins whether its pattern is a name or a glob
+    assert place_tester("lib1") == sections.FIRSTPARTY
+    assert place_tester("lib12") == sections.THIRDPARTY
+    # Patterns that aren't names or globs are kept as the regexes they were
+    assert place_tester("odddname") == sections.FIRSTPARTY
+    assert place_tester("odd+name") == sections.THIRDPARTY
+    assert place_tester("os.path") == sections.THIRDPARTY
+    assert place.module_with_reason("lib1", config=config) == (
+        sections.FIRSTPARTY,
+        "Matched configured known pattern re.compile('^lib.?$')",
+    )
+
+
+def test_forced_separate():
+    config = Config(forced_separate=["django.contrib", "django.*", "tests"])
+    place_tester = partial(place.module, config=config)
+    # The first matching pattern wins, with patterns also matching a module name after a dot
+    assert place_tester("django.contrib.auth") == "django.contrib"
+    assert place_tester("django.db") == "django.*"
+    assert place_tester(".tests.unit") == "tests"
+    assert place_tester("testsuite") == "tests"
+    assert place_tester("django") == sections.THIRDPARTY
+    assert place.module_with_reason("tests", config=config) == (
+        "tests",
+        "Matched forced_separate (tests) config value.",
+    )
+
+
+def test_refresh_src_paths(tmpdir):
+    place.refresh_src_paths()  # Forget any directories earlier tests removed
+    config = Config(src_paths=[str(tmpdir)])
+    assert place.module("widgets", config=config) == sections.THIRDPARTY
+    assert not place.refresh_src_paths()
+
+    tmpdir.join("widgets.py").write("")
+    modified = os.stat(str(tmpdir)).st_mtime_ns + 1_000_000_000
+    os.utime(str(tmpdir), ns=(modified, modified))
+    assert place.module("widgets", config=config) == sections.THIRDPARTY  # Still cached
+    # without a refresh, as when using the API, new configs see the directory as it is now
+    assert place.module("widgets", config=Config(src_paths=[str(tmpdir)])) == sections.FIRSTPARTY
+    assert place.refresh_src_paths()
+    assert place.module("widgets", config=config) == sections.FIRSTPARTY
+    assert place.module("widgets.parts", config=config) == sections.FIRSTPARTY
+    assert not place.refresh_src_paths()
+
+
+def test_placement_cache():
+    config = Config()
+    placement_cache = place.placement_cache(config)
+    assert place.placement_cache(config) is placement_cache
+    assert place.module("os", config=config) == sections.STDLIB
+    assert place.module("os", config=config) == sections.STDLIB
+    assert (placement_cache.hits, placement_cache.misses) == (1, 1)
+    assert place.modules(["os", "requests", "requests"], config=config) == {
+        "os": sections.STDLIB,
+        "requests": sections.THIRDPARTY,
+    }
+    assert (placement_cache.hits, placement_cache.misses) == (2, 2)
+
+    # equal configs, including copies, place modules separately
+    assert len(place.placement_cache(Config())) == 0
+    assert len(place.placement_cache(Config(config=config))) == 0
+
+    # the placements made so far go with a config sent to another process
+    assert len(place.placement_cache(pickle.loads(pickle.dumps(config)))) == 2
+
+    # and placements can be seeded, such as from an earlier run
+    placement_cache.update({"requests": (sections.FIRSTPARTY, "Seeded")})
+    assert place.module_with_reason("requests", config=config) == (sections.FIRSTPARTY, "Seeded")
+
+
+def test_config_indexes_last_as_long_as_the_config(tmpdir):
+    tmpdir.join("widgets.py").ensure()
+    config = Config(src_paths=[str(tmpdir)], forced_separate=["django"], known_third_party=["a"])
+    assert place.module("django.contrib", config=config) == "django"
+    assert place.module("a", config=config) == sections.THIRDPARTY
+    assert place.module("widgets", config=config) == sections.FIRSTPARTY
+    placement_cache = place.placement_cache(config)
+    assert set(placement_cache.indexes) == {"_forced_separate_pattern", "_known_patterns"}
+    assert "widgets" in placement_cache.packages
+
+    # where packages are is forgotten alongside the placements, the config's indexes are kept
+    placement_cache.clear()
+    assert not placement_cache.packages and len(placement_cache.indexes) == 2
+
+    # and nothing is left behind once the config is gone
+    config_reference = weakref.ref(config)
+    del config, placement_cache
+    gc.collect()
+    assert config_reference() is None
@@ -45,6 +45,59 @@ class TestConfig:
         assert Config().is_skipped(Path("C:\\path\\isort.py"))
         assert Config(skip=["/path/isort.py"]).is_skipped(Path("C:\\path\\isort.py"))
 
+    def test_is_skipped_entry(self, tmpdir, monkeypatch):
+        generated = tmpdir.mkdir("pkg").mkdir("generated")
+        generated.join("module.py").write("import os\n")
+        tmpdir.join("pkg", "other.py").write("import os\n")
+        tmpdir.join("pkg", "linked").mksymlinkto(generated)
+        config = Config(directory=str(tmpdir), skip_glob=["pkg/generated*"])
+        directory = os.path.join(str(tmpdir), "pkg")
+        expected = {
+            name: config.is_skipped(Path(directory, name))
+            for name in ("generated", "other.py", "linked")
+        }
+        assert expected == {"generated": True, "other.py": False, "linked": True}
+
+        # entries found walking a tree are neither resolved, unless symlinks, nor checked to exist
+        monkeypatch.setattr(Path, "resolve", None)
+        monkeypatch.setattr(os.path, "isfile", None)
+        with os.scandir(directory) as entries:
+            assert {
+                entry.name: config.is_skipped_entry(entry, os.path.realpath(directory))
+                for entry in entries
+            } == expected
+
+    def test_is_skipped_compiled_settings(self, tmpdir, monkeypatch):
+        source = tmpdir.mkdir("pkg").mkdir("generated").join("module.py")
+        source.write("import os\n")
+        other = tmpdir.join("pkg", "other.py")
+        other.write("import os\n")
+        monkeypatch.chdir(tmpdir)
+        relative = Path("pkg", "generated", "module.py")
+
+        config = Config(directory=str(tmpdir))
+        assert not config.is_skipped(relative)
+        assert not config.is_skipped(Path(str(source)))
+
+        config = Config(directory=str(tmpdir), skip=["generated"])
+        assert config.is_skipped(relative)
+        assert config.is_skipped(Path(str(source)))
+        assert not config.is_skipped(Path(str(other)))
+
+        for skip in ("pkg/generated/module.py", "./pkg/generated/../generated/module.py"):
+            config = Config(skip=[skip])
+            assert config.is_skipped(relative)
+            assert config.is_skipped(Path("..", tmpdir.basename, relative))
+            assert config.is_skipped(Path(str(source)))
+            assert not config.is_skipped(Path(str(other)))
+        assert Config(skip=[str(source)]).is_skipped(relative)
+
+        config = Config(directory=str(tmpdir), skip_glob=["pkg/gen*", "*/other.py"])
+        assert config.is_skipped(Path(str(source)))
+        assert config.is_skipped(Path(str(other)))
+        assert not Config(directory=str(tmpdir), skip_glob=["gen*"]).is_skipped(relative)
+        assert Config(skip_glob=["*generated*"]).is_skipped(relative)
+
     def test_is_supported_filetype(self):
         assert self.instance.is_supported_filetype("file.py")
         assert self.instance.is_supported_filetype("file.pyi")
@@ -198,3 +251,37 @@ def test_as_bool():
         settings._as_bool("falsey")
     with pytest.raises(ValueError):
         settings._as_bool("truthy")
+
+
+def test_config_resolver(tmpdir):
+    tmpdir.mkdir(".git")
+    tmpdir.join(".isort.cfg").write("[settings]\nline_length=100\n")
+    nested = tmpdir.mkdir("nested")
+    nested.join("setup.cfg").write("[isort]\nprofile=black\n")
+    unconfigured = nested.mkdir("package").mkdir("subpackage")
+    tmpdir.mkdir("docs").join("setup.cfg").write("[metadata]\nname=docs\n")
+
+    resolver = settings.ConfigResolver(force_single_line=True)
+    root_config = resolver.config_for(str(tmpdir.join("a.py")))
+    assert root_config.line_length == 100
+    assert root_config.force_single_line
+    nested_config = resolver.config_for(str(unconfigured.join("b.py")))
+    assert nested_config.profile == "black"
+    assert nested_config.line_length == 88
+    assert nested_config.force_single_line
+    assert resolver.config_for(str(nested.join("c.py"))) is nested_config
+    # config files without isort settings are passed over
+    assert resolver.config_for(str(tmpdir.join("docs", "d.py"))) is root_config
+    assert resolver.configs == [root_config, nested_config]
+
+
+def test_config_resolver_deduplicates_configs(tmpdir):
+    for name in ("one", "two"):
+        project = tmpdir.mkdir(name)
+        project.mkdir(".git")
+        project.join(".isort.cfg").write("[settings]\nprofile=google\n")
+
+    resolver = settings.ConfigResolver(directory=str(tmpdir))
+    config = resolver.config_for(str(tmpdir.join("one", "a.py")))
+    assert resolver.config_for(str(tmpdir.join("two", "a.py"))) is config
+    assert resolver.config_for(str(tmpdir.join("a.py"))) is not config
@@ -0,0 +1,62 @@
+import time
+
+from isort import timings
+
+
+def test_timed_phases_are_exclusive():
+    @timings.timed("inner")
+    def inner():
+        time.sleep(0.01)
+
+    @timings.timed("outer")
+    def outer():
+        time.sleep(0.01)
+        inner()
+        inner()
+
+    outer()  # not collected while timings are disabled
+    assert timings.collector() is None
+
+    collector = timings.enable()
+    try:
+        with timings.file("module.py"):
+            outer()
+    finally:
+        timings.disable()
+
+    assert collector.phases["outer"][1] == 1
+    assert collector.phases["inner"][1] == 2
+    assert 0.01 <= collector.phases["outer"][0] < 0.02
+    assert collector.phases["inner"][0] >= 0.02
+    file_phases = collector.files["module.py"]
+    assert file_phases["total"] >= file_phases["outer"] + file_phases["inner"]
+    assert set(file_phases) == {"total", "other", "outer", "inner"}
+
+
+def test_take_and_merge():
+    worker = timings.Timings()
+    with worker.file("a.py"):
+        with worker.phase("parse"):
+            pass
+    data = worker.take()
+    assert not worker.phases and not worker.files
+
+    collector = timings.Timings()
+    collector.merge(data)
+    collector.merge(data)
+    assert collector.phases["parse"][1] == 2
+    assert list(collector.files) == ["a.py"]
+    report = collector.report(wall_time=1.0, count=5)
+    assert list(report["phases"]) == ["parse", "other"]
+    assert report["slowest_files"][0]["file"] == "a.py"
+    assert "parse" in collector.summary(wall_time=1.0, jobs=2)
+
+
+def test_timed_iterator():
+    assert list(timings.timed_iterator("discovery", range(3))) == [0, 1, 2]
+    collector = timings.enable()
+    try:
+        assert list(timings.timed_iterator("discovery", range(3))) == [0, 1, 2]
+    finally:
+        timings.disable()
+    assert collector.phases["discovery"][1] == 4
@@ -0,0 +1,76 @@
+import pytest
+
+from isort import api, watch
+from isort.settings import Config
+
+BACKENDS = [pytest.param(False, id="polling")]
+if watch._Inotify.create() is not None:
+    BACKENDS.append(pytest.param(True, id="inotify"))
+
+
+@pytest.mark.parametrize("use_inotify", BACKENDS)
+def test_watcher(tmpdir, use_inotify):
+    package = tmpdir.mkdir("package")
+    source = package.join("source.py")
+    source.write("import sys\nimport os\n")
+    tmpdir.mkdir("venv").join("skipped.py").write("import os\n")
+    tmpdir.join("notes.txt").write("notes")
+
+    watcher = watch.Watcher(
+        [str(tmpdir)], Config(), poll_interval=0.05, debounce_delay=0.05, use_inotify=use_inotify
+    )
+    try:
+        assert watcher.uses_inotify == use_inotify
+        assert len(watcher) == 1
+        assert watcher.wait(timeout=0.2) == []
+
+        # files written by isort itself are not reported again once recorded
+        api.sort_file(str(source))
+        changed = watcher.wait(timeout=5)
+        assert changed == [str(source)]
+        watcher.record(changed)
+        assert watcher.wait(timeout=0.3) == []
+
+        # files in new directories are picked up, skipped and unsupported files are not
+        new_source = tmpdir.mkdir("new").join("new.py")
+        new_source.write("import os\n")
+        tmpdir.join("venv", "skipped.py").write("import sys\n")
+        tmpdir.join("notes.txt").write("more notes")
+        assert watcher.wait(timeout=5) == [str(new_source)]
+        watcher.record([str(new_source)])
+
+        # bursts of writes to the same file are coalesced
+        for index in range(5):
+            source.write(f"import os{index}\n")
+        assert watcher.wait(timeout=5) == [str(source)]
+    finally:
+        watcher.close()
+
+
+def test_watcher_explicit_files(tmpdir):
+    source = tmpdir.join("source.py")
+    source.write("import os\n")
+    tmpdir.join("other.py").write("import os\n")
+
+    watcher = watch.Watcher([str(source)], Config(), poll_interval=0.05, debounce_delay=0.05)
+    try:
+        tmpdir.join("other.py").write("import sys\n")
+        assert watcher.wait(timeout=0.3) == []
+        source.write("import sys\n")
+        assert watcher.wait(timeout=5) == [str(source)]
+    finally:
+        watcher.close()
+
+
+def test_watch(tmpdir, mocker, capsys):
+    source = tmpdir.join("source.py")
+    source.write("import os\n")
+    watcher = mocker.patch.object(watch, "Watcher")
+    watcher.return_value.wait.side_effect = [[str(source)], KeyboardInterrupt]
+    processed = []
+
+    watch.watch([str(tmpdir)], Config(), processed.append)
+    assert processed == [str(source)]
+    watcher.return_value.record.assert_called_once_with([str(source)])
+    watcher.return_value.close.assert_called_once_with()
+    assert "Watching" in capsys.readouterr().out